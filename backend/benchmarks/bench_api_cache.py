@@ -0,0 +1,108 @@
+"""Micro-benchmark: APICache vs the previous lock-based implementation.
+
+Runs N concurrent readers (default 1000) against a warm cache of market-data sized
+payloads and reports throughput and per-read latency for both engines.
+
+    cd backend && python benchmarks/bench_api_cache.py --readers 1000 --reads 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'alpha_crypto_bench')
+
+from server import APICache, get_mock_crypto_prices  # noqa: E402
+
+
+class LegacyAPICache:
+    """The pre-replacement cache: one global asyncio.Lock, datetime expiry, TTL passed on get"""
+    def __init__(self):
+        self._cache: Dict[str, Any] = {}
+        self._timestamps: Dict[str, datetime] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str, ttl_seconds: int = 120) -> Optional[Any]:
+        async with self._lock:
+            if key in self._cache:
+                cached_time = self._timestamps.get(key)
+                if cached_time and (datetime.now(timezone.utc) - cached_time).total_seconds() < ttl_seconds:
+                    return self._cache[key]
+                self._cache.pop(key, None)
+                self._timestamps.pop(key, None)
+            return None
+
+    async def set(self, key: str, value: Any) -> None:
+        async with self._lock:
+            self._cache[key] = value
+            self._timestamps[key] = datetime.now(timezone.utc)
+
+
+def build_keys(count: int):
+    payload = get_mock_crypto_prices()
+    return {f"chart_coin{i}_{30 + i % 5}": payload for i in range(count)}
+
+
+async def run_readers(read_one, keys, readers: int, reads: int):
+    latencies = []
+    key_list = list(keys)
+
+    async def reader(offset: int):
+        for i in range(reads):
+            key = key_list[(offset + i) % len(key_list)]
+            started = time.perf_counter()
+            await read_one(key)
+            latencies.append(time.perf_counter() - started)
+            # Yield like a request handler would between cache reads
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(reader(r) for r in range(readers)))
+    elapsed = time.perf_counter() - started
+    return elapsed, latencies
+
+
+def report(name: str, elapsed: float, latencies, total_reads: int):
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{name:<10} {total_reads / elapsed:>12,.0f} reads/s   "
+          f"p50 {statistics.median(latencies) * 1e6:>8.1f} us   p99 {p99 * 1e6:>8.1f} us   "
+          f"total {elapsed:.2f}s")
+
+
+async def main(readers: int, reads: int, key_count: int):
+    keys = build_keys(key_count)
+    total_reads = readers * reads
+    print(f"{readers} concurrent readers x {reads} reads over {key_count} keys\n")
+
+    legacy = LegacyAPICache()
+    for key, value in keys.items():
+        await legacy.set(key, value)
+    elapsed, latencies = await run_readers(lambda k: legacy.get(k, 600), keys, readers, reads)
+    report("legacy", elapsed, latencies, total_reads)
+
+    cache = APICache(max_entries=key_count * 2)
+    for key, value in keys.items():
+        cache.set(key, value, 600)
+
+    async def read_new(key):
+        return cache.get(key)
+
+    elapsed, latencies = await run_readers(read_new, keys, readers, reads)
+    report("APICache", elapsed, latencies, total_reads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--keys", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.readers, args.reads, args.keys))
@@ -0,0 +1,109 @@
+"""Benchmark: /api/articles list before and after summary projection + keyset pagination.
+
+Seeds N articles (default 10k, ~6 KB of markdown each) into the benchmark database, then
+measures response size and p50/p95 latency through the ASGI app for the previous route
+(100 full documents validated as List[Article]) and for the current one (first page, and
+a page deep in the keyset walk). Needs a reachable MongoDB at MONGO_URL.
+
+    cd backend && MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_articles.py
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ['DB_NAME'] = os.environ.get('BENCH_DB_NAME', 'alpha_crypto_bench')
+
+import server  # noqa: E402
+from server import Article, app, db  # noqa: E402
+
+CATEGORIES = ["DeFi", "Bitcoin", "Ethereum", "Layer 2", "Trading", "NFTs"]
+PARAGRAPH = ("Liquidity across decentralized exchanges keeps fragmenting as new rollups launch, "
+             "and routing aggregators now split orders across a dozen venues to limit slippage. ")
+
+
+def make_article(i: int, now: datetime) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "title": f"Market structure notes #{i}",
+        "excerpt": "What moved this week in on-chain liquidity and why it matters for positioning.",
+        "content": "\n\n".join(f"## Section {s}\n\n" + PARAGRAPH * 8 for s in range(5)),
+        "category": CATEGORIES[i % len(CATEGORIES)],
+        "category_key": CATEGORIES[i % len(CATEGORIES)].lower(),
+        "premium": i % 5 == 0,
+        "published_at": (now - timedelta(minutes=i)).isoformat(),
+        "image_url": f"https://images.example.com/{i}.jpg",
+        "tags": ["defi", "liquidity", "research"],
+        "read_time": "8 min",
+    }
+
+
+# The route as it was before summaries and pagination
+legacy_app = FastAPI()
+
+
+@legacy_app.get("/api/articles", response_model=List[Article])
+async def legacy_articles():
+    return await db.articles.find({}, {"_id": 0}).sort("published_at", -1).to_list(100)
+
+
+async def measure(client: httpx.AsyncClient, url: str, requests: int):
+    sizes, timings = [], []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(url)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+        sizes.append(len(response.content))
+    timings.sort()
+    return statistics.mean(sizes), statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def report(label: str, size: float, p50: float, p95: float):
+    print(f"{label:<28} {size / 1024:>9.1f} KiB   p50 {p50 * 1000:>7.1f} ms   p95 {p95 * 1000:>7.1f} ms")
+
+
+async def main(count: int, requests: int, keep: bool):
+    await db.articles.delete_many({})
+    now = datetime.now(timezone.utc)
+    for start in range(0, count, 1000):
+        await db.articles.insert_many([make_article(i, now) for i in range(start, min(start + 1000, count))])
+    await server.startup_article_indexes()
+    print(f"Seeded {count:,} articles into {os.environ['DB_NAME']}\n")
+
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=legacy_app), base_url="http://bench") as client:
+            report("legacy (100 full docs)", *await measure(client, "/api/articles", requests))
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            report("summaries, first page", *await measure(client, "/api/articles", requests))
+
+            # Walk 50 pages in, then time that page - keyset cost doesn't grow with depth
+            cursor = None
+            for _ in range(50):
+                response = await client.get("/api/articles", params={"cursor": cursor} if cursor else {})
+                cursor = response.headers["x-next-cursor"]
+            report("summaries, page 51", *await measure(client, f"/api/articles?cursor={cursor}", requests))
+    finally:
+        if not keep:
+            await db.articles.delete_many({})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--keep", action="store_true", help="leave the seeded articles in place")
+    args = parser.parse_args()
+    asyncio.run(main(args.articles, args.requests, args.keep))
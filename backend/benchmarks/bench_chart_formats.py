@@ -0,0 +1,74 @@
+"""Micro-benchmark: chart payload size and encode time per response format.
+
+Encodes the same resampled chart (LTTB rows and daily OHLC candles) as row-dict JSON
+through FastAPI's encoder (the default path), columnar JSON, MessagePack and Arrow IPC.
+Binary formats are skipped when their optional package is not installed.
+
+    cd backend && python benchmarks/bench_chart_formats.py --points 500 --repeat 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'alpha_crypto_bench')
+
+from server import encode_chart, msgpack, pa, resample_chart_series  # noqa: E402
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def build_payload(points: int, interval=None):
+    hours = 365 * 24
+    rng = np.random.default_rng(7)
+    end = int(datetime.now(timezone.utc).timestamp() * 1000)
+    ts = end - np.arange(hours)[::-1] * HOUR_MS
+    prices = 30000 * np.exp(np.cumsum(rng.normal(0, 0.004, hours)))
+    rows = resample_chart_series(ts, prices, points, interval)
+    return {"coin_id": "bitcoin", "days": 365, "interval": interval, "data": rows}
+
+
+def encode_rows(payload):
+    return json.dumps(jsonable_encoder(payload)).encode()
+
+
+def measure(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        content = fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), len(content)
+
+
+def main(points: int, repeat: int):
+    formats = [("json rows", encode_rows), ("columnar", lambda p: encode_chart(p, "columnar").body)]
+    if msgpack is not None:
+        formats.append(("msgpack", lambda p: encode_chart(p, "msgpack").body))
+    if pa is not None:
+        formats.append(("arrow", lambda p: encode_chart(p, "arrow").body))
+
+    for label, interval in ((f"LTTB {points}", None), ("OHLC 1d", "1d")):
+        payload = build_payload(points, interval)
+        print(f"{label}: {len(payload['data'])} rows")
+        for name, encode in formats:
+            elapsed, size = measure(lambda: encode(payload), repeat)
+            print(f"  {name:<10} {size / 1024:>8.1f} KiB   {elapsed * 1e6:>8.0f} us/encode")
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.points, args.repeat)
@@ -0,0 +1,83 @@
+"""Micro-benchmark: per-request chart formatting before and after the NumPy resampling stage.
+
+Builds synthetic hourly price series for the 1y and max ranges and times the old
+per-point dict loop (every point shipped) against resample_chart_series with LTTB
+and with daily OHLC candles. Reports per-request time and JSON payload size.
+
+    cd backend && python benchmarks/bench_chart_resampling.py --repeat 20
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'alpha_crypto_bench')
+
+from server import CHART_MAX_POINTS, resample_chart_series  # noqa: E402
+
+HOUR_MS = 60 * 60 * 1000
+RANGES = {"1y": 365 * 24, "max": 10 * 365 * 24}
+
+
+def build_series(hours: int):
+    rng = np.random.default_rng(42)
+    end = int(datetime.now(timezone.utc).timestamp() * 1000)
+    ts = end - np.arange(hours)[::-1] * HOUR_MS
+    prices = 30000 * np.exp(np.cumsum(rng.normal(0, 0.004, hours)))
+    return [[int(t), float(p)] for t, p in zip(ts, prices)]
+
+
+def legacy_format(prices):
+    """The pre-resampling get_crypto_chart loop"""
+    chart_data = []
+    for timestamp, price in prices:
+        chart_data.append({
+            "timestamp": timestamp,
+            "price": round(price, 2),
+            "date": datetime.fromtimestamp(timestamp/1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        })
+    return chart_data
+
+
+def resampled(prices, interval=None):
+    series = np.array(prices, dtype=np.float64)
+    return resample_chart_series(series[:, 0], series[:, 1], CHART_MAX_POINTS, interval)
+
+
+def measure(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main(repeat: int):
+    for name, hours in RANGES.items():
+        prices = build_series(hours)
+        print(f"{name}: {len(prices):,} hourly points")
+        for label, fn in (
+            ("legacy loop", lambda: legacy_format(prices)),
+            (f"LTTB {CHART_MAX_POINTS}", lambda: resampled(prices)),
+            ("OHLC 1d+", lambda: resampled(prices, "1d")),
+        ):
+            elapsed, rows = measure(fn, repeat)
+            size = len(json.dumps({"data": rows}))
+            print(f"  {label:<12} {elapsed * 1000:>8.2f} ms/request   {len(rows):>6,} rows   {size / 1024:>8.1f} KiB")
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.repeat)
@@ -0,0 +1,129 @@
+"""Micro-benchmark: stablecoin aggregation, full json parse + sort vs streaming ijson + heapq.
+
+Replays a recorded DefiLlama /stablecoins?includePrices=true payload through a chunked
+async reader (like aiohttp's response.content) and reports latency and tracemalloc peak
+for the previous implementation and for aggregate_stablecoins.
+
+    cd backend && python benchmarks/bench_stablecoins.py --record   # save a live payload once
+    cd backend && python benchmarks/bench_stablecoins.py --repeat 5
+
+Without a recorded fixture a synthetic payload of the same shape is generated.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'alpha_crypto_bench')
+
+from server import aggregate_stablecoins  # noqa: E402
+
+STABLECOINS_URL = "https://stablecoins.llama.fi/stablecoins?includePrices=true"
+DEFAULT_FIXTURE = Path(__file__).resolve().parent / "fixtures" / "stablecoins.json"
+CHUNK_SIZE = 64 * 1024
+CHAINS = [f"Chain{i}" for i in range(120)]
+
+
+class ChunkedReader:
+    """Async read(n) over an in-memory payload, CHUNK_SIZE at a time"""
+    def __init__(self, payload: bytes):
+        self._payload = payload
+        self._offset = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        n = CHUNK_SIZE if n < 0 else min(n, CHUNK_SIZE)
+        chunk = self._payload[self._offset:self._offset + n]
+        self._offset += len(chunk)
+        return chunk
+
+
+def synthesize(assets: int = 300) -> bytes:
+    rng = random.Random(1)
+    pegged = []
+    for i in range(assets):
+        mcap = rng.paretovariate(0.6) * 1e6
+        chains = rng.sample(CHAINS, rng.randint(1, 40))
+        pegged.append({
+            "id": str(i), "name": f"Stable {i}", "symbol": f"S{i}", "gecko_id": f"stable-{i}",
+            "pegType": "peggedUSD", "pegMechanism": "fiat-backed", "price": rng.gauss(1, 0.003),
+            "circulating": {"peggedUSD": mcap},
+            "circulatingPrevDay": {"peggedUSD": mcap * 0.99},
+            "circulatingPrevWeek": {"peggedUSD": mcap * 0.97},
+            "circulatingPrevMonth": {"peggedUSD": mcap * 0.9},
+            "chainCirculating": {
+                chain: {"current": {"peggedUSD": mcap / len(chains)},
+                        "circulatingPrevDay": {"peggedUSD": mcap / len(chains)},
+                        "circulatingPrevWeek": {"peggedUSD": mcap / len(chains)},
+                        "circulatingPrevMonth": {"peggedUSD": mcap / len(chains)}}
+                for chain in chains
+            },
+            "chains": chains,
+        })
+    return json.dumps({"peggedAssets": pegged}).encode()
+
+
+async def legacy_aggregate(reader: ChunkedReader):
+    """The previous fetch_stablecoin_data body: buffer, json.loads, sum, full sort"""
+    chunks = []
+    while chunk := await reader.read(CHUNK_SIZE):
+        chunks.append(chunk)
+    data = json.loads(b"".join(chunks))
+    stablecoins = data.get("peggedAssets", [])
+    total_mcap = sum(s.get("circulating", {}).get("peggedUSD", 0) or 0 for s in stablecoins)
+    top_stables = []
+    for s in sorted(stablecoins, key=lambda x: x.get("circulating", {}).get("peggedUSD", 0) or 0, reverse=True)[:10]:
+        mcap = s.get("circulating", {}).get("peggedUSD", 0) or 0
+        if mcap > 0:
+            top_stables.append({"name": s.get("name", "Unknown"), "symbol": s.get("symbol", ""),
+                                "market_cap": round(mcap, 0),
+                                "percentage": round((mcap / total_mcap * 100) if total_mcap > 0 else 0, 2)})
+    return {"total_market_cap": round(total_mcap, 0), "top_stablecoins": top_stables}
+
+
+async def measure(fn, payload: bytes, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await fn(ChunkedReader(payload))
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    await fn(ChunkedReader(payload))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak, result
+
+
+async def main(fixture: Path, repeat: int):
+    if fixture.exists():
+        payload = fixture.read_bytes()
+        print(f"Recorded fixture {fixture} ({len(payload) / 1e6:.1f} MB)")
+    else:
+        payload = synthesize()
+        print(f"Synthetic payload ({len(payload) / 1e6:.1f} MB) - run with --record for a live one")
+
+    for name, fn in (("legacy", legacy_aggregate), ("streaming", aggregate_stablecoins)):
+        elapsed, peak, result = await measure(fn, payload, repeat)
+        print(f"{name:<10} {elapsed * 1000:>8.1f} ms   peak {peak / 1e6:>7.1f} MB   "
+              f"total ${result['total_market_cap'] / 1e9:,.1f}B")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+    parser.add_argument("--record", action="store_true", help="download a live payload into --fixture first")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if args.record:
+        args.fixture.parent.mkdir(parents=True, exist_ok=True)
+        with urllib.request.urlopen(STABLECOINS_URL, timeout=60) as response:
+            args.fixture.write_bytes(response.read())
+    asyncio.run(main(args.fixture, args.repeat))
@@ -0,0 +1,91 @@
+"""Load test: how many /api/stream/market subscribers one worker can hold.
+
+Ramps up concurrent SSE connections against a running backend, keeps them open for a
+hold period and reports connections held, rejections, time-to-first-event and the
+number of events delivered per client.
+
+    uvicorn server:app --port 8001 --workers 1
+    python benchmarks/sse_load_test.py --url http://localhost:8001/api/stream/market --clients 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+
+class ClientResult:
+    def __init__(self):
+        self.connected = False
+        self.rejected = False
+        self.error = None
+        self.first_event_s = None
+        self.events = 0
+
+
+async def subscriber(session: aiohttp.ClientSession, url: str, hold_seconds: float, result: ClientResult):
+    started = time.perf_counter()
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=None, sock_connect=30)) as response:
+            if response.status == 503:
+                result.rejected = True
+                return
+            response.raise_for_status()
+            result.connected = True
+            deadline = started + hold_seconds
+            while time.perf_counter() < deadline:
+                try:
+                    line = await asyncio.wait_for(response.content.readline(), deadline - time.perf_counter())
+                except asyncio.TimeoutError:
+                    break
+                if not line:
+                    break
+                if line.startswith(b"event:"):
+                    result.events += 1
+                    if result.first_event_s is None:
+                        result.first_event_s = time.perf_counter() - started
+    except Exception as e:
+        result.error = e.__class__.__name__
+
+
+async def main(url: str, clients: int, ramp_seconds: float, hold_seconds: float):
+    connector = aiohttp.TCPConnector(limit=0, force_close=True)
+    results = [ClientResult() for _ in range(clients)]
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = []
+        for i, result in enumerate(results):
+            tasks.append(asyncio.create_task(subscriber(session, url, hold_seconds, result)))
+            if ramp_seconds:
+                await asyncio.sleep(ramp_seconds / clients)
+        await asyncio.sleep(1)
+        held = sum(1 for r in results if r.connected and r.error is None)
+        print(f"Connections open after ramp: {held}/{clients}")
+        await asyncio.gather(*tasks)
+
+    connected = [r for r in results if r.connected]
+    first_events = [r.first_event_s for r in connected if r.first_event_s is not None]
+    errors = {}
+    for r in results:
+        if r.error:
+            errors[r.error] = errors.get(r.error, 0) + 1
+
+    print(f"Clients requested:   {clients}")
+    print(f"Connected:           {len(connected)}")
+    print(f"Rejected (503):      {sum(1 for r in results if r.rejected)}")
+    print(f"Errors:              {errors or 0}")
+    if first_events:
+        print(f"Time to first event: p50 {statistics.median(first_events) * 1000:.0f} ms, "
+              f"max {max(first_events) * 1000:.0f} ms")
+    if connected:
+        print(f"Events per client:   avg {sum(r.events for r in connected) / len(connected):.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8001/api/stream/market")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--ramp", type=float, default=10.0, help="seconds to open all connections")
+    parser.add_argument("--hold", type=float, default=60.0, help="seconds each client stays connected")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.clients, args.ramp, args.hold))
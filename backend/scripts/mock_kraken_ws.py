@@ -0,0 +1,112 @@
+"""Local mock of the Kraken v2 WebSocket ticker channel.
+
+Answers `subscribe` requests for the ticker channel with an ack and a snapshot of the
+newly added symbols, `unsubscribe` requests with an ack, then pushes random-walk `update`
+messages for everything subscribed. Use --drop-every to close client connections
+periodically and exercise the backend's reconnect/resubscribe path.
+
+    python scripts/mock_kraken_ws.py --port 8790 --drop-every 20
+    KRAKEN_WS_ENABLED=true KRAKEN_WS_URL=ws://localhost:8790/v2 uvicorn server:app --port 8001
+"""
+import argparse
+import asyncio
+import json
+import random
+from datetime import datetime, timezone
+
+from aiohttp import web, WSMsgType
+
+BASE_PRICES = {"BTC/USD": 97250.0, "ETH/USD": 3680.5, "SOL/USD": 198.45, "USDC/USD": 1.0}
+
+
+def make_tick(symbol: str, price: float) -> dict:
+    change_pct = random.uniform(-5, 5)
+    return {
+        "symbol": symbol,
+        "last": round(price, 2),
+        "bid": round(price * 0.9999, 2),
+        "ask": round(price * 1.0001, 2),
+        "volume": round(random.uniform(1000, 50000), 4),
+        "change_pct": round(change_pct, 2),
+        "change": round(price * change_pct / 100, 2),
+    }
+
+
+async def ticker_ws(request: web.Request) -> web.WebSocketResponse:
+    args = request.app["args"]
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    prices = dict(BASE_PRICES)
+    symbols = []
+    loop = asyncio.get_running_loop()
+    opened_at = loop.time()
+    print(f"client connected from {request.remote}")
+
+    async def pump():
+        while not ws.closed:
+            await asyncio.sleep(args.interval)
+            if not symbols:
+                continue
+            if args.drop_every and loop.time() - opened_at > args.drop_every:
+                print("dropping client connection")
+                await ws.close()
+                return
+            symbol = random.choice(symbols)
+            prices[symbol] *= 1 + random.uniform(-0.002, 0.002)
+            await ws.send_json({"channel": "ticker", "type": "update", "data": [make_tick(symbol, prices[symbol])]})
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            request_msg = json.loads(msg.data)
+            params = request_msg.get("params", {})
+            if request_msg.get("method") == "subscribe" and params.get("channel") == "ticker":
+                # Subscriptions add up, as on Kraken
+                requested = [s for s in params.get("symbol", []) if s in prices]
+                symbols.extend(s for s in requested if s not in symbols)
+                print(f"subscribed to {requested}")
+                await ws.send_json({
+                    "method": "subscribe",
+                    "result": {"channel": "ticker", "symbol": requested},
+                    "success": True,
+                    "time_in": datetime.now(timezone.utc).isoformat(),
+                })
+                await ws.send_json({
+                    "channel": "ticker",
+                    "type": "snapshot",
+                    "data": [make_tick(s, prices[s]) for s in requested],
+                })
+            elif request_msg.get("method") == "unsubscribe" and params.get("channel") == "ticker":
+                dropped = [s for s in params.get("symbol", []) if s in symbols]
+                symbols[:] = [s for s in symbols if s not in dropped]
+                print(f"unsubscribed from {dropped}")
+                await ws.send_json({
+                    "method": "unsubscribe",
+                    "result": {"channel": "ticker", "symbol": dropped},
+                    "success": True,
+                    "time_in": datetime.now(timezone.utc).isoformat(),
+                })
+            elif request_msg.get("method") == "ping":
+                await ws.send_json({"method": "pong"})
+    finally:
+        pump_task.cancel()
+    return ws
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between updates")
+    parser.add_argument("--drop-every", type=float, default=0, help="close each client after N seconds (0 = never)")
+    args = parser.parse_args()
+
+    app = web.Application()
+    app["args"] = args
+    app.router.add_get("/v2", ticker_ws)
+    web.run_app(app, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
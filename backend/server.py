@@ -1,18 +1,37 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 import os
+import json
+import time
 import logging
 import random
+import math
+import re
+import base64
+import hashlib
+import heapq
+import bisect
+import unicodedata
 from pathlib import Path
+from collections import OrderedDict
+from types import MappingProxyType
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Awaitable, NamedTuple
 import uuid
 from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime, format_datetime
+from urllib.parse import urlsplit
 import httpx
 import aiohttp
 import asyncio
+import numpy as np
+import ijson
 import resend
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 
@@ -59,48 +78,2606 @@ async def send_notification_email(subject: str, html_content: str, to_email: str
 # =============================================================================
 # API CACHE SYSTEM - Reduces external API calls to prevent rate limiting
 # =============================================================================
-class APICache:
-    """Simple in-memory cache with TTL for API responses"""
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight task"""
     def __init__(self):
-        self._cache: Dict[str, Any] = {}
-        self._timestamps: Dict[str, datetime] = {}
-        self._lock = asyncio.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, int] = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() once per key - concurrent callers share its result or exception"""
+        self._stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        # Shield so one cancelled waiter (client disconnect) doesn't cancel the shared fetch
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self._stats["errors"] += 1
+
+    def inflight(self, key: str) -> bool:
+        return key in self._inflight
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "inflight": len(self._inflight)}
+
+class CacheLookup(NamedTuple):
+    """Result of APICache.get_or_fetch - value plus how fresh it is"""
+    value: Optional[Any]
+    freshness: str       # fresh, stale or miss
+    age_seconds: float
+
+class _CacheEntry:
+    __slots__ = ("value", "stored_at", "expires_at", "stale_until", "size")
+
+    def __init__(self, value: Any, ttl_seconds: float, max_stale_seconds: float, size: int):
+        now = time.monotonic()
+        self.value = value
+        self.stored_at = now
+        self.expires_at = now + ttl_seconds
+        self.stale_until = self.expires_at + max_stale_seconds
+        self.size = size
+
+def _estimate_size(value: Any) -> int:
+    """Approximate payload size in bytes - cached values are JSON response bodies"""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 1024
+
+class APICache:
+    """In-memory LRU cache with per-key TTL for API responses.
+    
+    Reads and writes never await, so on the event loop they are atomic without a lock.
+    Expiry uses time.monotonic() deadlines fixed at set() time, and the cache is bounded
+    by entry count and by an approximate byte budget (least recently used evicted first).
+    """
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._flights = SingleFlight()
+        self._refresh_tasks: set = set()
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "stale_served": 0, "evictions": 0}
+    
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+    
+    def _lookup(self, key: str) -> Optional[_CacheEntry]:
+        """Get the entry if still servable (fresh or stale), dropping it past its hard bound"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry.stale_until:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
     
-    async def get(self, key: str, ttl_seconds: int = 120) -> Optional[Any]:
+    def get(self, key: str) -> Optional[Any]:
         """Get cached value if not expired"""
-        async with self._lock:
-            if key in self._cache:
-                cached_time = self._timestamps.get(key)
-                if cached_time and (datetime.now(timezone.utc) - cached_time).total_seconds() < ttl_seconds:
-                    return self._cache[key]
-                # Expired - remove from cache
-                self._cache.pop(key, None)
-                self._timestamps.pop(key, None)
+        entry = self._lookup(key)
+        if entry is None or time.monotonic() >= entry.expires_at:
+            self._stats["misses"] += 1
             return None
+        self._stats["hits"] += 1
+        return entry.value
+    
+    def set(self, key: str, value: Any, ttl_seconds: float, max_stale_seconds: float = 0) -> None:
+        """Store value for ttl_seconds - it may be served stale for max_stale_seconds more"""
+        self._drop(key)
+        entry = _CacheEntry(value, ttl_seconds, max_stale_seconds, _estimate_size(value))
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._stats["evictions"] += 1
+    
+    def get_stale(self, key: str) -> Optional[Any]:
+        """Get cached value even if expired, as long as it is within its staleness bound"""
+        entry = self._lookup(key)
+        return entry.value if entry is not None else None
     
-    async def set(self, key: str, value: Any) -> None:
-        """Store value in cache with current timestamp"""
-        async with self._lock:
-            self._cache[key] = value
-            self._timestamps[key] = datetime.now(timezone.utc)
+    async def coalesce(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() through the single-flight layer without touching cache entries"""
+        return await self._flights.do(key, fn)
     
-    async def clear(self, key: str = None) -> None:
+    def clear(self, key: str = None) -> None:
         """Clear specific key or all cache"""
-        async with self._lock:
-            if key:
-                self._cache.pop(key, None)
-                self._timestamps.pop(key, None)
-            else:
-                self._cache.clear()
-                self._timestamps.clear()
+        if key:
+            self._drop(key)
+        else:
+            self._entries.clear()
+            self._bytes = 0
+    
+    async def get_or_fetch(self, key: str, ttl_seconds: int, fetcher: Callable[[], Awaitable[Any]],
+                           max_stale_seconds: int = 0) -> CacheLookup:
+        """Get cached value or fetch it - concurrent misses for a key share one fetcher call.
+        
+        With max_stale_seconds > 0, an expired entry is returned immediately (freshness="stale")
+        while a single background task refreshes it, until it is older than ttl + max_stale_seconds.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            now = time.monotonic()
+            age = now - entry.stored_at
+            if now < entry.expires_at:
+                self._stats["hits"] += 1
+                return CacheLookup(entry.value, "fresh", age)
+            if max_stale_seconds > 0:
+                self._stats["stale_served"] += 1
+                self._refresh_in_background(key, ttl_seconds, fetcher, max_stale_seconds)
+                return CacheLookup(entry.value, "stale", age)
+        self._stats["misses"] += 1
+        value = await self._flights.do(key, lambda: self._fetch_and_store(key, ttl_seconds, fetcher, max_stale_seconds))
+        return CacheLookup(value, "fresh" if value is not None else "miss", 0.0)
+    
+    def _refresh_in_background(self, key: str, ttl_seconds: int, fetcher: Callable[[], Awaitable[Any]],
+                               max_stale_seconds: int) -> None:
+        async def _refresh():
+            try:
+                await self._flights.do(key, lambda: self._fetch_and_store(key, ttl_seconds, fetcher, max_stale_seconds))
+            except Exception as e:
+                logger.error(f"Background refresh failed for {key}: {e}")
+        
+        # Requests arriving while a refresh is running join it instead of starting another
+        if self._flights.inflight(key):
+            return
+        task = asyncio.ensure_future(_refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+    
+    async def refresh(self, key: str, ttl_seconds: int, fetcher: Callable[[], Awaitable[Any]],
+                      max_stale_seconds: int = 0) -> Optional[Any]:
+        """Fetch and store even if the entry is still fresh - joins any fetch already in flight"""
+        return await self._flights.do(key, lambda: self._fetch_and_store(key, ttl_seconds, fetcher, max_stale_seconds,
+                                                                         force=True))
+    
+    async def _fetch_and_store(self, key: str, ttl_seconds: int, fetcher: Callable[[], Awaitable[Any]],
+                               max_stale_seconds: int = 0, force: bool = False) -> Optional[Any]:
+        # A flight that finished just before this one may already have filled the cache
+        entry = self._entries.get(key)
+        if not force and entry is not None and time.monotonic() < entry.expires_at:
+            return entry.value
+        value = await fetcher()
+        if value is not None:
+            self.set(key, value, ttl_seconds, max_stale_seconds)
+        return value
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache size, hit/miss/eviction counters and single-flight coalescing counters"""
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "background_refreshes": len(self._refresh_tasks),
+            "single_flight": self._flights.stats()
+        }
+
+def mark_freshness(response: Response, freshness: str, age_seconds: float = 0) -> None:
+    """Tell the frontend how fresh a market-data payload is (fresh, stale or fallback)"""
+    response.headers["X-Data-Freshness"] = freshness
+    response.headers["X-Data-Age"] = str(int(age_seconds))
 
 # Initialize global cache instance
-api_cache = APICache()
+api_cache = APICache(
+    max_entries=int(os.environ.get('API_CACHE_MAX_ENTRIES', 1024)),
+    max_bytes=int(os.environ.get('API_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+)
 
 # Cache TTL settings (in seconds)
 CACHE_TTL_CRYPTO_PRICES = 60   # 1 minute - CoinCap has no rate limits
 CACHE_TTL_FEAR_GREED = 300     # 5 minutes - this data doesn't change often
 CACHE_TTL_COINGECKO = 600      # 10 minutes - CoinGecko has strict rate limits
+CACHE_TTL_DEFILLAMA = 300      # 5 minutes - stablecoin supply and TVL move slowly
+CACHE_TTL_MOVERS = 120         # 2 minutes - gainers/losers over all Kraken USD pairs
+
+# Serve-stale bounds (in seconds) - how long past its TTL an entry may still be served
+# while a background refresh runs. Beyond this the caller waits for upstream again.
+CACHE_MAX_STALE_CRYPTO_PRICES = 900    # 15 minutes
+CACHE_MAX_STALE_FEAR_GREED = 3600      # 1 hour
+CACHE_MAX_STALE_COINGECKO = 3600       # 1 hour
+CACHE_MAX_STALE_DEFILLAMA = 3600       # 1 hour
+CACHE_MAX_STALE_MOVERS = 900           # 15 minutes
+# =============================================================================
+
+# =============================================================================
+# UPSTREAM GUARD - Per-provider token bucket and circuit breaker
+# =============================================================================
+GUARD_FAILURE_THRESHOLD = 5       # consecutive failures (timeouts, 5xx) before a breaker opens
+GUARD_OPEN_SECONDS = 30           # first cool-down when a breaker opens without a Retry-After
+GUARD_OPEN_MAX_SECONDS = 600      # cool-down doubles on every failed half-open probe, up to 10 minutes
+GUARD_MAX_WAIT_SECONDS = 5        # longest a request queues for a token before it is rejected
+GUARD_MIN_RATE_RATIO = 0.1        # 429s never push a bucket below 10% of its published rate
+
+# Published limits for the free/public tiers we use (requests per second, burst)
+UPSTREAM_PROVIDER_LIMITS = {
+    "kraken": (1.0, 3),            # public REST endpoints: ~1 req/s per IP
+    "coingecko": (10 / 60, 3),     # keyless public API: ~10-30 calls/min - stay at the low end
+    "defillama": (5.0, 10),        # open API: ~300 req/min
+    "alternative_me": (1.0, 5),    # 60 req/min
+}
+
+# Hostname -> provider, anything not listed goes out unguarded
+UPSTREAM_PROVIDER_HOSTS = {
+    "api.kraken.com": "kraken",
+    "api.coingecko.com": "coingecko",
+    "api.llama.fi": "defillama",
+    "stablecoins.llama.fi": "defillama",
+    "coins.llama.fi": "defillama",
+    "api.alternative.me": "alternative_me",
+}
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of calling a provider whose breaker is open or whose bucket is drained"""
+    def __init__(self, provider: str, reason: str, retry_after: float):
+        super().__init__(f"{provider} unavailable ({reason}), retry in {retry_after:.0f}s")
+        self.provider = provider
+        self.reason = reason
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds - accepts both delta-seconds and HTTP-date forms"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class ProviderGuard:
+    """Adaptive token bucket plus closed/open/half-open circuit breaker for one provider.
+    
+    A 429 opens the breaker at once (for Retry-After if sent) and halves the refill rate;
+    each success wins back 10% of the published rate. After the cool-down one probe request
+    is let through - success closes the breaker, failure re-opens it for twice as long.
+    """
+    def __init__(self, name: str, rate_per_second: float, burst: int):
+        self.name = name
+        self.base_rate = rate_per_second
+        self.rate = rate_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._open_until = 0.0
+        self._open_seconds = GUARD_OPEN_SECONDS
+        self._probe_inflight = False
+        self.last_error: Optional[str] = None
+        self.opened_at: Optional[str] = None
+        self._stats = {"allowed": 0, "rejected": 0, "throttled": 0, "failures": 0, "rate_limited": 0, "trips": 0}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    async def acquire(self) -> None:
+        """Wait for a token - raises UpstreamUnavailable if the breaker is open or the wait is too long"""
+        now = time.monotonic()
+        if self.state == "open":
+            if now < self._open_until:
+                self._stats["rejected"] += 1
+                raise UpstreamUnavailable(self.name, "circuit open", self._open_until - now)
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probe_inflight:
+                self._stats["rejected"] += 1
+                raise UpstreamUnavailable(self.name, "half-open probe in flight", GUARD_OPEN_SECONDS)
+            self._probe_inflight = True
+        probing = self.state == "half_open"
+
+        self._refill(now)
+        wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+        if wait > GUARD_MAX_WAIT_SECONDS:
+            self._probe_inflight = False
+            self._stats["rejected"] += 1
+            raise UpstreamUnavailable(self.name, "rate limit", wait)
+        # Take the token now so concurrent callers queue behind it instead of racing for it
+        self._tokens -= 1
+        if wait:
+            self._stats["throttled"] += 1
+            cancelled = True
+            try:
+                await asyncio.sleep(wait)
+                cancelled = False
+            finally:
+                if cancelled:
+                    # The caller gave up before the request went out - hand back the token and,
+                    # if this was the half-open probe, the probe slot, or the breaker stays stuck
+                    self._tokens += 1
+                    if probing:
+                        self._probe_inflight = False
+        self._stats["allowed"] += 1
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.rate = min(self.base_rate, self.rate + self.base_rate * 0.1)
+        if self.state != "closed":
+            logger.info(f"Upstream guard {self.name}: circuit closed")
+        self.state = "closed"
+        self._open_seconds = GUARD_OPEN_SECONDS
+        self._probe_inflight = False
+
+    def record_failure(self, error: str, status: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        self.consecutive_failures += 1
+        self.last_error = error
+        self._stats["failures"] += 1
+        if status == 429:
+            self._stats["rate_limited"] += 1
+            self.rate = max(self.base_rate * GUARD_MIN_RATE_RATIO, self.rate / 2)
+            self._trip(retry_after)
+        elif self.state == "half_open":
+            self._open_seconds = min(GUARD_OPEN_MAX_SECONDS, self._open_seconds * 2)
+            self._trip(None)
+        elif self.consecutive_failures >= GUARD_FAILURE_THRESHOLD:
+            self._trip(None)
+        self._probe_inflight = False
+
+    def _trip(self, retry_after: Optional[float]) -> None:
+        cool_down = retry_after if retry_after is not None else self._open_seconds
+        cool_down = min(GUARD_OPEN_MAX_SECONDS, cool_down)
+        self._open_until = time.monotonic() + cool_down
+        if self.state != "open":
+            self._stats["trips"] += 1
+            self.opened_at = datetime.now(timezone.utc).isoformat()
+            logger.warning(f"Upstream guard {self.name}: circuit open for {cool_down:.0f}s ({self.last_error})")
+        self.state = "open"
+
+    def release(self) -> None:
+        """Free the half-open probe slot when a request ends without a verdict"""
+        self._probe_inflight = False
+
+    def reset(self) -> None:
+        self.record_success()
+        self.rate = self.base_rate
+        self._tokens = float(self.burst)
+
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "state": self.state,
+            "retry_in_seconds": round(max(0.0, self._open_until - now), 1) if self.state == "open" else 0,
+            "rate_per_second": round(self.rate, 4),
+            "published_rate_per_second": round(self.base_rate, 4),
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "opened_at": self.opened_at,
+            **self._stats,
+        }
+
+class UpstreamGuards:
+    """ProviderGuard registry keyed by provider, looked up by request hostname"""
+    def __init__(self, limits: Dict[str, tuple], hosts: Dict[str, str]):
+        self._guards = {name: ProviderGuard(name, rate, burst) for name, (rate, burst) in limits.items()}
+        self._hosts = hosts
+
+    def for_url(self, url: str) -> Optional[ProviderGuard]:
+        provider = self._hosts.get(urlsplit(url).hostname or "")
+        return self._guards.get(provider) if provider else None
+
+    def get(self, provider: str) -> Optional[ProviderGuard]:
+        return self._guards.get(provider)
+
+    def status(self) -> Dict[str, Any]:
+        return {name: guard.status() for name, guard in self._guards.items()}
+
+# Initialize global upstream guards - applied to every upstream_client.get()
+upstream_guards = UpstreamGuards(UPSTREAM_PROVIDER_LIMITS, UPSTREAM_PROVIDER_HOSTS)
+# =============================================================================
+
+# =============================================================================
+# UPSTREAM HTTP CLIENT - One pooled session shared by all market-data fetchers
+# =============================================================================
+UPSTREAM_USER_AGENT = "AlphaCrypto/1.0"
+UPSTREAM_TIMEOUT_TOTAL = 15          # seconds - whole request, matches the old Kraken timeout
+UPSTREAM_TIMEOUT_CONNECT = 5         # seconds - TCP + TLS handshake
+UPSTREAM_POOL_LIMIT = 100            # max open connections across all hosts
+UPSTREAM_POOL_LIMIT_PER_HOST = 10    # max open connections to a single provider
+UPSTREAM_KEEPALIVE_SECONDS = 30      # idle connections are kept this long for reuse
+UPSTREAM_DNS_CACHE_SECONDS = 300     # resolved addresses are cached this long
+
+class UpstreamClient:
+    """App-lifetime aiohttp session with keep-alive, DNS caching and pool metrics"""
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "new_connections": 0,
+            "reused_connections": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "errors": 0,
+        }
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Count pool reuse vs fresh connections through aiohttp tracing hooks"""
+        trace_config = aiohttp.TraceConfig()
+
+        def counter(stat: str):
+            async def _increment(session, ctx, params):
+                self._stats[stat] += 1
+            return _increment
+
+        trace_config.on_request_start.append(counter("requests"))
+        trace_config.on_request_exception.append(counter("errors"))
+        trace_config.on_connection_create_end.append(counter("new_connections"))
+        trace_config.on_connection_reuseconn.append(counter("reused_connections"))
+        trace_config.on_dns_cache_hit.append(counter("dns_cache_hits"))
+        trace_config.on_dns_cache_miss.append(counter("dns_cache_misses"))
+        return trace_config
+
+    async def start(self) -> None:
+        """Create the pooled session (called from the startup hook)"""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=UPSTREAM_POOL_LIMIT,
+            limit_per_host=UPSTREAM_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=UPSTREAM_KEEPALIVE_SECONDS,
+            ttl_dns_cache=UPSTREAM_DNS_CACHE_SECONDS,
+            use_dns_cache=True,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=UPSTREAM_TIMEOUT_TOTAL, connect=UPSTREAM_TIMEOUT_CONNECT),
+            headers={"User-Agent": UPSTREAM_USER_AGENT},
+            trace_configs=[self._build_trace_config()],
+        )
+        logger.info(f"Upstream HTTP client started (pool={UPSTREAM_POOL_LIMIT}, per_host={UPSTREAM_POOL_LIMIT_PER_HOST})")
+
+    async def close(self) -> None:
+        """Close the session and every pooled connection (called from the shutdown hook)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("Upstream HTTP client is not started")
+        return self._session
+
+    async def _ensure_started(self) -> aiohttp.ClientSession:
+        # Scripts and tests may call fetchers without running the app lifespan
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+    def get(self, url: str, **kwargs):
+        """Issue a pooled GET - use as `async with upstream_client.get(url) as response:`"""
+        return _UpstreamRequest(self, url, kwargs)
+
+    async def ws_connect(self, url: str, **kwargs) -> aiohttp.ClientWebSocketResponse:
+        """Open a WebSocket on the shared session (caller closes it)"""
+        session = await self._ensure_started()
+        return await session.ws_connect(url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool reuse vs new connection counters"""
+        connections = self._stats["new_connections"] + self._stats["reused_connections"]
+        return {
+            **self._stats,
+            "reuse_ratio": round(self._stats["reused_connections"] / connections, 4) if connections else 0.0,
+            "started": self._session is not None and not self._session.closed,
+        }
+
+class _UpstreamRequest:
+    """Async context manager that lazily starts the client and runs the provider guard"""
+    def __init__(self, client: UpstreamClient, url: str, kwargs: Dict[str, Any]):
+        self._client = client
+        self._url = url
+        self._kwargs = kwargs
+        self._request_cm = None
+        self._guard = upstream_guards.for_url(url)
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        if self._guard:
+            await self._guard.acquire()
+        try:
+            session = await self._client._ensure_started()
+            self._request_cm = session.get(self._url, **self._kwargs)
+            response = await self._request_cm.__aenter__()
+        except BaseException as e:
+            if self._guard:
+                if isinstance(e, Exception):
+                    self._guard.record_failure(f"{e.__class__.__name__}: {e}")
+                else:
+                    self._guard.release()
+            raise
+        if self._guard:
+            if response.status == 429:
+                self._guard.record_failure("HTTP 429", 429, parse_retry_after(response.headers.get("Retry-After")))
+            elif response.status >= 500:
+                self._guard.record_failure(f"HTTP {response.status}", response.status)
+            else:
+                self._guard.record_success()
+        return response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # Body read failures (timeouts mid-stream) count against the provider too
+        if self._guard and exc_type is not None and issubclass(exc_type, (aiohttp.ClientError, asyncio.TimeoutError)):
+            self._guard.record_failure(f"{exc_type.__name__}: {exc}")
+        return await self._request_cm.__aexit__(exc_type, exc, tb)
+
+# Initialize global upstream client instance
+upstream_client = UpstreamClient()
+# =============================================================================
+
+# =============================================================================
+# MARKET DATA POLLER - Refreshes upstream sources into the cache in the background
+# =============================================================================
+MARKET_POLLER_ENABLED = os.environ.get('MARKET_POLLER_ENABLED', 'true').lower() == 'true'
+POLLER_JITTER_RATIO = 0.1         # +/-10% on every delay so sources don't fire in lockstep
+POLLER_BACKOFF_BASE = 15          # seconds - first retry delay after a failure (capped at the interval)
+POLLER_BACKOFF_MAX = 900          # seconds - retry delay never grows beyond 15 minutes
+
+# Refresh intervals (in seconds) - kept below the cache TTLs so handlers always hit
+POLL_INTERVAL_CRYPTO_PRICES = 30
+POLL_INTERVAL_FEAR_GREED = 240
+POLL_INTERVAL_COINGECKO = 300
+POLL_INTERVAL_DEFILLAMA = 240
+POLL_INTERVAL_MOVERS = 60
+
+class PollerSource:
+    """One upstream data source refreshed on its own schedule"""
+    def __init__(self, name: str, cache_key: str, fetcher: Callable[[], Awaitable[Any]],
+                 interval_seconds: float, ttl_seconds: float, max_stale_seconds: float):
+        self.name = name
+        self.cache_key = cache_key
+        self.fetcher = fetcher
+        self.interval_seconds = interval_seconds
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.consecutive_failures = 0
+        self.total_runs = 0
+        self.total_failures = 0
+        self.last_attempt: Optional[datetime] = None
+        self.last_success: Optional[datetime] = None
+        self.last_success_monotonic: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_duration_ms: Optional[float] = None
+        self.next_run_in: float = 0
+
+    def next_delay(self) -> float:
+        """Interval when healthy, exponential backoff after failures - both with jitter"""
+        if self.consecutive_failures == 0:
+            delay = self.interval_seconds
+        else:
+            base = min(POLLER_BACKOFF_BASE, self.interval_seconds)
+            delay = min(base * 2 ** (self.consecutive_failures - 1), POLLER_BACKOFF_MAX)
+        return max(1.0, delay * (1 + random.uniform(-POLLER_JITTER_RATIO, POLLER_JITTER_RATIO)))
+
+    def status(self) -> Dict[str, Any]:
+        if self.last_success_monotonic is None:
+            health = "pending" if self.total_runs == 0 else "down"
+        else:
+            age = time.monotonic() - self.last_success_monotonic
+            if age >= self.ttl_seconds + self.max_stale_seconds:
+                health = "down"          # cached data has aged out - requests wait on upstream
+            elif self.consecutive_failures:
+                health = "degraded"      # last refresh failed, stale data still being served
+            else:
+                health = "ok"
+        return {
+            "name": self.name,
+            "cache_key": self.cache_key,
+            "health": health,
+            "interval_seconds": self.interval_seconds,
+            "last_attempt": self.last_attempt.isoformat() if self.last_attempt else None,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "last_error": self.last_error,
+            "last_duration_ms": self.last_duration_ms,
+            "consecutive_failures": self.consecutive_failures,
+            "total_runs": self.total_runs,
+            "total_failures": self.total_failures,
+            "next_run_in": round(self.next_run_in, 1),
+        }
+
+class MarketDataPoller:
+    """Background scheduler that keeps market-data cache entries warm"""
+    def __init__(self, cache: APICache):
+        self._cache = cache
+        self._sources: Dict[str, PollerSource] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._listeners: List[Callable[[str, Any], Awaitable[None]]] = []
+        self._delivered: Dict[str, Any] = {}      # source -> last value handed to the listeners
+
+    def register(self, name: str, cache_key: str, fetcher: Callable[[], Awaitable[Any]],
+                 interval_seconds: float, ttl_seconds: float, max_stale_seconds: float = 0) -> None:
+        self._sources[name] = PollerSource(name, cache_key, fetcher, interval_seconds, ttl_seconds, max_stale_seconds)
+
+    def add_listener(self, listener: Callable[[str, Any], Awaitable[None]]) -> None:
+        """Call listener(source_name, value) after every successful refresh"""
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        for name, source in self._sources.items():
+            if name not in self._tasks or self._tasks[name].done():
+                self._tasks[name] = asyncio.create_task(self._run(source), name=f"poller:{name}")
+        logger.info(f"Market data poller started with {len(self._sources)} sources")
+
+    async def stop(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+
+    def is_running(self) -> bool:
+        return any(not t.done() for t in self._tasks.values())
+
+    async def _notify(self, name: str, value: Any) -> None:
+        self._delivered[name] = value
+        for listener in self._listeners:
+            try:
+                await listener(name, value)
+            except Exception as e:
+                logger.error(f"Poller listener failed for {name}: {e}")
+
+    async def lookup(self, name: str) -> CacheLookup:
+        """Read a source through the cache, fetching it on a miss like any handler would.
+        
+        With the poller stopped this is the only thing refreshing the source, so a value the
+        listeners have not seen yet (a miss or a finished background refresh) is passed on to them.
+        """
+        source = self._sources[name]
+        lookup = await self._cache.get_or_fetch(source.cache_key, source.ttl_seconds, source.fetcher,
+                                                source.max_stale_seconds)
+        if lookup.value is not None and lookup.value is not self._delivered.get(name):
+            await self._notify(name, lookup.value)
+        return lookup
+
+    async def refresh_now(self, name: str) -> bool:
+        """Run one refresh of a source immediately - returns True on success"""
+        source = self._sources[name]
+        source.total_runs += 1
+        source.last_attempt = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        error = None
+        try:
+            value = await self._cache.refresh(source.cache_key, source.ttl_seconds, source.fetcher,
+                                              source.max_stale_seconds)
+            if value is None:
+                error = "fetcher returned no data"
+        except Exception as e:
+            value = None
+            error = str(e) or e.__class__.__name__
+        source.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        if error:
+            source.consecutive_failures += 1
+            source.total_failures += 1
+            source.last_error = error
+            logger.warning(f"Poller source {name} failed ({source.consecutive_failures}x): {error}")
+            return False
+
+        source.consecutive_failures = 0
+        source.last_error = None
+        source.last_success = datetime.now(timezone.utc)
+        source.last_success_monotonic = time.monotonic()
+        await self._notify(name, value)
+        return True
+
+    async def _run(self, source: PollerSource) -> None:
+        # Spread the first run of each source over a couple of seconds
+        await asyncio.sleep(random.uniform(0, 2))
+        while True:
+            await self.refresh_now(source.name)
+            source.next_run_in = source.next_delay()
+            await asyncio.sleep(source.next_run_in)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": MARKET_POLLER_ENABLED,
+            "running": self.is_running(),
+            "sources": [source.status() for source in self._sources.values()],
+        }
+
+# Initialize global poller instance - sources are registered next to their fetchers
+market_poller = MarketDataPoller(api_cache)
+# =============================================================================
+
+# =============================================================================
+# MARKET STREAM - Fans poller refreshes out to Server-Sent Events subscribers
+# =============================================================================
+STREAM_MAX_SUBSCRIBERS = int(os.environ.get('STREAM_MAX_SUBSCRIBERS', 5000))
+STREAM_CLIENT_QUEUE_SIZE = 8      # pending live events per client, on top of the snapshot, before the oldest is dropped
+STREAM_KEEPALIVE_SECONDS = 15     # comment line sent to idle clients so proxies keep the socket open
+
+# Poller source -> SSE event name
+STREAM_EVENTS = {
+    "kraken_prices": "prices",
+    "fear_greed": "fear_greed",
+    "coingecko_global": "global",
+    "defillama_stablecoins": "stablecoins",
+    "defillama_tvl": "defi_tvl",
+    "kraken_movers": "movers",
+}
+
+def _stream_fingerprint(value: Any) -> str:
+    # updated_at changes on every refresh even when the numbers don't
+    if isinstance(value, dict):
+        value = {k: v for k, v in value.items() if k != "updated_at"}
+    return json.dumps(value, sort_keys=True, default=str)
+
+class MarketBroadcaster:
+    """One upstream refresh -> every connected client, with a bounded queue per client"""
+    def __init__(self):
+        self._subscribers: set = set()
+        self._latest: Dict[str, str] = {}          # event -> encoded SSE frame
+        self._fingerprints: Dict[str, str] = {}
+        self._sequence = 0
+        self._stats: Dict[str, int] = {"published": 0, "unchanged_skipped": 0, "frames_sent": 0, "frames_dropped": 0,
+                                       "rejected": 0}
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Optional[asyncio.Queue]:
+        """Register a client - returns None when the worker is at its subscriber limit"""
+        if len(self._subscribers) >= STREAM_MAX_SUBSCRIBERS:
+            self._stats["rejected"] += 1
+            return None
+        # Room for the whole snapshot however many event types there are, plus the live headroom
+        queue: asyncio.Queue = asyncio.Queue(maxsize=len(self._latest) + STREAM_CLIENT_QUEUE_SIZE)
+        # New clients get the current snapshot of every event straight away
+        for frame in self._latest.values():
+            queue.put_nowait(frame)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, event: str, value: Any) -> bool:
+        """Push value to every subscriber if it differs from the last one sent - returns True if pushed"""
+        fingerprint = _stream_fingerprint(value)
+        if self._fingerprints.get(event) == fingerprint:
+            self._stats["unchanged_skipped"] += 1
+            return False
+        self._fingerprints[event] = fingerprint
+        self._sequence += 1
+        frame = f"id: {self._sequence}\nevent: {event}\ndata: {json.dumps(value, default=str)}\n\n"
+        self._latest[event] = frame
+        self._stats["published"] += 1
+
+        for queue in self._subscribers:
+            if queue.full():
+                # Slow client - drop its oldest frame so it always catches up to current values
+                queue.get_nowait()
+                self._stats["frames_dropped"] += 1
+            queue.put_nowait(frame)
+            self._stats["frames_sent"] += 1
+        return True
+
+    async def on_poller_refresh(self, source_name: str, value: Any) -> None:
+        event = STREAM_EVENTS.get(source_name)
+        if event:
+            self.publish(event, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "subscribers": len(self._subscribers), "max_subscribers": STREAM_MAX_SUBSCRIBERS}
+
+# Initialize global broadcaster instance and feed it from the poller
+market_broadcaster = MarketBroadcaster()
+market_poller.add_listener(market_broadcaster.on_poller_refresh)
+# =============================================================================
+
+# =============================================================================
+# SYMBOL REGISTRY - Maps our asset ids to Kraken pairs (built-in, JSON file, MongoDB)
+# =============================================================================
+SYMBOL_REGISTRY_FILE = os.environ.get('SYMBOL_REGISTRY_FILE')
+KRAKEN_TICKER_CHUNK_SIZE = 50     # pairs per REST Ticker call - keeps the query string short
+MAX_PRICE_IDS = 250               # ids accepted by /api/crypto/prices?ids=
+
+# Built-in registry entries - the default live ticker, in display order
+KRAKEN_TRACKED_ASSETS = [
+    {"id": "bitcoin", "symbol": "BTC", "name": "Bitcoin", "rest_pair": "XBTUSD", "rest_key": "XXBTZUSD", "ws_symbol": "BTC/USD", "ticker": True},
+    {"id": "ethereum", "symbol": "ETH", "name": "Ethereum", "rest_pair": "ETHUSD", "rest_key": "XETHZUSD", "ws_symbol": "ETH/USD", "ticker": True},
+    {"id": "solana", "symbol": "SOL", "name": "Solana", "rest_pair": "SOLUSD", "rest_key": "SOLUSD", "ws_symbol": "SOL/USD", "ticker": True},
+    {"id": "usd-coin", "symbol": "USDC", "name": "USD Coin", "rest_pair": "USDCUSD", "rest_key": "USDCUSD", "ws_symbol": "USDC/USD", "ticker": True},
+]
+
+class SymbolRegistry:
+    """Asset id -> Kraken pair mapping.
+    
+    Entries need id, symbol, name and rest_pair. rest_key is the key Kraken uses in the
+    Ticker result when it differs from rest_pair (XBTUSD -> XXBTZUSD), ws_symbol is the v2
+    WebSocket symbol and ticker=True puts the asset in the default live ticker.
+    """
+    REQUIRED_FIELDS = ("id", "symbol", "name", "rest_pair")
+
+    def __init__(self, defaults: List[Dict[str, Any]]):
+        self._defaults = defaults
+        self._symbols: Dict[str, Dict[str, Any]] = {}
+        self._apply(defaults)
+
+    def _apply(self, entries: List[Dict[str, Any]]) -> int:
+        applied = 0
+        for entry in entries:
+            if entry.get("id") and entry.get("active") is False:
+                self._symbols.pop(entry["id"].lower(), None)
+                continue
+            if not all(entry.get(field) for field in self.REQUIRED_FIELDS):
+                logger.warning(f"Skipping symbol registry entry without {self.REQUIRED_FIELDS}: {entry}")
+                continue
+            asset_id = entry["id"].lower()
+            merged = {**self._symbols.get(asset_id, {}), **entry, "id": asset_id}
+            merged.setdefault("rest_key", merged["rest_pair"])
+            merged.setdefault("rank", len(self._symbols))
+            self._symbols[asset_id] = merged
+            applied += 1
+        return applied
+
+    async def load(self) -> None:
+        """Rebuild from built-ins, then SYMBOL_REGISTRY_FILE, then the MongoDB symbols collection"""
+        self._symbols = {}
+        self._apply(self._defaults)
+        if SYMBOL_REGISTRY_FILE:
+            try:
+                with open(SYMBOL_REGISTRY_FILE) as f:
+                    count = self._apply(json.load(f))
+                logger.info(f"Loaded {count} symbols from {SYMBOL_REGISTRY_FILE}")
+            except Exception as e:
+                logger.error(f"Error loading symbol registry file: {e}")
+        try:
+            db_symbols = await db.symbols.find({}, {"_id": 0}).to_list(5000)
+            if db_symbols:
+                logger.info(f"Loaded {self._apply(db_symbols)} symbols from MongoDB")
+        except Exception as e:
+            logger.error(f"Error loading symbol registry from MongoDB: {e}")
+
+    def get(self, asset_id: str) -> Optional[Dict[str, Any]]:
+        return self._symbols.get(asset_id.lower())
+
+    def resolve(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Known entries for ids, in request order, without duplicates"""
+        seen = set()
+        entries = []
+        for asset_id in ids:
+            entry = self._symbols.get(asset_id.lower())
+            if entry and entry["id"] not in seen:
+                seen.add(entry["id"])
+                entries.append(entry)
+        return entries
+
+    def ticker_assets(self) -> List[Dict[str, Any]]:
+        return sorted((e for e in self._symbols.values() if e.get("ticker")), key=lambda e: e["rank"])
+
+    def all(self) -> List[Dict[str, Any]]:
+        return sorted(self._symbols.values(), key=lambda e: e["rank"])
+
+# Initialize global symbol registry - reloaded from file/MongoDB on startup
+symbol_registry = SymbolRegistry(KRAKEN_TRACKED_ASSETS)
+# =============================================================================
+
+# =============================================================================
+# KRAKEN TICKER STREAM - Optional WebSocket ingestion of live prices
+# =============================================================================
+KRAKEN_WS_ENABLED = os.environ.get('KRAKEN_WS_ENABLED', 'false').lower() == 'true'
+KRAKEN_WS_URL = os.environ.get('KRAKEN_WS_URL', 'wss://ws.kraken.com/v2')
+KRAKEN_WS_MAX_AGE = 30            # seconds - older ticks mean the stream is unhealthy, use REST
+KRAKEN_WS_FLUSH_INTERVAL = 1      # seconds - ticks are batched into one cache write/broadcast
+KRAKEN_WS_RECONNECT_MAX = 60      # seconds - reconnect backoff cap
+
+class KrakenTickerStream:
+    """Keeps one Kraken WebSocket ticker subscription and an in-memory latest-price table"""
+    def __init__(self, url: str, assets: List[Dict[str, str]]):
+        self.url = url
+        self._assets = assets
+        self._latest: Dict[str, Dict[str, Any]] = {}     # asset id -> CryptoPrice dict
+        self._received_at: Dict[str, float] = {}         # asset id -> monotonic time of last tick
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._subscribed: set = set()                    # ws symbols subscribed on the open connection
+        self._stats: Dict[str, Any] = {"connects": 0, "disconnects": 0, "messages": 0, "ticks": 0,
+                                       "flushes": 0, "connected": False, "last_error": None}
+
+    async def set_assets(self, assets: List[Dict[str, str]]) -> None:
+        """Swap the tracked assets - an open connection is re-subscribed to the difference right away"""
+        self._assets = assets
+        tracked = {asset["id"] for asset in assets}
+        for asset_id in [a for a in self._latest if a not in tracked]:
+            del self._latest[asset_id]
+            self._received_at.pop(asset_id, None)
+        ws = self._ws
+        if ws is None or ws.closed:
+            return  # the next connect subscribes to the new list
+        wanted = set(self._by_ws_symbol())
+        removed, added = sorted(self._subscribed - wanted), sorted(wanted - self._subscribed)
+        self._subscribed = wanted
+        try:
+            if removed:
+                await ws.send_json(self._subscription_message("unsubscribe", removed))
+            if added:
+                await ws.send_json(self._subscription_message("subscribe", added))
+        except Exception as e:
+            # The read loop sees the broken connection too and reconnects with the full list
+            logger.warning(f"Kraken ticker stream: could not update the subscription: {e}")
+
+    def _by_ws_symbol(self) -> Dict[str, Dict[str, str]]:
+        return {asset["ws_symbol"]: asset for asset in self._assets if asset.get("ws_symbol")}
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="kraken-ws")
+            self._flush_task = asyncio.create_task(self._flush_loop(), name="kraken-ws-flush")
+            logger.info(f"Kraken ticker stream starting ({self.url})")
+
+    async def stop(self) -> None:
+        for task in (self._task, self._flush_task):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*(t for t in (self._task, self._flush_task) if t is not None), return_exceptions=True)
+        self._task = self._flush_task = None
+        self._stats["connected"] = False
+
+    def is_healthy(self) -> bool:
+        """True when every tracked asset has a tick younger than KRAKEN_WS_MAX_AGE"""
+        if not self._stats["connected"]:
+            return False
+        now = time.monotonic()
+        return all(
+            now - self._received_at.get(asset["id"], float("-inf")) < KRAKEN_WS_MAX_AGE
+            for asset in self._assets if asset.get("ws_symbol")
+        )
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Latest prices in display order"""
+        return [self._latest[asset["id"]] for asset in self._assets if asset["id"] in self._latest]
+
+    @staticmethod
+    def _subscription_message(method: str, symbols: List[str]) -> Dict[str, Any]:
+        return {"method": method, "params": {"channel": "ticker", "symbol": symbols}}
+
+    def handle_message(self, message: Dict[str, Any]) -> int:
+        """Apply one decoded WebSocket message - returns the number of ticks applied"""
+        self._stats["messages"] += 1
+        if message.get("channel") != "ticker" or message.get("type") not in ("snapshot", "update"):
+            if message.get("method") in ("subscribe", "unsubscribe") and not message.get("success", True):
+                logger.warning(f"Kraken ticker {message['method']} rejected: {message.get('error')}")
+            return 0
+
+        by_symbol = self._by_ws_symbol()
+        applied = 0
+        for tick in message.get("data", []):
+            asset = by_symbol.get(tick.get("symbol"))
+            if asset is None or tick.get("last") is None:
+                continue
+            last = float(tick["last"])
+            self._latest[asset["id"]] = {
+                "id": asset["id"],
+                "symbol": asset["symbol"],
+                "name": asset["name"],
+                "current_price": round(last, 2),
+                "price_change_24h": round(float(tick.get("change_pct") or 0), 2),
+                "market_cap": 0,  # Kraken doesn't provide market cap
+                "volume_24h": round(float(tick.get("volume") or 0) * last, 0)
+            }
+            self._received_at[asset["id"]] = time.monotonic()
+            applied += 1
+        if applied:
+            self._stats["ticks"] += applied
+            self._dirty = True
+        return applied
+
+    async def _run(self) -> None:
+        attempt = 0
+        while True:
+            try:
+                ws = await upstream_client.ws_connect(self.url, heartbeat=30)
+                try:
+                    self._stats["connects"] += 1
+                    self._stats["connected"] = True
+                    attempt = 0
+                    # A fresh subscription on every connect - Kraken does not remember it
+                    self._subscribed = set(self._by_ws_symbol())
+                    self._ws = ws
+                    await ws.send_json(self._subscription_message("subscribe", sorted(self._subscribed)))
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self.handle_message(json.loads(msg.data))
+                        elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                            break
+                finally:
+                    self._ws = None
+                    await ws.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["last_error"] = str(e) or e.__class__.__name__
+                logger.warning(f"Kraken ticker stream error: {self._stats['last_error']}")
+            self._stats["connected"] = False
+            self._stats["disconnects"] += 1
+            attempt += 1
+            delay = min(2 ** (attempt - 1), KRAKEN_WS_RECONNECT_MAX) * random.uniform(0.8, 1.2)
+            await asyncio.sleep(delay)
+
+    async def _flush_loop(self) -> None:
+        """Batch ticks into one cache write + broadcast per interval"""
+        while True:
+            await asyncio.sleep(KRAKEN_WS_FLUSH_INTERVAL)
+            if not self._dirty:
+                continue
+            self._dirty = False
+            prices = self.snapshot()
+            if prices:
+                api_cache.set("crypto_prices", prices, CACHE_TTL_CRYPTO_PRICES, CACHE_MAX_STALE_CRYPTO_PRICES)
+                store_symbol_prices(prices)
+                market_broadcaster.publish("prices", prices)
+                market_stats.update_prices(prices)
+                self._stats["flushes"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            **self._stats,
+            "enabled": KRAKEN_WS_ENABLED,
+            "url": self.url,
+            "healthy": self.is_healthy(),
+            "tick_age_seconds": {k: round(now - v, 1) for k, v in self._received_at.items()},
+        }
+
+# Initialize global ticker stream - only started when KRAKEN_WS_ENABLED is set
+kraken_ticker_stream = KrakenTickerStream(KRAKEN_WS_URL, symbol_registry.ticker_assets())
+# =============================================================================
+
+# =============================================================================
+# MARKET STATS - Snapshot rebuilt when live prices or CoinGecko global data refresh
+# =============================================================================
+class MarketStatsAggregator:
+    """Precomputed /api/crypto/market-stats payload.
+    
+    Totals and dominance come from CoinGecko global data; the live Kraken table adds the
+    current BTC price and nudges total cap and dominance by BTC's move since the global
+    snapshot was taken, so the numbers track prices between the slower CoinGecko refreshes.
+    """
+    def __init__(self):
+        self._prices: Optional[List[Dict[str, Any]]] = None
+        self._global: Optional[Dict[str, Any]] = None
+        self._btc_price_at_global: Optional[float] = None
+        self._prices_at: Optional[float] = None     # monotonic time each input was last received
+        self._global_at: Optional[float] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self.rebuilds = 0
+
+    @staticmethod
+    def _btc_price(prices: Optional[List[Dict[str, Any]]]) -> Optional[float]:
+        btc = next((p for p in prices or [] if p["id"] == "bitcoin"), None)
+        return btc["current_price"] if btc and btc["current_price"] > 0 else None
+
+    def update_prices(self, prices: List[Dict[str, Any]]) -> None:
+        self._prices = prices
+        self._prices_at = time.monotonic()
+        if self._global is not None and self._btc_price_at_global is None:
+            self._btc_price_at_global = self._btc_price(prices)
+        self._rebuild()
+
+    def update_global(self, global_data: Dict[str, Any]) -> None:
+        self._global = global_data
+        self._global_at = time.monotonic()
+        self._btc_price_at_global = self._btc_price(self._prices)
+        self._rebuild()
+
+    async def on_poller_refresh(self, source_name: str, value: Any) -> None:
+        if source_name == "kraken_prices":
+            self.update_prices(value)
+        elif source_name == "coingecko_global":
+            self.update_global(value)
+
+    def _rebuild(self) -> None:
+        if self._global is None:
+            return
+        total_market_cap = self._global["total_market_cap_usd"]
+        btc_dominance = self._global["btc_dominance"]
+        btc_price = self._btc_price(self._prices)
+
+        if btc_price and self._btc_price_at_global:
+            # Re-price only BTC's share of the global cap - the rest waits for the next global refresh
+            btc_cap = total_market_cap * btc_dominance / 100
+            live_btc_cap = btc_cap * btc_price / self._btc_price_at_global
+            total_market_cap += live_btc_cap - btc_cap
+            btc_dominance = live_btc_cap / total_market_cap * 100 if total_market_cap > 0 else btc_dominance
+
+        snapshot = {
+            "total_market_cap": round(total_market_cap, 0),
+            "btc_dominance": round(btc_dominance, 2),
+            "eth_dominance": self._global["eth_dominance"],
+            "total_volume_24h": round(self._global["total_volume_24h_usd"], 0),
+            "active_cryptos": self._global["active_cryptocurrencies"],
+            "market_cap_change_24h": self._global["market_cap_change_24h"],
+            "btc_price": btc_price,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+        self._snapshot = snapshot
+        self.rebuilds += 1
+        market_broadcaster.publish("market_stats", snapshot)
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        return self._snapshot
+
+    def freshness(self) -> tuple:
+        """(freshness, age_seconds) of the snapshot - stale once either input outlives its cache TTL"""
+        now = time.monotonic()
+        global_age = now - self._global_at if self._global_at is not None else 0.0
+        prices_age = now - self._prices_at if self._prices_at is not None else 0.0
+        stale = global_age > CACHE_TTL_COINGECKO or (self._prices_at is not None and prices_age > CACHE_TTL_CRYPTO_PRICES)
+        return ("stale" if stale else "fresh"), max(global_age, prices_age)
+
+# Initialize global aggregator and feed it from the poller (the Kraken stream feeds it on flush)
+market_stats = MarketStatsAggregator()
+market_poller.add_listener(market_stats.on_poller_refresh)
+# =============================================================================
+
+# =============================================================================
+# MARKET MOVERS - 24h gainers/losers ranked over every Kraken USD pair
+# =============================================================================
+MOVERS_UNIVERSE_REFRESH_SECONDS = 6 * 3600  # AssetPairs (the USD pair list) is re-read every 6 hours
+MOVERS_DEFAULT_LIMIT = 10
+MOVERS_MAX_LIMIT = 50
+MOVERS_DEFAULT_MIN_VOLUME = 100_000         # USD - illiquid pairs swing wildly and crowd the list
+
+# Stablecoins and fiat against USD aren't "movers"
+MOVERS_EXCLUDED_BASES = {"USDT", "USDC", "DAI", "PYUSD", "USDG", "USDE", "FDUSD", "TUSD", "USDS", "RLUSD",
+                         "EUR", "GBP", "AUD", "CAD", "CHF", "JPY"}
+
+# Kraken's legacy asset codes -> the tickers everyone else uses
+KRAKEN_SYMBOL_ALIASES = {"XBT": "BTC", "XDG": "DOGE"}
+
+class MoversRanking:
+    """Every Kraken USD pair kept in one list sorted by 24h change.
+    
+    Each refresh is one bulk Ticker call; only pairs whose change moved are re-positioned
+    (bisect out, insort back), so requests walk the ends of the list for top-k/bottom-k with
+    the volume filter applied on the fly - nothing is re-sorted per request.
+    """
+    def __init__(self):
+        self._universe: Dict[str, Dict[str, str]] = {}   # Ticker result key -> {symbol, pair}
+        self._universe_loaded_at = 0.0
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._order: List[tuple] = []                     # sorted (change_24h, key)
+        self.updated_at: Optional[str] = None
+        self._refreshed_at: Optional[float] = None        # monotonic
+        self._stats = {"refreshes": 0, "repositioned": 0}
+
+    async def _load_universe(self) -> None:
+        async with upstream_client.get("https://api.kraken.com/0/public/AssetPairs") as response:
+            if response.status != 200:
+                logger.warning(f"Kraken AssetPairs returned {response.status}")
+                return
+            data = await response.json()
+        universe = {}
+        for key, info in data.get("result", {}).items():
+            wsname = info.get("wsname", "")
+            if info.get("quote") not in ("ZUSD", "USD") or key.endswith(".d") or "/" not in wsname:
+                continue
+            if info.get("status", "online") != "online":
+                continue
+            base = wsname.split("/")[0]
+            symbol = KRAKEN_SYMBOL_ALIASES.get(base, base)
+            if symbol not in MOVERS_EXCLUDED_BASES:
+                universe[key] = {"symbol": symbol, "pair": wsname}
+        if universe:
+            self._universe = universe
+            self._universe_loaded_at = time.monotonic()
+            logger.info(f"Market movers universe: {len(universe)} Kraken USD pairs")
+
+    def _remove(self, change: float, key: str) -> None:
+        index = bisect.bisect_left(self._order, (change, key))
+        if index < len(self._order) and self._order[index] == (change, key):
+            del self._order[index]
+
+    def apply(self, tickers: Dict[str, Any]) -> int:
+        """Merge a bulk Ticker result - returns how many pairs changed rank position"""
+        names = {asset["symbol"]: asset["name"] for asset in symbol_registry.all()}
+        repositioned = 0
+        seen = set()
+        for key, info in tickers.items():
+            meta = self._universe.get(key)
+            if meta is None:
+                continue
+            price = float(info["c"][0])
+            open_price = float(info["o"])
+            if price <= 0 or open_price <= 0:
+                continue
+            change = round((price - open_price) / open_price * 100, 2)
+            row = {
+                "symbol": meta["symbol"],
+                "name": names.get(meta["symbol"], meta["symbol"]),
+                "pair": meta["pair"],
+                "price": price,
+                "change_24h": change,
+                "volume_24h": round(float(info["v"][1]) * price, 0)
+            }
+            previous = self._rows.get(key)
+            if previous is None or previous["change_24h"] != change:
+                if previous is not None:
+                    self._remove(previous["change_24h"], key)
+                bisect.insort(self._order, (change, key))
+                repositioned += 1
+            self._rows[key] = row
+            seen.add(key)
+        # Pairs that disappeared from the feed (delisted, halted) leave the ranking
+        for key in [k for k in self._rows if k not in seen]:
+            self._remove(self._rows.pop(key)["change_24h"], key)
+        return repositioned
+
+    async def refresh(self) -> Optional[Dict[str, Any]]:
+        if not self._universe or time.monotonic() - self._universe_loaded_at > MOVERS_UNIVERSE_REFRESH_SECONDS:
+            await self._load_universe()
+        if not self._universe:
+            return None
+        # No pair= parameter: Kraken returns every pair in one response
+        async with upstream_client.get("https://api.kraken.com/0/public/Ticker") as response:
+            if response.status != 200:
+                logger.warning(f"Kraken Ticker returned {response.status}")
+                return None
+            data = await response.json()
+        repositioned = self.apply(data.get("result", {}))
+        self.updated_at = datetime.now(timezone.utc).isoformat()
+        self._refreshed_at = time.monotonic()
+        self._stats["refreshes"] += 1
+        self._stats["repositioned"] += repositioned
+        return self.movers()
+
+    def movers(self, limit: int = MOVERS_DEFAULT_LIMIT, min_volume: float = MOVERS_DEFAULT_MIN_VOLUME) -> Dict[str, Any]:
+        """Top gainers and losers from the ends of the sorted list - O(limit + skipped) per call"""
+        def walk(entries, keep) -> List[Dict[str, Any]]:
+            picked = []
+            for change, key in entries:
+                if not keep(change) or len(picked) >= limit:
+                    break
+                row = self._rows[key]
+                if row["volume_24h"] >= min_volume:
+                    picked.append(row)
+            return picked
+
+        return {
+            "gainers": walk(reversed(self._order), lambda change: change > 0),
+            "losers": walk(self._order, lambda change: change < 0),
+            "pairs_ranked": len(self._order),
+            "updated_at": self.updated_at
+        }
+
+    def is_ready(self) -> bool:
+        return bool(self._order)
+
+    def freshness(self) -> tuple:
+        """(freshness, age_seconds) of the ranking - stale once it is older than CACHE_TTL_MOVERS"""
+        age = time.monotonic() - self._refreshed_at if self._refreshed_at is not None else 0.0
+        return ("stale" if age > CACHE_TTL_MOVERS else "fresh"), age
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "universe": len(self._universe), "pairs_ranked": len(self._order), "updated_at": self.updated_at}
+
+async def fetch_market_movers() -> Optional[Dict[str, Any]]:
+    """Refresh the movers ranking from Kraken - returns None if the call fails"""
+    try:
+        return await market_movers.refresh()
+    except Exception as e:
+        logger.error(f"Error fetching Kraken market movers: {e}")
+    return None
+
+# Initialize global ranking - refreshed by the poller, see the schedule next to the market routes
+market_movers = MoversRanking()
+# =============================================================================
+
+# =============================================================================
+# CHART RESAMPLING - NumPy LTTB downsampling and OHLC bucketing for chart series
+# =============================================================================
+CHART_MAX_POINTS = 500             # default target point count for chart responses
+CHART_POINTS_LIMIT = 5000          # largest points= a client may ask for
+
+# interval= values accepted by the chart endpoint (milliseconds per candle)
+CHART_INTERVALS = {
+    "5m": 5 * 60 * 1000,
+    "15m": 15 * 60 * 1000,
+    "1h": 60 * 60 * 1000,
+    "4h": 4 * 60 * 60 * 1000,
+    "1d": 24 * 60 * 60 * 1000,
+    "1w": 7 * 24 * 60 * 60 * 1000,
+}
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of the threshold points that keep the series' shape.
+    
+    One Python step per output bucket, the per-point area math is vectorized.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    # threshold - 2 buckets over the points between the fixed first and last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+        area = np.abs((x[anchor] - next_x) * (y[start:end] - y[anchor])
+                      - (x[anchor] - x[start:end]) * (next_y - y[anchor]))
+        anchor = start + int(area.argmax())
+        selected[i + 1] = anchor
+    return selected
+
+def ohlc_buckets(ts_ms: np.ndarray, prices: np.ndarray, interval_ms: int) -> Dict[str, np.ndarray]:
+    """Open/high/low/close per interval_ms bucket (bucket start as timestamp) - ts_ms must be sorted"""
+    bucket = (ts_ms // interval_ms) * interval_ms
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(prices)] - 1
+    return {
+        "timestamp": bucket[starts],
+        "open": prices[starts],
+        "high": np.maximum.reduceat(prices, starts),
+        "low": np.minimum.reduceat(prices, starts),
+        "close": prices[ends],
+    }
+
+def format_dates(ts_ms: np.ndarray) -> List[str]:
+    """YYYY-MM-DD for every timestamp in one vectorized pass"""
+    return np.datetime_as_string(ts_ms.astype("datetime64[ms]"), unit="D").tolist()
+
+def candle_rows(candles: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Chart rows for timestamp/open/high/low/close arrays - price is the close"""
+    rounded = {field: np.round(candles[field].astype(np.float64), 2).tolist() for field in ("open", "high", "low", "close")}
+    timestamps = candles["timestamp"].astype(np.int64)
+    return [
+        {"timestamp": ts, "date": date, "price": c, "open": o, "high": h, "low": low, "close": c}
+        for ts, date, o, h, low, c in zip(timestamps.tolist(), format_dates(timestamps),
+                                          rounded["open"], rounded["high"], rounded["low"], rounded["close"])
+    ]
+
+def resample_chart_series(ts_ms: np.ndarray, prices: np.ndarray, points: int = CHART_MAX_POINTS,
+                          interval: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Chart rows for a sorted series - LTTB down to points, or OHLC candles when interval is set.
+    
+    interval is the finest candle size; it is widened to a multiple of itself when the window
+    would otherwise produce more than points candles.
+    """
+    if len(ts_ms) == 0:
+        return []
+    ts_ms = ts_ms.astype(np.int64)
+    prices = prices.astype(np.float64)
+
+    if interval:
+        interval_ms = CHART_INTERVALS[interval]
+        span = int(ts_ms[-1] - ts_ms[0])
+        interval_ms *= max(1, math.ceil(span / interval_ms / points))
+        return candle_rows(ohlc_buckets(ts_ms, prices, interval_ms))
+
+    selected = lttb_indices(ts_ms.astype(np.float64), prices, points)
+    ts_ms, prices = ts_ms[selected], prices[selected]
+    return [
+        {"timestamp": ts, "price": price, "date": date}
+        for ts, price, date in zip(ts_ms.tolist(), np.round(prices, 2).tolist(), format_dates(ts_ms))
+    ]
+# =============================================================================
+
+
+# =============================================================================
+# CHART FORMATS - Opt-in columnar JSON, MessagePack and Arrow IPC chart encodings
+# =============================================================================
+try:
+    import msgpack
+except ImportError:  # optional - format=msgpack answers 406 without it
+    msgpack = None
+try:
+    import pyarrow as pa
+except ImportError:  # optional - format=arrow answers 406 without it
+    pa = None
+
+# format= value -> response media type (also matched against the Accept header)
+CHART_FORMAT_MEDIA_TYPES = {
+    "columnar": "application/vnd.alphacrypto.columnar+json",
+    "msgpack": "application/msgpack",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+CHART_FORMAT_ACCEPT_ALIASES = {"application/x-msgpack": "msgpack"}
+
+# Column name -> row field; dates are left out, clients derive them from t
+CHART_COLUMNS = {"t": "timestamp", "p": "price", "o": "open", "h": "high", "l": "low", "c": "close"}
+
+def negotiate_chart_format(format_param: Optional[str], accept: Optional[str]) -> str:
+    """json (row dicts, the default), columnar, msgpack or arrow - ?format= wins over Accept"""
+    if format_param:
+        if format_param != "json" and format_param not in CHART_FORMAT_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail=f"format must be one of json, {', '.join(CHART_FORMAT_MEDIA_TYPES)}")
+        return format_param
+    for media_range in (accept or "").split(","):
+        media_type = media_range.split(";")[0].strip().lower()
+        if media_type in CHART_FORMAT_ACCEPT_ALIASES:
+            return CHART_FORMAT_ACCEPT_ALIASES[media_type]
+        for fmt, candidate in CHART_FORMAT_MEDIA_TYPES.items():
+            if media_type == candidate:
+                return fmt
+    return "json"
+
+def chart_columns(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Row-per-point chart payload -> {"t": [...], "p": [...], ...} plus the payload metadata"""
+    rows = payload["data"]
+    present = [key for key, field in CHART_COLUMNS.items() if rows and field in rows[0]]
+    columns = {key: [row[CHART_COLUMNS[key]] for row in rows] for key in present}
+    if not rows:
+        columns = {"t": [], "p": []}
+    return {"coin_id": payload["coin_id"], "days": payload["days"], "interval": payload.get("interval"), **columns}
+
+def encode_chart(payload: Dict[str, Any], fmt: str) -> Response:
+    """Serialize a chart payload in a non-default format"""
+    columnar = chart_columns(payload)
+    if fmt == "columnar":
+        content = json.dumps(columnar, separators=(",", ":")).encode()
+        return Response(content=content, media_type=CHART_FORMAT_MEDIA_TYPES["columnar"])
+    if fmt == "msgpack":
+        if msgpack is None:
+            raise HTTPException(status_code=406, detail="MessagePack encoding is not available on this server")
+        return Response(content=msgpack.packb(columnar, use_bin_type=True), media_type=CHART_FORMAT_MEDIA_TYPES["msgpack"])
+    if fmt == "arrow":
+        if pa is None:
+            raise HTTPException(status_code=406, detail="Arrow encoding is not available on this server")
+        metadata = {key: str(columnar[key] or "") for key in ("coin_id", "days", "interval")}
+        table = pa.table(
+            {key: pa.array(columnar[key], type=pa.int64() if key == "t" else pa.float64())
+             for key in CHART_COLUMNS if key in columnar},
+        ).replace_schema_metadata(metadata)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(content=sink.getvalue().to_pybytes(), media_type=CHART_FORMAT_MEDIA_TYPES["arrow"])
+    raise ValueError(f"Unknown chart format: {fmt}")
+# =============================================================================
+
+# =============================================================================
+# PRICE HISTORY STORE - Chart series kept in MongoDB and filled incrementally
+# =============================================================================
+PRICE_HISTORY_COLLECTION = "price_history"
+PRICE_HISTORY_BACKFILL_DAYS = 365  # first sync pulls a year of daily points...
+PRICE_HISTORY_HOURLY_DAYS = 90     # ...plus the last 90 days at CoinGecko's hourly granularity
+PRICE_HISTORY_SYNC_SECONDS = 300   # a coin is re-synced at most this often
+CHART_MAX_DAYS = 3650
+CHART_LTTB_OVERSAMPLE = 4          # buckets fetched per requested point before LTTB picks the shape
+
+# Stored resolution -> (coarser resolution, age in days after which points are merged into it).
+# Keeps storage to ~2 days of 5-minute points, 90 days of hourly points and one point per day beyond
+PRICE_HISTORY_COMPACTION = {"5m": ("1h", 2), "1h": ("1d", PRICE_HISTORY_HOURLY_DAYS)}
+PRICE_HISTORY_RESOLUTION_MS = {"5m": 5 * 60 * 1000, "1h": 60 * 60 * 1000, "1d": 24 * 60 * 60 * 1000}
+EPOCH = datetime(1970, 1, 1)
+
+def market_chart_resolution(days: int) -> str:
+    """Granularity CoinGecko picks for a market_chart window"""
+    if days <= 1:
+        return "5m"
+    return "1h" if days <= 90 else "1d"
+
+def _epoch_ms(ts: datetime) -> int:
+    # MongoDB hands back naive UTC datetimes
+    return int(ts.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+async def fetch_coingecko_market_chart(coin_id: str, days: int) -> Optional[List[List[float]]]:
+    """Raw [timestamp_ms, price] pairs from CoinGecko market_chart - None if the call fails"""
+    try:
+        url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
+        params = {"vs_currency": "usd", "days": days}
+
+        async with upstream_client.get(url, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                return data.get("prices", [])
+            elif response.status == 429:
+                logger.warning("CoinGecko chart API rate limited")
+            else:
+                logger.warning(f"CoinGecko chart API returned {response.status}")
+    except Exception as e:
+        logger.error(f"Error fetching chart data: {e}")
+    return None
+
+class PriceHistoryStore:
+    """Per-coin price series in MongoDB, one document per point, unique on (coin_id, ts).
+    
+    Each sync only asks CoinGecko for the days since the newest stored point and inserts
+    what is newer, so every `days` window is served from the same local series. Points are
+    tagged with their resolution and merged into coarser ones as they age. Only coins in the
+    symbol registry are stored; charts are bucketed in MongoDB, so a window never loads more
+    than a few times `points` documents.
+    """
+    def __init__(self, database, collection_name: str):
+        self._db = database
+        self._collection_name = collection_name
+        self._synced_at: Dict[str, float] = {}
+        self._flights = SingleFlight()
+        self.timeseries = False
+
+    @property
+    def collection(self):
+        return self._db[self._collection_name]
+
+    def tracks(self, coin_id: str) -> bool:
+        return symbol_registry.get(coin_id) is not None
+
+    async def _remove_duplicates(self) -> int:
+        pipeline = [
+            {"$group": {"_id": {"coin_id": "$coin_id", "ts": "$ts"}, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ]
+        extra = []
+        async for group in self.collection.aggregate(pipeline, allowDiskUse=True):
+            extra.extend(group["ids"][1:])
+        if extra:
+            await self.collection.delete_many({"_id": {"$in": extra}})
+        return len(extra)
+
+    async def ensure_collection(self) -> None:
+        """Unique (coin_id, ts) index plus the (coin_id, res, ts) index compaction scans"""
+        try:
+            existing = await (await self._db.list_collections(filter={"name": self._collection_name})).to_list(None)
+            if existing and existing[0].get("type") == "timeseries":
+                # Created by an earlier version - time-series collections cannot hold a unique index
+                self.timeseries = True
+                logger.warning(f"{self._collection_name} is a time-series collection and cannot reject duplicate "
+                               f"points or be compacted - drop it to have it recreated")
+                await self.collection.create_index([("coin_id", 1), ("ts", 1)])
+                return
+            legacy = (await self.collection.index_information()).get("coin_id_1_ts_1")
+            if legacy and not legacy.get("unique"):
+                removed = await self._remove_duplicates()
+                logger.info(f"Removed {removed} duplicate price points before adding the unique index")
+                await self.collection.drop_index("coin_id_1_ts_1")
+            await self.collection.create_index([("coin_id", 1), ("ts", 1)], unique=True)
+            await self.collection.create_index([("coin_id", 1), ("res", 1), ("ts", 1)])
+        except Exception as e:
+            logger.error(f"Error preparing price history collection: {e}")
+
+    async def latest_timestamp(self, coin_id: str) -> Optional[datetime]:
+        doc = await self.collection.find_one({"coin_id": coin_id}, {"_id": 0, "ts": 1}, sort=[("ts", -1)])
+        if not doc:
+            return None
+        return doc["ts"].replace(tzinfo=timezone.utc)
+
+    async def _insert(self, docs: List[Dict[str, Any]]) -> int:
+        try:
+            await self.collection.insert_many(docs, ordered=False)
+            return len(docs)
+        except BulkWriteError as e:
+            # Another worker stored some of these points first - the unique index skips them
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+            return e.details.get("nInserted", 0)
+
+    async def _sync(self, coin_id: str) -> int:
+        latest = await self.latest_timestamp(coin_id)
+        if latest is None:
+            daily = await fetch_coingecko_market_chart(coin_id, PRICE_HISTORY_BACKFILL_DAYS)
+            hourly = await fetch_coingecko_market_chart(coin_id, PRICE_HISTORY_HOURLY_DAYS)
+            if daily is None and hourly is None:
+                return 0
+            # Daily points only where the hourly series doesn't reach
+            hourly = hourly or []
+            hourly_start = hourly[0][0] if hourly else float("inf")
+            series = ([(ts, price, "1d") for ts, price in daily or [] if ts < hourly_start]
+                      + [(ts, price, "1h") for ts, price in hourly])
+            since_ms = -1
+        else:
+            gap_days = max(1, math.ceil((datetime.now(timezone.utc) - latest).total_seconds() / 86400))
+            prices = await fetch_coingecko_market_chart(coin_id, gap_days)
+            if prices is None:
+                return 0
+            resolution = market_chart_resolution(gap_days)
+            series = [(ts, price, resolution) for ts, price in prices]
+            since_ms = latest.timestamp() * 1000
+
+        docs = [
+            {"coin_id": coin_id, "ts": datetime.fromtimestamp(ts / 1000, tz=timezone.utc), "price": price, "res": res}
+            for ts, price, res in series
+            if ts > since_ms and price is not None
+        ]
+        inserted = await self._insert(docs) if docs else 0
+        if inserted:
+            logger.info(f"Stored {inserted} new {coin_id} price points")
+        if not self.timeseries:
+            merged = await self._compact(coin_id)
+            if merged:
+                logger.info(f"Merged {merged} aged {coin_id} price points into coarser ones")
+        return inserted
+
+    async def _compact(self, coin_id: str) -> int:
+        """Keep the last point of every coarser bucket that has aged out of its resolution"""
+        merged = 0
+        now_ms = time.time() * 1000
+        for resolution, (coarser, age_days) in PRICE_HISTORY_COMPACTION.items():
+            bucket_ms = PRICE_HISTORY_RESOLUTION_MS[coarser]
+            # Whole buckets only, so a bucket is never merged twice
+            cutoff_ms = (now_ms - age_days * PRICE_HISTORY_RESOLUTION_MS["1d"]) // bucket_ms * bucket_ms
+            cutoff = datetime.fromtimestamp(cutoff_ms / 1000, tz=timezone.utc)
+            # Points stored before resolutions were tagged have no res and count as the finest
+            res = {"$in": [resolution, None]} if resolution == "5m" else resolution
+            docs = await self.collection.find({"coin_id": coin_id, "res": res, "ts": {"$lt": cutoff}}, {"ts": 1}) \
+                .sort("ts", 1).to_list(None)
+            keep, drop = [], []
+            last_bucket = None
+            for doc in docs:
+                bucket = _epoch_ms(doc["ts"]) // bucket_ms
+                if bucket == last_bucket:
+                    drop.append(keep[-1])
+                    keep[-1] = doc["_id"]
+                else:
+                    keep.append(doc["_id"])
+                    last_bucket = bucket
+            if drop:
+                await self.collection.delete_many({"_id": {"$in": drop}})
+            if keep:
+                await self.collection.update_many({"_id": {"$in": keep}}, {"$set": {"res": coarser}})
+            merged += len(drop)
+        return merged
+
+    async def sync(self, coin_id: str, force: bool = False) -> int:
+        """Fetch and store points newer than the latest stored one - concurrent calls share one sync"""
+        if not self.tracks(coin_id):
+            return 0
+        last_sync = self._synced_at.get(coin_id)
+        if not force and last_sync is not None and time.monotonic() - last_sync < PRICE_HISTORY_SYNC_SECONDS:
+            return 0
+        inserted = await self._flights.do(f"sync:{coin_id}", lambda: self._sync(coin_id))
+        self._synced_at[coin_id] = time.monotonic()
+        return inserted
+
+    async def get_buckets(self, coin_id: str, since: datetime, step_ms: int) -> List[Dict[str, Any]]:
+        """One open/high/low/close row per step_ms bucket since `since`, oldest first (_id is the bucket start)"""
+        ts_ms = {"$subtract": ["$ts", EPOCH]}
+        pipeline = [
+            {"$match": {"coin_id": coin_id, "ts": {"$gte": since}}},
+            {"$sort": {"ts": 1}},
+            {"$group": {
+                "_id": {"$subtract": [ts_ms, {"$mod": [ts_ms, step_ms]}]},
+                "open": {"$first": "$price"},
+                "high": {"$max": "$price"},
+                "low": {"$min": "$price"},
+                "close": {"$last": "$price"},
+                "ts": {"$last": "$ts"},
+            }},
+            {"$sort": {"_id": 1}},
+        ]
+        return await self.collection.aggregate(pipeline).to_list(None)
+
+    async def get_chart(self, coin_id: str, days: int, points: int = CHART_MAX_POINTS,
+                        interval: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Chart payload for any window from local history - syncs first, serves local data if the sync fails"""
+        try:
+            await self.sync(coin_id)
+        except Exception as e:
+            logger.warning(f"Price history sync failed for {coin_id}, serving stored points: {e}")
+        now_ms = time.time() * 1000
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        first = await self.collection.find_one({"coin_id": coin_id, "ts": {"$gte": since}}, {"_id": 0, "ts": 1},
+                                               sort=[("ts", 1)])
+        if not first:
+            return None
+        span_ms = max(1, int(now_ms - _epoch_ms(first["ts"])))
+
+        if interval:
+            # The candle size resample_chart_series would pick, so MongoDB returns the candles themselves
+            interval_ms = CHART_INTERVALS[interval]
+            step_ms = interval_ms * max(1, math.ceil(span_ms / interval_ms / points))
+            buckets = await self.get_buckets(coin_id, since, step_ms)
+            data = candle_rows({
+                "timestamp": np.fromiter((int(b["_id"]) for b in buckets), dtype=np.int64, count=len(buckets)),
+                **{field: np.fromiter((b[field] for b in buckets), dtype=np.float64, count=len(buckets))
+                   for field in ("open", "high", "low", "close")},
+            })
+        else:
+            # A few closes per output point, then LTTB keeps the shape
+            step_ms = max(1, span_ms // (points * CHART_LTTB_OVERSAMPLE))
+            buckets = await self.get_buckets(coin_id, since, step_ms)
+            ts_ms = np.fromiter((_epoch_ms(b["ts"]) for b in buckets), dtype=np.int64, count=len(buckets))
+            prices = np.fromiter((b["close"] for b in buckets), dtype=np.float64, count=len(buckets))
+            data = resample_chart_series(ts_ms, prices, points)
+        return {"coin_id": coin_id, "days": days, "interval": interval, "data": data}
+
+    async def stats(self) -> Dict[str, Any]:
+        pipeline = [{"$group": {"_id": {"coin_id": "$coin_id", "res": "$res"}, "points": {"$sum": 1},
+                                "first": {"$min": "$ts"}, "last": {"$max": "$ts"}}}]
+        coins: Dict[str, Any] = {}
+        for group in await self.collection.aggregate(pipeline).to_list(None):
+            coin = coins.setdefault(group["_id"]["coin_id"], {"points": 0, "first": group["first"], "last": group["last"],
+                                                                "resolutions": {}})
+            coin["points"] += group["points"]
+            coin["first"] = min(coin["first"], group["first"])
+            coin["last"] = max(coin["last"], group["last"])
+            coin["resolutions"][group["_id"].get("res") or "untagged"] = group["points"]
+        return {
+            "timeseries": self.timeseries,
+            "coins": {coin_id: {**coin, "first": coin["first"].isoformat(), "last": coin["last"].isoformat()}
+                      for coin_id, coin in coins.items()},
+        }
+
+# Initialize global price history store - indexes are created on startup, only registry coins are stored
+price_history = PriceHistoryStore(db, PRICE_HISTORY_COLLECTION)
+# =============================================================================
+
+# =============================================================================
+# DEFI TVL TRACKER - Daily TVL history kept locally, live point from DefiLlama chains
+# =============================================================================
+DEFI_TVL_COLLECTION = "defi_tvl_history"
+DEFI_TVL_HISTORY_URL = "https://api.llama.fi/v2/historicalChainTvl"
+DEFI_TVL_CHAINS_URL = "https://api.llama.fi/v2/chains"
+DEFI_TVL_MEMORY_DAYS = 120         # daily points kept in memory - enough for the 90d window
+DEFI_TVL_WINDOWS = (7, 30, 90)     # change_{n}d fields and sparklines
+DAY_SECONDS = 86400
+
+class DefiTvlTracker:
+    """Total DeFi TVL as one point per UTC day, persisted in MongoDB.
+    
+    The full historicalChainTvl series is only streamed when we are missing finished days
+    (first run, or after downtime); every other refresh sums the current TVL of each chain
+    from /v2/chains into today's point. Both downloads are parsed with ijson item by item.
+    """
+    def __init__(self, database, collection_name: str):
+        self._db = database
+        self._collection_name = collection_name
+        self._points: Dict[int, float] = {}    # UTC day start (epoch seconds) -> TVL
+        self._loaded = False
+        self.last_backfill: Optional[str] = None
+
+    @property
+    def collection(self):
+        return self._db[self._collection_name]
+
+    async def ensure_indexes(self) -> None:
+        try:
+            await self.collection.create_index("day", unique=True)
+        except Exception as e:
+            logger.error(f"Error creating DeFi TVL history index: {e}")
+
+    @staticmethod
+    def _day(epoch_seconds: float) -> int:
+        return int(epoch_seconds // DAY_SECONDS * DAY_SECONDS)
+
+    def _remember(self, day: int, tvl: float) -> None:
+        self._points[day] = tvl
+        if len(self._points) > DEFI_TVL_MEMORY_DAYS:
+            cutoff = sorted(self._points)[-DEFI_TVL_MEMORY_DAYS]
+            self._points = {d: v for d, v in self._points.items() if d >= cutoff}
+
+    async def _load(self) -> None:
+        try:
+            cursor = self.collection.find({}, {"_id": 0, "day": 1, "tvl": 1}).sort("day", -1).limit(DEFI_TVL_MEMORY_DAYS)
+            for doc in await cursor.to_list(DEFI_TVL_MEMORY_DAYS):
+                self._points[doc["day"]] = doc["tvl"]
+        except Exception as e:
+            logger.error(f"Error loading DeFi TVL history: {e}")
+        self._loaded = True
+
+    async def _store(self, points: List[tuple]) -> None:
+        if not points:
+            return
+        try:
+            await self.collection.bulk_write(
+                [UpdateOne({"day": day}, {"$set": {"day": day, "tvl": tvl}}, upsert=True) for day, tvl in points],
+                ordered=False,
+            )
+        except Exception as e:
+            logger.error(f"Error storing DeFi TVL history: {e}")
+
+    async def _backfill(self, after_day: int) -> int:
+        """Stream historicalChainTvl and keep only the days after after_day"""
+        points = []
+        async with upstream_client.get(DEFI_TVL_HISTORY_URL) as response:
+            if response.status != 200:
+                logger.warning(f"DefiLlama TVL API returned {response.status}")
+                return 0
+            async for item in ijson.items(response.content, "item", use_float=True):
+                day = self._day(int(item["date"]))
+                if day > after_day:
+                    points.append((day, float(item["tvl"])))
+        for day, tvl in points:
+            self._remember(day, tvl)
+        await self._store(points)
+        self.last_backfill = datetime.now(timezone.utc).isoformat()
+        logger.info(f"Backfilled {len(points)} DeFi TVL days")
+        return len(points)
+
+    async def _fetch_current_tvl(self) -> Optional[float]:
+        """Sum of every chain's current TVL - the live value for today's point"""
+        total = 0.0
+        async with upstream_client.get(DEFI_TVL_CHAINS_URL) as response:
+            if response.status != 200:
+                logger.warning(f"DefiLlama chains API returned {response.status}")
+                return None
+            async for tvl in ijson.items(response.content, "item.tvl", use_float=True):
+                total += tvl or 0
+        return total or None
+
+    def _value_on_or_before(self, day: int) -> Optional[float]:
+        candidates = [d for d in self._points if d <= day]
+        return self._points[max(candidates)] if candidates else None
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        if not self._points:
+            return None
+        today = max(self._points)
+        total_tvl = self._points[today]
+
+        def change(days: int) -> float:
+            previous = self._value_on_or_before(today - days * DAY_SECONDS)
+            return round((total_tvl - previous) / previous * 100, 2) if previous else 0
+
+        days = sorted(self._points)
+        return {
+            "total_tvl": round(total_tvl, 0),
+            "change_24h": change(1),
+            **{f"change_{window}d": change(window) for window in DEFI_TVL_WINDOWS},
+            "sparklines": {
+                f"{window}d": [round(self._points[d], 0) for d in days if d >= today - window * DAY_SECONDS]
+                for window in DEFI_TVL_WINDOWS
+            },
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "source": "DefiLlama"
+        }
+
+    async def refresh(self) -> Optional[Dict[str, Any]]:
+        """Fill missing finished days, update today's live point and return the snapshot"""
+        if not self._loaded:
+            await self._load()
+        today = self._day(time.time())
+        finished = [d for d in self._points if d < today]
+        if not finished or max(finished) < today - DAY_SECONDS:
+            await self._backfill(max(finished) if finished else -1)
+
+        current = await self._fetch_current_tvl()
+        if current is not None:
+            self._remember(today, current)
+            await self._store([(today, current)])
+        return self.snapshot()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "days_in_memory": len(self._points),
+            "first_day": datetime.fromtimestamp(min(self._points), tz=timezone.utc).date().isoformat() if self._points else None,
+            "last_day": datetime.fromtimestamp(max(self._points), tz=timezone.utc).date().isoformat() if self._points else None,
+            "last_backfill": self.last_backfill,
+        }
+
+# Initialize global TVL tracker - history index is created on startup
+defi_tvl_tracker = DefiTvlTracker(db, DEFI_TVL_COLLECTION)
+# =============================================================================
+
+# =============================================================================
+# ARTICLE SEARCH - In-memory inverted index with ES/EN stemming and accent folding
+# =============================================================================
+SEARCH_REBUILD_SECONDS = 300       # catches writes made around the admin API (no version bump)
+SEARCH_FIELD_WEIGHTS = {"title": 5.0, "tags": 4.0, "excerpt": 2.0, "content": 1.0}
+SEARCH_PREFIX_EXPANSIONS = 50      # max vocabulary terms a trailing partial word expands to
+SEARCH_BM25_K1 = 1.2
+SEARCH_BM25_B = 0.75
+
+SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Both languages' stopwords - articles mix Spanish and English
+SEARCH_STOPWORDS = frozenset("""
+a al algo ante como con contra cual cuando de del desde donde durante e el ella ellos en entre era es esa ese
+eso esta este esto fue ha han hay la las le les lo los mas me mi muy ni no nos o otra otro para pero por que
+se ser si sin sobre son su sus tambien te tiene todo tu un una uno unos y ya
+an and are as at be but by for from has have how in into is it its of on or that the their this to was what
+when which who will with you your
+""".split())
+
+# Longest suffix first; each entry keeps at least SEARCH_MIN_STEM characters of the word
+SEARCH_SUFFIXES = (
+    "amientos", "imientos", "aciones", "uciones", "amiento", "imiento", "mente", "acion", "ucion", "ables",
+    "ibles", "istas", "ation", "ments", "ness", "able", "ible", "ista", "ando", "iendo", "ment", "ings",
+    "ing", "ers", "ies", "ado", "ada", "ido", "ida", "es", "ed", "er", "ly", "os", "as", "s", "a", "e", "o",
+)
+SEARCH_MIN_STEM = 3
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip accents (Bitcóin -> bitcoin, niño -> nino)"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def stem_token(token: str) -> str:
+    """Light suffix stripping that works for both Spanish and English - applied to index and queries alike"""
+    for suffix in SEARCH_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= SEARCH_MIN_STEM:
+            return token[:-len(suffix)]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in SEARCH_TOKEN_RE.findall(fold_text(text)) if t not in SEARCH_STOPWORDS]
+
+class ArticleSearchIndex:
+    """BM25 over field-weighted term frequencies plus sorted word lists for prefix lookups.
+    
+    Built from MongoDB (mock articles when the collection is empty), kept current by the
+    admin article handlers and rebuilt every SEARCH_REBUILD_SECONDS. Results are article
+    summaries held in the index, so a search never touches MongoDB.
+    """
+    def __init__(self):
+        self._reset()
+        self._built_at = 0.0
+        self._built_version: Optional[str] = None
+        self._from_mock = False
+        self._build_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _reset(self) -> None:
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_lengths: Dict[str, float] = {}
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._doc_words: Dict[str, tuple] = {}      # article id -> (all words, title/tag words)
+        self._surface: Dict[str, int] = {}          # folded words -> document count, for prefix matching
+        self._sorted_surface: List[str] = []
+        self._words: Dict[str, int] = {}            # folded title/tag words -> document count, for suggestions
+        self._sorted_words: List[str] = []
+        self._vocab_dirty = False
+
+    def is_ready(self) -> bool:
+        return self._built_at > 0
+
+    def _analyze(self, article: Dict[str, Any]) -> tuple:
+        weights: Dict[str, float] = {}
+        words, suggestion_words = set(), set()
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            value = article.get(field) or ""
+            text = " ".join(value) if isinstance(value, (list, tuple)) else value
+            tokens = tokenize(text)
+            words.update(tokens)
+            if field in ("title", "tags"):
+                suggestion_words.update(tokens)
+            for token in tokens:
+                term = stem_token(token)
+                weights[term] = weights.get(term, 0.0) + weight
+        return weights, (words, suggestion_words)
+
+    @staticmethod
+    def _count(counts: Dict[str, int], words: set, delta: int) -> None:
+        for word in words:
+            counts[word] = counts.get(word, 0) + delta
+            if counts[word] <= 0:
+                del counts[word]
+
+    def upsert(self, article: Dict[str, Any]) -> None:
+        article_id = article["id"]
+        self.remove(article_id)
+        terms, (words, suggestion_words) = self._analyze(article)
+        for term, weight in terms.items():
+            self._postings.setdefault(term, {})[article_id] = weight
+        self._doc_terms[article_id] = terms
+        self._doc_lengths[article_id] = sum(terms.values())
+        self._doc_words[article_id] = (words, suggestion_words)
+        self._summaries[article_id] = {k: v for k, v in article.items() if k not in ("content", "_id")}
+        self._count(self._surface, words, 1)
+        self._count(self._words, suggestion_words, 1)
+        self._vocab_dirty = True
+
+    def remove(self, article_id: str) -> None:
+        terms = self._doc_terms.pop(article_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(article_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._doc_lengths.pop(article_id, None)
+        self._summaries.pop(article_id, None)
+        words, suggestion_words = self._doc_words.pop(article_id)
+        self._count(self._surface, words, -1)
+        self._count(self._words, suggestion_words, -1)
+        self._vocab_dirty = True
+
+    def _adopt(self, version: Optional[str]) -> None:
+        """Take the version our own write produced, if the index was current right before it.
+        
+        Any other version change (writes from other workers or outside the API) still rebuilds.
+        """
+        if version and self._built_version == ContentVersions.preceding(version):
+            self._built_version = version
+
+    def article_saved(self, article: Dict[str, Any], version: Optional[str] = None) -> None:
+        """Write-through from the admin handlers - the first real article replaces the mock set"""
+        if self._from_mock:
+            self._built_at = 0.0
+        elif self.is_ready():
+            self.upsert(article)
+            self._adopt(version)
+
+    def article_deleted(self, article_id: str, version: Optional[str] = None) -> None:
+        self.remove(article_id)
+        if not self._doc_terms:
+            self._built_at = 0.0  # collection may be empty again - rebuild falls back to mock articles
+        else:
+            self._adopt(version)
+
+    def _refresh_vocabulary(self) -> None:
+        if self._vocab_dirty:
+            self._sorted_surface = sorted(self._surface)
+            self._sorted_words = sorted(self._words)
+            self._vocab_dirty = False
+
+    @staticmethod
+    def _prefix_range(sorted_terms: List[str], prefix: str, limit: int) -> List[str]:
+        start = bisect.bisect_left(sorted_terms, prefix)
+        end = bisect.bisect_left(sorted_terms, prefix + "\uffff", lo=start)
+        return sorted_terms[start:min(end, start + limit)]
+
+    async def rebuild(self) -> None:
+        async with self._build_lock:
+            await self._rebuild()
+
+    async def _rebuild(self) -> None:
+        version = content_versions.token("articles")
+        try:
+            articles = await db.articles.find({}, {"_id": 0}).to_list(None)
+        except Exception as e:
+            logger.error(f"Error loading articles for the search index: {e}")
+            if self.is_ready():
+                return
+            articles = []
+        self._from_mock = not articles
+        if self._from_mock:
+            articles = fallback_pack.articles
+        self._reset()
+        for article in articles:
+            self.upsert(article)
+        self._refresh_vocabulary()
+        self._built_at = time.monotonic()
+        self._built_version = version
+        logger.info(f"Search index built: {len(self._doc_terms)} articles, {len(self._postings)} terms")
+
+    def _outdated(self) -> bool:
+        # Results are served under the articles ETag - they must move with the version
+        return not self.is_ready() or self._built_version != content_versions.token("articles")
+
+    async def ensure_ready(self) -> None:
+        """Build on first use or when the articles version moved; otherwise refresh in the background"""
+        if self._outdated():
+            async with self._build_lock:
+                if self._outdated():
+                    await self._rebuild()
+        elif time.monotonic() - self._built_at > SEARCH_REBUILD_SECONDS:
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = run_in_background(self.rebuild(), "article-search-refresh")
+
+    def search(self, query: str, limit: int = 20, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Ranked summaries - every word must match, the last one also as a prefix (search-as-you-type)"""
+        self._refresh_vocabulary()
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        total_docs = len(self._doc_terms) or 1
+        avg_length = sum(self._doc_lengths.values()) / total_docs
+
+        scores: Optional[Dict[str, float]] = None
+        for position, token in enumerate(tokens):
+            stemmed = stem_token(token)
+            candidates = {stemmed, token}
+            if position == len(tokens) - 1:
+                candidates |= {stem_token(w) for w in self._prefix_range(self._sorted_surface, token, SEARCH_PREFIX_EXPANSIONS)}
+            token_scores: Dict[str, float] = {}
+            for term in candidates:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for article_id, tf in postings.items():
+                    norm = SEARCH_BM25_K1 * (1 - SEARCH_BM25_B + SEARCH_BM25_B * self._doc_lengths[article_id] / avg_length)
+                    score = idf * tf * (SEARCH_BM25_K1 + 1) / (tf + norm)
+                    token_scores[article_id] = max(token_scores.get(article_id, 0.0), score)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {a: s + token_scores[a] for a, s in scores.items() if a in token_scores}
+            if not scores:
+                return []
+
+        category_key = category.lower() if category and category != "all" else None
+        ranked = heapq.nlargest(
+            len(scores) if category_key else limit,
+            scores.items(),
+            key=lambda item: (item[1], str(self._summaries[item[0]].get("published_at", ""))),
+        )
+        results = []
+        for article_id, _ in ranked:
+            summary = self._summaries[article_id]
+            if category_key and (summary.get("category") or "").lower() != category_key:
+                continue
+            results.append(summary)
+            if len(results) >= limit:
+                break
+        return results
+
+    def suggest(self, prefix: str, limit: int = 8) -> Dict[str, Any]:
+        """Typeahead: completions for the word being typed plus the best matching titles"""
+        self._refresh_vocabulary()
+        tokens = tokenize(prefix)
+        if not tokens:
+            return {"words": [], "articles": []}
+        last = tokens[-1]
+        words = self._prefix_range(self._sorted_words, last, 200)
+        words = sorted(words, key=lambda w: (-self._words[w], w))[:limit]
+        articles = [{"id": a["id"], "title": a["title"], "category": a.get("category")} for a in self.search(prefix, limit)]
+        return {"words": words, "articles": articles}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "articles": len(self._doc_terms),
+            "terms": len(self._postings),
+            "words": len(self._surface),
+            "suggestion_words": len(self._words),
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._built_at else None,
+        }
+
+# Initialize global search index - built on startup
+article_search = ArticleSearchIndex()
+# =============================================================================
+
+# =============================================================================
+# CONTENT VERSIONS - Per-collection counters behind ETag / 304 on admin-curated reads
+# =============================================================================
+CONTENT_VERSIONS_COLLECTION = "content_versions"
+CONTENT_VERSION_POLL_SECONDS = 5   # edits made through another worker are picked up within this window
+
+# Collections whose reads are validated by version - every admin write to one of them must bump it
+VERSIONED_COLLECTIONS = (
+    "articles", "airdrops", "signals", "yield_protocols", "staking_options",
+    "portfolio_holdings", "portfolio_trades", "portfolio_settings",
+)
+
+class ContentVersions:
+    """Version counter per collection, mirrored in memory so conditional reads never query MongoDB.
+    
+    Each counter document holds a random epoch (so a wiped counter cannot reuse old ETags),
+    the version and the time of the last bump. Admin handlers bump after a successful write;
+    every worker re-reads the counters every CONTENT_VERSION_POLL_SECONDS. The read model
+    bumps its collections when it finds writes made around the admin API; for articles
+    those need POST /admin/content-versions/{name}/bump.
+    """
+    def __init__(self, database, collection_name: str):
+        self.collection = database[collection_name]
+        self._versions: Dict[str, Dict[str, Any]] = {}
+        self._listeners: List[Callable[[str], Awaitable[None]]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: Callable[[str], Awaitable[None]]) -> None:
+        """Call listener(name) after this worker bumps a version"""
+        self._listeners.append(listener)
+
+    @staticmethod
+    def _entry(doc: Dict[str, Any]) -> Dict[str, Any]:
+        updated_at = doc.get("updated_at")
+        if isinstance(updated_at, datetime) and updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)  # MongoDB hands back naive UTC datetimes
+        return {"token": f"{doc['epoch']}.{doc['version']}", "updated_at": updated_at}
+
+    async def ensure_counters(self) -> None:
+        now = datetime.now(timezone.utc)
+        try:
+            await self.collection.bulk_write([
+                UpdateOne({"_id": name},
+                          {"$setOnInsert": {"epoch": uuid.uuid4().hex[:8], "version": 0, "updated_at": now}},
+                          upsert=True)
+                for name in VERSIONED_COLLECTIONS
+            ], ordered=False)
+        except Exception as e:
+            logger.error(f"Error creating content version counters: {e}")
+            return
+        await self.refresh()
+
+    async def refresh(self) -> None:
+        try:
+            docs = await self.collection.find({"_id": {"$in": list(VERSIONED_COLLECTIONS)}}).to_list(None)
+        except Exception as e:
+            logger.error(f"Error reading content versions: {e}")
+            return
+        self._versions = {doc["_id"]: self._entry(doc) for doc in docs}
+
+    async def bump(self, name: str) -> Optional[str]:
+        """New version token after a write (None if the bump failed) - listeners run before it returns"""
+        token = None
+        try:
+            doc = await self.collection.find_one_and_update(
+                {"_id": name},
+                {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)},
+                 "$setOnInsert": {"epoch": uuid.uuid4().hex[:8]}},
+                upsert=True, return_document=ReturnDocument.AFTER,
+            )
+            self._versions[name] = self._entry(doc)
+            token = self._versions[name]["token"]
+        except Exception as e:
+            # Without a new version this worker would keep answering 304 - stop validating until the next refresh
+            self._versions.pop(name, None)
+            logger.error(f"Error bumping content version for {name}: {e}")
+        for listener in self._listeners:
+            await listener(name)
+        return token
+
+    @staticmethod
+    def preceding(token: str) -> str:
+        """The token right before this one - every bump adds exactly one"""
+        epoch, _, version = token.rpartition(".")
+        return f"{epoch}.{int(version) - 1}"
+
+    def validators(self, names: tuple, variant: str = "") -> Optional[tuple]:
+        """(weak ETag, Last-Modified) for a response built from these collections, None if unknown
+        
+        Weak because the same version is served gzip-encoded and as is.
+        """
+        entries = [self._versions.get(name) for name in names]
+        if not all(entries):
+            return None
+        seed = "|".join([*(entry["token"] for entry in entries), str(fallback_pack.version), variant])
+        etag = 'W/"' + hashlib.sha1(seed.encode()).hexdigest()[:20] + '"'
+        stamps = [entry["updated_at"] for entry in entries if entry["updated_at"]]
+        return etag, (max(stamps) if stamps else None)
+
+    async def _poll(self) -> None:
+        # Counters are created here rather than in start() so startup never waits on MongoDB;
+        # until they are read, responses simply carry no validators
+        await self.ensure_counters()
+        while True:
+            await asyncio.sleep(CONTENT_VERSION_POLL_SECONDS)
+            await self.refresh()
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll(), name="content-versions")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def token(self, name: str) -> Optional[str]:
+        entry = self._versions.get(name)
+        return entry["token"] if entry else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: {"version": entry["token"], "updated_at": entry["updated_at"]}
+                for name, entry in self._versions.items()}
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison - the W/ prefix is ignored on both sides
+    etag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def conditional_response(request: Request, response: Response, *collections: str) -> Optional[Response]:
+    """Set ETag/Last-Modified on response - returns a 304 to send instead when the client copy is current"""
+    validators = content_versions.validators(collections, f"{request.url.path}?{request.query_params}")
+    if validators is None:
+        return None
+    etag, last_modified = validators
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif last_modified and request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+            not_modified = last_modified.replace(microsecond=0) <= since
+        except (TypeError, ValueError):
+            not_modified = False
+    else:
+        not_modified = False
+    return Response(status_code=304, headers=headers) if not_modified else None
+
+def drop_validators(response: Response) -> None:
+    """A fallback body must not be cached under the version's ETag"""
+    for header in ("ETag", "Last-Modified"):
+        if header in response.headers:
+            del response.headers[header]
+
+# Initialize global content versions - counters are created and polled by a task started on startup
+content_versions = ContentVersions(db, CONTENT_VERSIONS_COLLECTION)
+# =============================================================================
+
+# =============================================================================
+# READ MODEL - Admin-curated collections served from memory
+# =============================================================================
+READ_MODEL_POLL_SECONDS = 5        # version check interval when change streams are unavailable
+READ_MODEL_RESYNC_SECONDS = 60     # full reload that catches writes made around the admin API
+READ_MODEL_STREAM_RETRY_SECONDS = 10
+CHANGE_STREAMS_UNSUPPORTED = 40573 # OperationFailure code on standalone servers - there is no oplog to stream from
+
+class ReadModelView(NamedTuple):
+    collection: str
+    query: Dict[str, Any]
+    sort: Optional[List[tuple]]
+    limit: int
+
+# View name -> how the public endpoint reads it; the view name is also its content_versions name
+READ_MODEL_VIEWS = {
+    "airdrops": ReadModelView("airdrops", {}, [("deadline", 1)], 100),
+    "signals": ReadModelView("signals", {}, [("timestamp", -1)], 100),
+    "yield_protocols": ReadModelView("yield_protocols", {}, [("apy_value", -1)], 100),
+    "staking_options": ReadModelView("staking_options", {}, [("apy_value", -1)], 100),
+    "portfolio_holdings": ReadModelView("portfolio_holdings", {}, [("allocation", -1)], 20),
+    "portfolio_trades": ReadModelView("portfolio_trades", {}, [("created_at", -1)], 10),
+    "portfolio_settings": ReadModelView("portfolio_settings", {"id": "main"}, None, 1),
+}
+
+class ReadModel:
+    """Frozen snapshots of small, rarely written collections.
+    
+    Every view is tagged with the content version it was loaded at and is reloaded before
+    it is served under a newer one, so bodies always match their ETag across workers. Admin
+    writes reload the view in the same request (content_versions.bump calls back here).
+    With a replica set a change stream reloads views as soon as anything writes to them;
+    on a standalone server the views are checked every READ_MODEL_POLL_SECONDS instead.
+    Either way a periodic full reload bumps the version if it finds content that changed
+    without one.
+    """
+    def __init__(self, database, views: Dict[str, ReadModelView]):
+        self.db = database
+        self.views = views
+        self._data: Dict[str, tuple] = {}
+        self._versions: Dict[str, Optional[str]] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._locks = {name: asyncio.Lock() for name in views}
+        self._tasks: List[asyncio.Task] = []
+        self.mode = "stopped"
+        self.reloads = 0
+
+    def _outdated(self, name: str) -> bool:
+        return name not in self._data or self._versions.get(name) != content_versions.token(name)
+
+    async def _load(self, name: str) -> bool:
+        """Replace the snapshot - returns True if the content changed under an unchanged version"""
+        view = self.views[name]
+        version = content_versions.token(name)
+        cursor = self.db[view.collection].find(view.query, {"_id": 0})
+        if view.sort:
+            cursor = cursor.sort(view.sort)
+        docs = await cursor.to_list(view.limit)
+        fingerprint = hashlib.sha1(json.dumps(docs, sort_keys=True, default=str).encode()).hexdigest()
+        changed_unversioned = (name in self._data and version == self._versions.get(name)
+                               and fingerprint != self._fingerprints.get(name))
+        self._data[name] = freeze(docs)
+        self._versions[name] = version
+        self._fingerprints[name] = fingerprint
+        self.reloads += 1
+        return changed_unversioned
+
+    async def _sync(self, name: str, force: bool) -> None:
+        async with self._locks[name]:
+            if not force and not self._outdated(name):
+                return
+            changed_unversioned = await self._load(name)
+        if changed_unversioned:
+            # Outside the lock - the bump calls back into reload()
+            logger.info(f"Read model: {name} changed without a version bump - bumping")
+            await content_versions.bump(name)
+
+    async def reload(self, name: str) -> None:
+        await self._sync(name, force=True)
+
+    async def read(self, name: str) -> Optional[tuple]:
+        """Current snapshot - reloaded first if the content version moved (raises if MongoDB is down)
+        
+        A view that has not loaded yet reads as None once the model is started, so requests
+        during startup (or while MongoDB is unreachable) fall back instead of waiting on it.
+        The fallback body is not that version's content - callers drop the validators for it.
+        """
+        if name not in self._data and self._tasks:
+            return None
+        if self._outdated(name):
+            await self._sync(name, force=False)
+        return self._data[name]
+
+    async def on_change(self, name: str) -> None:
+        if name in self.views:
+            try:
+                await self.reload(name)
+            except Exception as e:
+                logger.error(f"Read model: error reloading {name}: {e}")
+
+    async def _reload_all(self, only_outdated: bool = False) -> None:
+        # Views have their own locks - load them concurrently
+        names = [name for name in self.views if not only_outdated or self._outdated(name)]
+        await asyncio.gather(*(self.on_change(name) for name in names))
+
+    async def _watch(self) -> None:
+        collections = sorted({view.collection for view in self.views.values()})
+        pipeline = [{"$match": {"ns.coll": {"$in": collections}}}]
+        while True:
+            try:
+                async with self.db.watch(pipeline) as stream:
+                    self.mode = "change_stream"
+                    logger.info(f"Read model following a change stream on {len(collections)} collections")
+                    await self._reload_all()  # anything written before the stream opened
+                    async for change in stream:
+                        coll = change.get("ns", {}).get("coll")
+                        # An admin write on another worker bumps right after writing - pick that up
+                        # first so the reload is tagged with it instead of looking unversioned
+                        await content_versions.refresh()
+                        for name, view in self.views.items():
+                            if view.collection == coll:
+                                await self.on_change(name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, OperationFailure) and e.code == CHANGE_STREAMS_UNSUPPORTED:
+                    logger.info("Change streams unavailable on a standalone server - read model falls back to polling")
+                    await self._poll()
+                    return
+                # Anything else (MongoDB briefly unreachable, an election) is worth another try
+                logger.error(f"Read model change stream failed: {e} - retrying in {READ_MODEL_STREAM_RETRY_SECONDS}s")
+                await asyncio.sleep(READ_MODEL_STREAM_RETRY_SECONDS)
+
+    async def _poll(self) -> None:
+        self.mode = "polling"
+        last_resync = time.monotonic()
+        while True:
+            await asyncio.sleep(READ_MODEL_POLL_SECONDS)
+            if time.monotonic() - last_resync >= READ_MODEL_RESYNC_SECONDS:
+                await self._reload_all()
+                last_resync = time.monotonic()
+            else:
+                await self._reload_all(only_outdated=True)
+
+    async def _run(self) -> None:
+        await self._reload_all()
+        await self._watch()
+
+    async def start(self) -> None:
+        # Loads in the background - startup does not wait on MongoDB
+        if not self._tasks:
+            self._tasks.append(asyncio.create_task(self._run(), name="read-model"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self.mode = "stopped"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "reloads": self.reloads,
+            "views": {name: {"documents": len(self._data.get(name, ())), "version": self._versions.get(name)}
+                      for name in self.views},
+        }
+
+# Initialize global read model - loaded in the background from startup, kept current by version bumps and the change stream
+read_model = ReadModel(db, READ_MODEL_VIEWS)
+content_versions.add_listener(read_model.on_change)
+# =============================================================================
+
+# =============================================================================
+# ADMIN STATS - Dashboard counts from estimated totals and incrementally kept counters
+# =============================================================================
+STAT_COUNTERS_COLLECTION = "stat_counters"
+STAT_COUNTERS_RECONCILE_SECONDS = 3600   # recount in the background to absorb writes made around the API
+STAT_COUNTERS_RECONCILE_ATTEMPTS = 3     # recounts per counter while increments keep landing mid-recount
+
+# Dashboard key -> collection whose size it reports (collection metadata, no scan)
+STAT_TOTALS = {"articles": "articles", "airdrops": "airdrops", "signals": "signals", "total_users": "users"}
+
+# Dashboard key -> (collection, filter) it counts; the write handlers keep these with $inc
+STAT_COUNTERS = {
+    "subscribers": ("alert_subscriptions", {"active": True}),
+    "pending_consulting": ("consulting", {"status": "new"}),
+    "unread_feedback": ("feedback", {"read": False}),
+    "premium_users": ("users", {"is_premium": True}),
+}
+
+class AdminStats:
+    """Admin dashboard numbers in one concurrent round of cheap reads.
+    
+    Totals use estimated_document_count. Filtered counts live in a small counters collection
+    that the write handlers increment, so reading them is one find however large the
+    underlying collections grow. A background recount keeps the counters honest.
+    """
+    def __init__(self, database, collection_name: str):
+        self.db = database
+        self.counters = database[collection_name]
+        self._task: Optional[asyncio.Task] = None
+        self.last_reconcile: Optional[str] = None
+
+    async def increment(self, name: str, delta: int = 1) -> None:
+        if not delta:
+            return
+        try:
+            await self.counters.update_one({"_id": name}, {"$inc": {"value": delta}}, upsert=True)
+        except Exception as e:
+            logger.error(f"Error updating stat counter {name}: {e}")
+
+    async def _count(self, name: str) -> int:
+        collection, query = STAT_COUNTERS[name]
+        return await self.db[collection].count_documents(query)
+
+    async def _reconcile_one(self, name: str) -> bool:
+        """Recount one counter and store it only if no increment landed meanwhile - True once stored"""
+        for _ in range(STAT_COUNTERS_RECONCILE_ATTEMPTS):
+            doc = await self.counters.find_one({"_id": name})
+            current = doc.get("value") if doc else None
+            count = await self._count(name)
+            try:
+                # Compare-and-set: a $inc (or another worker's reconcile) since the read makes this miss
+                result = await self.counters.update_one({"_id": name, "value": current},
+                                                        {"$set": {"value": count}}, upsert=doc is None)
+            except DuplicateKeyError:
+                continue  # created by an increment while counting
+            if result.matched_count or result.upserted_id is not None:
+                return True
+        logger.warning(f"Stat counter {name} kept changing during the recount - left for the next reconcile")
+        return False
+
+    async def reconcile(self) -> None:
+        try:
+            await asyncio.gather(*(self._reconcile_one(name) for name in STAT_COUNTERS))
+            self.last_reconcile = datetime.now(timezone.utc).isoformat()
+        except Exception as e:
+            logger.error(f"Error reconciling stat counters: {e}")
+
+    async def snapshot(self) -> Dict[str, int]:
+        totals_and_counters = await asyncio.gather(
+            *(self.db[collection].estimated_document_count() for collection in STAT_TOTALS.values()),
+            self.counters.find({"_id": {"$in": list(STAT_COUNTERS)}}).to_list(None),
+        )
+        stats = dict(zip(STAT_TOTALS, totals_and_counters[:-1]))
+        counters = {doc["_id"]: doc.get("value", 0) for doc in totals_and_counters[-1]}
+        # Counters not created yet (first start, reconcile still running) are counted directly
+        missing = [name for name in STAT_COUNTERS if name not in counters]
+        for name, count in zip(missing, await asyncio.gather(*(self._count(name) for name in missing))):
+            counters[name] = count
+        stats.update({name: max(int(counters[name]), 0) for name in STAT_COUNTERS})
+        return stats
+
+    async def _run(self) -> None:
+        while True:
+            await self.reconcile()
+            await asyncio.sleep(STAT_COUNTERS_RECONCILE_SECONDS)
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="admin-stats")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+# Initialize global admin stats - counters are reconciled on startup and hourly
+admin_stats = AdminStats(db, STAT_COUNTERS_COLLECTION)
 # =============================================================================
 
 # Create the main app without a prefix
@@ -139,6 +2716,19 @@ class Article(BaseModel):
     tags: Optional[List[str]] = None
     read_time: Optional[str] = None
 
+class ArticleSummary(BaseModel):
+    """Article list item - everything but the markdown body"""
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    title: str
+    excerpt: str
+    category: str
+    premium: bool = False
+    published_at: str
+    image_url: str
+    tags: Optional[List[str]] = None
+    read_time: Optional[str] = None
+
 class AirdropTask(BaseModel):
     id: str
     description: str
@@ -194,946 +2784,376 @@ class ConsultingRequest(BaseModel):
     id: str
     name: str
     email: str
-    company: Optional[str] = None
-    message: str
-    service_type: str
-    created_at: str
-    status: str = "new"  # new, contacted, completed
-
-class EmailAlertSubscription(BaseModel):
-    email: str
-
-class PaymentSubmission(BaseModel):
-    email: str
-    wallet_address: str
-    chain: str
-    tx_hash: Optional[str] = None
-    amount: float
-
-class User(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    email: str
-    wallet_address: str
-    is_premium: bool = False
-    premium_until: Optional[str] = None
-    payment_chain: str
-    created_at: str
-
-class Payment(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    user_email: str
-    amount: float
-    chain: str
-    tx_hash: Optional[str] = None
-    status: str  # pending, verified, rejected
-    created_at: str
-
-
-# Mock data generators
-def get_mock_crypto_prices():
-    # Updated mock prices - these are displayed when CoinGecko API is rate-limited
-    # Note: CoinGecko free tier has strict rate limits
-    return [
-        {
-            "id": "bitcoin",
-            "symbol": "BTC",
-            "name": "Bitcoin",
-            "current_price": 97250.00,
-            "price_change_24h": 1.85,
-            "market_cap": 1920000000000,
-            "volume_24h": 42500000000
-        },
-        {
-            "id": "ethereum",
-            "symbol": "ETH",
-            "name": "Ethereum",
-            "current_price": 3680.50,
-            "price_change_24h": 2.15,
-            "market_cap": 443000000000,
-            "volume_24h": 18200000000
-        },
-        {
-            "id": "solana",
-            "symbol": "SOL",
-            "name": "Solana",
-            "current_price": 198.45,
-            "price_change_24h": 3.25,
-            "market_cap": 96000000000,
-            "volume_24h": 4800000000
-        },
-        {
-            "id": "usd-coin",
-            "symbol": "USDC",
-            "name": "USD Coin",
-            "current_price": 1.00,
-            "price_change_24h": 0.01,
-            "market_cap": 42000000000,
-            "volume_24h": 8100000000
-        }
-    ]
-
-def get_mock_articles():
-    return [
-        {
-            "id": "1",
-            "title": "Stablecoins: $300B y Contando... La Revolución Ya Llegó",
-            "excerpt": "$46 trillones en transacciones anuales. Los stablecoins ya procesan más que Visa y Mastercard combinadas. Aquí está la data que necesitas saber.",
-            "category": "Stablecoins",
-            "tags": ["USDC", "USDT", "Pagos", "Remesas"],
-            "read_time": "6 min",
-            "premium": False,
-            "published_at": "2026-02-05T10:00:00Z",
-            "image_url": "https://images.unsplash.com/photo-1621761191319-c6fb62004040?w=800",
-            "content": """GM. Esta es Alpha Crypto, tu newsletter de inteligencia cripto. Hoy hablamos del elefante en la habitación que nadie puede ignorar.
-
----
-
-## LOS NÚMEROS QUE IMPORTAN
-
-Las stablecoins dejaron de ser "cripto" para convertirse en infraestructura financiera global. Mira estos números:
-
-| Métrica | 2024 | 2025 | Cambio |
-|---------|------|------|--------|
-| Market Cap | $170B | $300B+ | +76% |
-| Volumen Anual | $12T | $46T | +283% |
-| Usuarios Activos | 25M | 46.7M | +87% |
-| Países con Usuarios | 70 | 106 | +51% |
-
-**El dato que vuela cabezas:** Las stablecoins procesaron $46 TRILLONES en 2025. Eso es más que Visa y Mastercard COMBINADAS.
-
----
-
-## ADOPCIÓN GLOBAL: LATAM LIDERA
-
-Los países con mayor adopción de stablecoins (2025):
-
-1. **India** - #1 global
-2. **Estados Unidos** - #2
-3. **Pakistán** - #3
-4. **Filipinas** - #4
-5. **Brasil** - #5
-
-**Argentina (#18), México (#19), Venezuela (#11)** - LATAM está en el mapa. Las remesas con stablecoins cuestan 80% menos que Western Union.
-
----
-
-## ¿POR QUÉ ESTÁ PASANDO ESTO?
-
-**1. Regulación Clara**
-- EE.UU: GENIUS Act aprobado
-- Europa: MiCAR implementado
-- Japón y Singapur: Marcos legales claros
-
-**2. Adopción Institucional**
-- Interactive Brokers integró stablecoins
-- BlackRock y Franklin Templeton usan USDC
-- Worldpay procesa pagos con stables
-
-**3. Casos de Uso Reales**
-- Remesas: 80% más baratas
-- Pagos B2B: Settlement instantáneo
-- Gaming: Pagos en tiempo real
-- Payroll: Gusto paga contractors con stables
-
----
-
-## USDC vs USDT: LA BATALLA
-
-| | USDC | USDT |
-|--|------|------|
-| Market Cap | $74B | $140B+ |
-| Volumen 30d | $6.5T | $1.6T |
-| Chains | 30 | 15+ |
-| Uso Principal | Institucional | Retail global |
-
-**El insight:** USDC mueve 4x más valor diario que USDT, pero USDT tiene más usuarios. USDC es el "settlement layer", USDT es la "moneda del pueblo".
-
----
-
-## ¿CÓMO APROVECHAR ESTA TENDENCIA?
-
-**Para inversores:**
-1. **Infraestructura**: ETH, SOL, TRX (las chains donde corren los stables)
-2. **DeFi Yields**: Aave, Compound ofrecen 4-8% APR en stables
-3. **Circle**: Si sale a bolsa, es la jugada obvia
-
-**Para usuarios:**
-- Usa stablecoins para remesas (ahorra 80%+)
-- Mantén ahorros en USDC en lugar de cuenta de banco (acceso global)
-- Explora yields en DeFi (pero DYOR)
-
----
-
-## PREDICCIÓN 2026
-
-> "Los stablecoins se convertirán en infraestructura invisible. Estarán en todas partes pero nadie los verá."
-> — ZeroHash Report 2026
-
-El market cap podría alcanzar **$500B** para fin de 2026. Las stablecoins no son el futuro. **Son el presente.** 🦉"""
-        },
-        {
-            "id": "2",
-            "title": "AI Agents: Las Máquinas Ya Tienen Wallets... y Están Gastando",
-            "excerpt": "El protocolo x402, Ethereum como backbone, y cómo los agentes de IA están creando una economía de $100B para 2030.",
-            "category": "AI",
-            "tags": ["Inteligencia Artificial", "x402", "Ethereum", "Automatización"],
-            "read_time": "5 min",
-            "premium": False,
-            "published_at": "2026-02-03T15:30:00Z",
-            "image_url": "https://images.unsplash.com/photo-1677442136019-21780ecad995?w=800",
-            "content": """GM. ¿Qué pasaría si tu IA pudiera pagar sus propias facturas? Ya está pasando.
-
----
-
-## ¿QUÉ SON LOS AI AGENTS EN CRYPTO?
-
-Imagina un bot que:
-- Tiene su propia wallet
-- Puede recibir y enviar pagos
-- Opera 24/7 sin intervención humana
-- Toma decisiones financieras autónomas
-
-**Eso es un AI Agent.** Y están multiplicándose.
-
----
-
-## EL PROTOCOLO x402: HTTP CON PAGOS
-
-El x402 es como HTTP pero con pagos nativos. Funciona así:
-
-```
-Usuario pide servicio → AI Agent cotiza → Pago automático → Servicio entregado
-```
-
-**Sin intermediarios. Sin fricción. Sin humanos.**
-
-Ejemplo real: Un AI Agent que necesita procesar datos puede automáticamente:
-1. Buscar el proveedor más barato
-2. Negociar precio
-3. Pagar en crypto
-4. Recibir el servicio
-
-Todo en segundos.
-
----
-
-## NÚMEROS QUE IMPORTAN
-
-| Métrica | 2025 | 2030 (Proyección) |
-|---------|------|-------------------|
-| AI Agents con wallets | 50K+ | 10M+ |
-| Transacciones M2M | $1B | $100B+ |
-| % de txs crypto por AIs | 2% | 15%+ |
-
----
-
-## PROYECTOS EN EL RADAR
-
-**Tier 1 - Ya funcionando:**
-- **Autonolas** - Framework para agentes autónomos
-- **Fetch.ai (FET)** - Red de agentes económicos
-- **SingularityNET (AGIX)** - Marketplace de IA
-
-**Tier 2 - Emergentes:**
-- **Morpheus** - Red descentralizada de AI agents
-- **ChainGPT** - IA especializada en blockchain
-- **Ocean Protocol** - Mercado de datos para IA
-
----
-
-## ¿POR QUÉ ESTO IMPORTA?
-
-**La economía M2M (Machine-to-Machine) es el próximo salto.**
-
-Piénsalo:
-- IoT devices: 75 billones para 2025
-- AI services: $200B mercado
-- Micropagos: Imposibles con rails tradicionales
-
-**Crypto es la ÚNICA infraestructura que puede manejar billones de micropagos entre máquinas.**
-
----
-
-## RIESGOS A CONSIDERAR
-
-- **Regulación**: ¿Quién es responsable si una IA comete fraude?
-- **Seguridad**: Smart contracts con bugs = dinero perdido
-- **Concentración**: ¿Pocas corporaciones controlarán los agents?
-
----
-
-## CÓMO POSICIONARSE
-
-**Conservador:**
-- ETH (backbone de AI agents)
-- LINK (oráculos para datos de IA)
-
-**Moderado:**
-- FET, AGIX (tokens de infraestructura AI)
-- Autonolas ecosystem
-
-**Agresivo:**
-- AI agent tokens tempranos
-- Protocolos de datos descentralizados
-
----
-
-## PREDICCIÓN
-
-> Para 2030, el 15% de todas las transacciones crypto serán ejecutadas por máquinas, no humanos.
-
-La economía agentic no es ciencia ficción. **Es la próxima frontera.** 🦉"""
-        },
-        {
-            "id": "3",
-            "title": "Estado del Mercado Crypto 2026: Lo Que Necesitas Saber",
-            "excerpt": "BTC a $70K, ETFs con $50B+, y el halving haciendo lo suyo. Aquí está el panorama completo.",
-            "category": "Mercado",
-            "tags": ["Bitcoin", "ETFs", "Regulación", "Análisis"],
-            "read_time": "7 min",
-            "premium": False,
-            "published_at": "2026-02-01T09:00:00Z",
-            "image_url": "https://images.unsplash.com/photo-1642790106117-e829e14a795f?w=800",
-            "content": """GM. Es febrero 2026 y el mercado está en un momento crucial. Te traemos el análisis completo.
-
----
-
-## SNAPSHOT DEL MERCADO
-
-| Métrica | Valor Actual |
-|---------|--------------|
-| BTC Price | ~$70,000 |
-| ETH Price | ~$2,000 |
-| Total Market Cap | $2.4T |
-| BTC Dominance | 52% |
-| Fear & Greed | Extreme Fear (12) |
-
-**El contexto:** Venimos de una corrección fuerte. BTC cayó de $100K+ a $70K en semanas. ¿Oportunidad o trampa?
-
----
-
-## LO BULLISH
-
-**1. ETFs de Bitcoin = Adopción Institucional**
-- $50B+ en AUM (Assets Under Management)
-- BlackRock IBIT es el ETF más exitoso de la historia
-- Instituciones siguen comprando en dips
-
-**2. El Halving Está Haciendo Lo Suyo**
-El halving de abril 2024 redujo rewards de 6.25 a 3.125 BTC.
-- Históricamente: 12-18 meses post-halving = rally
-- Supply shock + demanda institucional
-
-**3. Regulación Se Clarifica**
-- EE.UU: GENIUS Act para stablecoins
-- Europa: MiCAR implementado
-- Menos incertidumbre = más capital institucional
-
----
-
-## LO BEARISH
-
-**1. Macro Incierto**
-- Fed todavía hawkish
-- Tasas altas = menos apetito por riesgo
-- Correlación con tech stocks
-
-**2. Presión de Venta**
-- Miners vendiendo para cubrir costos
-- Mt. Gox distribución pendiente
-- Tomas de ganancias de early holders
-
-**3. Sentiment Destruido**
-- Fear & Greed en "Extreme Fear"
-- Retail se fue del mercado
-- Volúmenes en mínimos de meses
-
----
-
-## SECTORES CON MOMENTUM
-
-| Sector | Tendencia | Por Qué |
-|--------|-----------|---------|
-| **RWAs** | Up | Tokenización de activos reales |
-| **AI x Crypto** | Up | Narrativa fuerte |
-| **DePIN** | Neutral | Construyendo infraestructura |
-| **Memecoins** | Down | Ciclo de atención terminó |
-| **Gaming** | Neutral | AAA games en desarrollo |
-
----
-
-## QUÉ ESTÁN HACIENDO LOS INSTITUCIONALES
-
-**MicroStrategy:** 200,000+ BTC en balance. Saylor sigue comprando.
-
-**BlackRock:** IBIT con $20B+. Larry Fink llamó a BTC "oro digital".
-
-**Fidelity:** Productos crypto para retirement accounts.
-
-**El mensaje:** Las instituciones no están vendiendo. Están acumulando.
-
----
-
-## ESTRATEGIA SUGERIDA
-
-**Si eres holder:**
-- No vendas en pánico
-- DCA (Dollar Cost Average) en las caídas
-- Mantén timeframe largo (2-4 años)
-
-**Si tienes cash:**
-- Acumula BTC/ETH en niveles de miedo
-- No uses apalancamiento
-- Mantén 20-30% en stables para oportunidades
-
-**Allocation sugerida:**
-- 50% BTC (reserva de valor)
-- 30% ETH (plataforma dominante)
-- 15% Altcoins selectas (RWAs, AI)
-- 5% Stables (dry powder)
-
----
-
-## PREDICCIÓN Q2 2026
-
-> "El mercado está en su mejor momento para acumular. El miedo extremo históricamente precede a rallies significativos."
-
-**Targets:**
-- BTC: $100K-120K para fin de 2026
-- ETH: $4K-5K si escala correctamente
-- Altseason: Posible Q3-Q4 2026
-
-DYOR. Esto no es consejo financiero. Pero el miedo es donde se hacen las fortunas. 🦉"""
-        },
-        {
-            "id": "4",
-            "title": "DeFi 2.0: Dónde Encontrar Yield REAL en 2026",
-            "excerpt": "Olvídate de APYs de 10,000%. Aquí están los protocolos con revenue real y yields sostenibles.",
-            "category": "DeFi",
-            "tags": ["Yield", "Protocolos", "Staking", "Inversión"],
-            "read_time": "6 min",
-            "premium": False,
-            "published_at": "2026-01-28T14:00:00Z",
-            "image_url": "https://images.unsplash.com/photo-1639762681485-074b7f938ba0?w=800",
-            "content": """GM. ¿Cansado de yields que desaparecen? Hablemos de DeFi que realmente paga.
-
----
-
-## DEFI 1.0 vs DEFI 2.0
-
-| | DeFi 1.0 (2020-2022) | DeFi 2.0 (2023+) |
-|--|----------------------|------------------|
-| Yields | 1000%+ APY | 5-25% APR |
-| Fuente | Emisiones de tokens | Revenue real |
-| Sostenible | No | Sí |
-| Ejemplo | Farm random coin | GMX, Aave |
-
-**La lección:** Si el yield parece demasiado bueno para ser verdad, probablemente lo es.
-
----
-
-## TOP PROTOCOLOS CON REVENUE REAL
-
-### 1. GMX (Arbitrum/Avalanche)
-- **Qué hace:** Exchange de perpetuos descentralizado
-- **Revenue:** Fees de trading ($200M+ anuales)
-- **Yield:** 15-25% APR en stables (GLP)
-- **Riesgo:** Medio
-
-### 2. Aave / Compound
-- **Qué hace:** Lending & borrowing
-- **Revenue:** Intereses de préstamos
-- **Yield:** 3-8% APR variable
-- **Riesgo:** Bajo (los más probados)
-
-### 3. Lido (Ethereum)
-- **Qué hace:** Liquid staking de ETH
-- **Revenue:** Rewards de staking
-- **Yield:** ~4% APR
-- **Riesgo:** Bajo
-
-### 4. Pendle
-- **Qué hace:** Yield tokenization
-- **Revenue:** Trading de yield tokens
-- **Yield:** Variable (hasta 20%+ en estrategias)
-- **Riesgo:** Medio-Alto
-
----
-
-## COMPARATIVA DE YIELDS (Febrero 2026)
-
-| Protocolo | Asset | APR | Riesgo |
-|-----------|-------|-----|--------|
-| Aave | USDC | 5.2% | Bajo |
-| Compound | USDC | 4.8% | Bajo |
-| Lido | ETH | 4.1% | Bajo |
-| GMX/GLP | Multi | 18% | Medio |
-| Pendle | varias | 8-25% | Medio |
-| Curve | Stables | 3-6% | Bajo |
-
----
-
-## ESTRATEGIAS POR PERFIL DE RIESGO
-
-**Conservador (3-6% APR)**
-```
-50% USDC en Aave
-30% ETH staked en Lido
-20% Stables en Curve
-```
-
-**Moderado (8-15% APR)**
-```
-40% GLP en GMX
-30% USDC en Aave
-30% Estrategias Pendle
-```
-
-**Agresivo (15-25%+ APR)**
-```
-50% GLP + yield farming
-30% Pendle strategies
-20% LP en pools de alta demanda
-```
-
----
-
-## CHECKLIST ANTES DE DEPOSITAR
-
-- ¿Tiene múltiples auditorías?
-- ¿TVL estable o creciente?
-- ¿Revenue real o solo emisiones?
-- ¿Historial sin exploits mayores?
-- ¿Entiendes cómo genera el yield?
-
-**Si no puedes responder SÍ a todas, no deposites.**
-
----
-
-## OPORTUNIDADES ACTUALES
-
-**Subvaloradas:**
-- Pendle: Yield tokenization único
-- Morpho: Optimizador de lending
-- Rocket Pool: ETH staking descentralizado
-
-**Evitar:**
-- Protocolos nuevos sin auditorías
-- Yields >50% APR (red flag)
-- Tokens con 90%+ de supply en team
-
----
-
-## PRO TIP
-
-> "El mejor yield es el que puedes mantener por años sin preocuparte."
-
-No persigas el APY más alto. Persigue el APY más **sostenible**. 🦉"""
-        },
-        {
-            "id": "5",
-            "title": "L2 Wars 2026: Arbitrum vs Optimism vs Base",
-            "excerpt": "Los Layer 2 dominan Ethereum. Aquí está cuál elegir para trading, airdrops y desarrollo.",
-            "category": "Tecnología",
-            "tags": ["Layer 2", "Ethereum", "Arbitrum", "Base", "Optimism"],
-            "read_time": "5 min",
-            "premium": False,
-            "published_at": "2026-01-25T11:00:00Z",
-            "image_url": "https://images.unsplash.com/photo-1666624833516-6d0e320c610d?w=800",
-            "content": """GM. Los L2s son el futuro de Ethereum. Pero, ¿cuál elegir? Te lo desglosamos.
-
----
-
-## ¿POR QUÉ LAYER 2?
-
-**Ethereum Mainnet:**
-- Muy seguro
-- Caro ($5-50 por tx)
-- Lento (~15 TPS)
-
-**Layer 2s:**
-- Heredan seguridad de ETH
-- 10-100x más baratos
-- Mucho más rápidos
-
----
-
-## COMPARATIVA RÁPIDA
-
-| | Arbitrum | Optimism | Base |
-|--|----------|----------|------|
-| **TVL** | $12B+ | $6B+ | $4B+ |
-| **Token** | ARB | OP | No tiene |
-| **Costo TX** | $0.05-0.20 | $0.05-0.15 | $0.01-0.10 |
-| **Apps** | 400+ | 200+ | 150+ |
-| **Respaldo** | Offchain Labs | Optimism Foundation | Coinbase |
-
----
-
-## ARBITRUM: EL REY DEL TVL
-
-**Fortalezas:**
-- Mayor ecosistema DeFi
-- GMX, Camelot, Radiant
-- Más liquidez
-
-**Debilidades:**
-- Token ya lanzado (menos upside)
-- Fees ligeramente más altos
-
-**Para quién:** Traders serios, DeFi degens
-
----
-
-## OPTIMISM: LA VISIÓN SUPERCHAIN
-
-**Fortalezas:**
-- Superchain: Base, Zora usan su tech
-- Revenue sharing con chains aliadas
-- Retroactive Public Goods Funding
-
-**Debilidades:**
-- Menos TVL que Arbitrum
-- Ecosistema más pequeño
-
-**Para quién:** Desarrolladores, holders largo plazo
-
----
-
-## BASE: EL ONRAMP DE COINBASE
-
-**Fortalezas:**
-- Fees más bajos
-- Fácil onboarding desde Coinbase
-- Sin token = posible airdrop
-
-**Debilidades:**
-- Más centralizado
-- Ecosistema más nuevo
-
-**Para quién:** Nuevos usuarios, airdrop hunters
-
----
-
-## OPORTUNIDADES DE AIRDROP
-
-| Chain | Token | Probabilidad | Qué hacer |
-|-------|-------|--------------|-----------|
-| Base | ? | Alta | Usar activamente |
-| zkSync | ZK (próx) | Muy Alta | Bridgear, tradear |
-| Scroll | ? | Alta | Usar dApps |
-| Linea | ? | Media | Actividad básica |
-
----
-
-## RECOMENDACIÓN
-
-**Para trading/DeFi:** Arbitrum
-- Mayor liquidez, más protocolos
-
-**Para desarrollo:** Optimism
-- Mejor soporte, grants disponibles
+    company: Optional[str] = None
+    message: str
+    service_type: str
+    created_at: str
+    status: str = "new"  # new, contacted, completed
 
-**Para airdrops:** Base + zkSync + Scroll
-- Usa las tres para maximizar chances
+class EmailAlertSubscription(BaseModel):
+    email: str
 
-**Para inversión:**
-- ARB: Sólido, ecosistema maduro
-- OP: Superchain narrative
-- Base plays: Tokens del ecosistema Base
+class PaymentSubmission(BaseModel):
+    email: str
+    wallet_address: str
+    chain: str
+    tx_hash: Optional[str] = None
+    amount: float
 
----
+class User(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    email: str
+    wallet_address: str
+    is_premium: bool = False
+    premium_until: Optional[str] = None
+    payment_chain: str
+    created_at: str
 
-## PREDICCIÓN
+class Payment(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    user_email: str
+    amount: float
+    chain: str
+    tx_hash: Optional[str] = None
+    status: str  # pending, verified, rejected
+    created_at: str
 
-> "Los L2s procesarán más transacciones que Ethereum mainnet para fin de 2026."
 
-El ganador no será uno. Será un ecosistema interconectado de L2s especializados. 🦉"""
+# =============================================================================
+# FALLBACK DATA PACK - Mock articles, airdrops and signals read once from JSON
+# =============================================================================
+FALLBACK_PACK_FILE = os.environ.get('FALLBACK_PACK_FILE', str(ROOT_DIR / 'data' / 'fallback_pack.json'))
+FALLBACK_PACK_VERSION = 1
+
+def freeze(value: Any) -> Any:
+    """Read-only copy of decoded JSON - dicts become mapping proxies, lists become tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def _newest_first(articles) -> tuple:
+    return tuple(sorted(articles, key=lambda a: (a["published_at"], a["id"]), reverse=True))
+
+class FallbackPack:
+    """Content served while MongoDB is empty or unreachable.
+    
+    The pack is loaded on first use (and on startup), frozen so handlers can hand out the
+    shared objects without copying, and indexed by id, category and chain.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.version: Optional[int] = None
+        self._loaded = False
+        self._articles: tuple = ()
+        self._articles_newest: tuple = ()
+        self._articles_by_id: Dict[str, Any] = {}
+        self._articles_by_category: Dict[str, tuple] = {}
+        self._airdrops: tuple = ()
+        self._airdrops_by_id: Dict[str, Any] = {}
+        self._airdrops_by_chain: Dict[str, tuple] = {}
+        self._signals: tuple = ()
+
+    def load(self) -> None:
+        self._loaded = True
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != FALLBACK_PACK_VERSION:
+                raise ValueError(f"version {data.get('version')}, expected {FALLBACK_PACK_VERSION}")
+        except Exception as e:
+            logger.error(f"Error loading fallback data pack {self.path}: {e}")
+            return
+
+        self.version = data["version"]
+        # Signals are stamped with the pack's mtime - identical on every worker, so bodies match their ETag
+        loaded_at = datetime.fromtimestamp(os.path.getmtime(self.path), tz=timezone.utc).isoformat()
+        self._articles = freeze(data.get("articles", []))
+        self._airdrops = freeze(data.get("airdrops", []))
+        self._signals = freeze([{**signal, "timestamp": loaded_at} for signal in data.get("signals", [])])
+
+        self._articles_newest = _newest_first(self._articles)
+        self._articles_by_id = {a["id"]: a for a in self._articles}
+        by_category: Dict[str, list] = {}
+        for article in self._articles_newest:
+            by_category.setdefault(filter_key(article.get("category")), []).append(article)
+        self._articles_by_category = {key: tuple(items) for key, items in by_category.items()}
+
+        self._airdrops_by_id = {a["id"]: a for a in self._airdrops}
+        by_chain: Dict[str, list] = {}
+        for airdrop in self._airdrops:
+            by_chain.setdefault(filter_key(airdrop.get("chain")), []).append(airdrop)
+        self._airdrops_by_chain = {key: tuple(items) for key, items in by_chain.items()}
+        logger.info(f"Loaded fallback data pack v{self.version}: {len(self._articles)} articles, "
+                    f"{len(self._airdrops)} airdrops, {len(self._signals)} signals")
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    @property
+    def articles(self) -> tuple:
+        """Newest first"""
+        self._ensure_loaded()
+        return self._articles_newest
+
+    def article(self, article_id: str) -> Optional[Any]:
+        self._ensure_loaded()
+        return self._articles_by_id.get(article_id)
+
+    def articles_in_category(self, category: str) -> tuple:
+        self._ensure_loaded()
+        return self._articles_by_category.get(filter_key(category), ())
+
+    @property
+    def airdrops(self) -> tuple:
+        self._ensure_loaded()
+        return self._airdrops
+
+    def airdrop(self, airdrop_id: str) -> Optional[Any]:
+        self._ensure_loaded()
+        return self._airdrops_by_id.get(airdrop_id)
+
+    def airdrops_on_chain(self, chain: str) -> tuple:
+        self._ensure_loaded()
+        return self._airdrops_by_chain.get(filter_key(chain), ())
+
+    @property
+    def signals(self) -> tuple:
+        self._ensure_loaded()
+        return self._signals
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_loaded()
+        return {
+            "path": self.path,
+            "version": self.version,
+            "articles": len(self._articles),
+            "airdrops": len(self._airdrops),
+            "signals": len(self._signals),
         }
-    ]
 
-def get_mock_airdrops():
+# Initialize global fallback pack - loaded on startup
+fallback_pack = FallbackPack(FALLBACK_PACK_FILE)
+# =============================================================================
+
+# Mock data generators
+def get_mock_crypto_prices():
+    # Updated mock prices - these are displayed when CoinGecko API is rate-limited
+    # Note: CoinGecko free tier has strict rate limits
     return [
         {
-            "id": "1",
-            "project_name": "GRVT",
-            "logo_url": "https://ui-avatars.com/api/?name=GR&background=8b5cf6&color=fff&size=128&bold=true&format=svg",
-            "chain": "zkSync",
-            "description": "DEX híbrido institucional en zkSync - TGE confirmado Q1 2026",
-            "full_description": "GRVT combina auto-custodia con velocidad institucional. 22% del supply para airdrops. TGE confirmado.",
-            "backing": "Paradigm, Variant, Robot Ventures - $7M raised",
-            "reward_note": "12% Season 2 + 10% Season 1. Rewards post-TGE.",
-            "tasks": [
-                {"id": "t1", "description": "Crear cuenta en grvt.io y completar KYC", "completed": False},
-                {"id": "t2", "description": "Depositar USDT para ganar puntos diarios", "completed": False},
-                {"id": "t3", "description": "Tradear perpetuos regularmente", "completed": False}
-            ],
-            "estimated_reward": "$2000-5000",
-            
-            "deadline": "2026-03-31T23:59:59Z",
-            "status": "active",
-            "link": "https://grvt.io/exchange",
-            "premium": True,
-            "timeline": "TGE Q1 2026 confirmado"
-        },
-        {
-            "id": "2",
-            "project_name": "Backpack",
-            "logo_url": "https://ui-avatars.com/api/?name=BP&background=14b8a6&color=fff&size=128&bold=true&format=svg",
-            "chain": "Solana",
-            "description": "Exchange de Solana del equipo Mad Lads - Token confirmado",
-            "full_description": "Backpack del equipo Coral/xNFT. 24% para programa de puntos. Fase Epilogue activa.",
-            "backing": "Jump, Placeholder - $17M Serie A",
-            "reward_note": "Puntos semanales (snapshot jueves, crédito viernes)",
-            "tasks": [
-                {"id": "t1", "description": "Crear cuenta y completar KYC", "completed": False},
-                {"id": "t2", "description": "Depositar y tradear en Spot/Futuros", "completed": False},
-                {"id": "t3", "description": "Completar quests disponibles", "completed": False}
-            ],
-            "estimated_reward": "$1500-4000",
-            
-            "deadline": "2026-03-31T23:59:59Z",
-            "status": "active",
-            "link": "https://backpack.exchange",
-            "premium": True,
-            "timeline": "Fase Epilogue - TGE pronto"
-        },
-        {
-            "id": "3",
-            "project_name": "Paradex",
-            "logo_url": "https://ui-avatars.com/api/?name=PX&background=f97316&color=fff&size=128&bold=true&format=svg",
-            "chain": "Starknet",
-            "description": "DEX de perpetuos en Starknet respaldado por Paradigm",
-            "full_description": "Trading institucional con auto-custodia. Respaldo de Paradigm asegura calidad.",
-            "backing": "Paradigm - VC top tier",
-            "reward_note": "Sistema de puntos activo para usuarios tempranos",
-            "tasks": [
-                {"id": "t1", "description": "Crear cuenta en Paradex", "completed": False},
-                {"id": "t2", "description": "Hacer trades de perpetuos", "completed": False},
-                {"id": "t3", "description": "Mantener actividad semanal", "completed": False}
-            ],
-            "estimated_reward": "$1500-4000",
-            
-            "deadline": "2026-06-30T23:59:59Z",
-            "status": "active",
-            "link": "https://app.paradex.trade",
-            "premium": True,
-            "timeline": "Token esperado 2026"
-        },
-        {
-            "id": "4",
-            "project_name": "Reya Network",
-            "logo_url": "https://ui-avatars.com/api/?name=RE&background=ef4444&color=fff&size=128&bold=true&format=svg",
-            "chain": "Reya L2",
-            "description": "L2 modular para trading - Token confirmado",
-            "full_description": "Red L2 optimizada para trading y DeFi. Financiamiento significativo de VCs.",
-            "backing": "Framework, Coinbase Ventures - $10M+ raised",
-            "reward_note": "Sistema de puntos según volumen y actividad",
-            "tasks": [
-                {"id": "t1", "description": "Bridge fondos a Reya Network", "completed": False},
-                {"id": "t2", "description": "Tradear perpetuos", "completed": False},
-                {"id": "t3", "description": "Usar pools de liquidez", "completed": False}
-            ],
-            "estimated_reward": "$2000-5000",
-            
-            "deadline": "2026-06-30T23:59:59Z",
-            "status": "active",
-            "link": "https://app.reya.xyz",
-            "premium": True,
-            "timeline": "Token Q2-Q3 2026"
-        },
-        {
-            "id": "5",
-            "project_name": "Avantis",
-            "logo_url": "https://ui-avatars.com/api/?name=AV&background=f59e0b&color=fff&size=128&bold=true&format=svg",
-            "chain": "Base",
-            "description": "DEX de perpetuos en Base con vaults de yield",
-            "full_description": "Trading de perps con estrategias de vault únicas en ecosistema Base.",
-            "backing": "VCs del ecosistema Base",
-            "reward_note": "Puntos por trading y uso de vaults",
-            "tasks": [
-                {"id": "t1", "description": "Conectar wallet a Avantis", "completed": False},
-                {"id": "t2", "description": "Tradear perpetuos", "completed": False},
-                {"id": "t3", "description": "Depositar en vaults de yield", "completed": False}
-            ],
-            "estimated_reward": "$1000-3000",
-            
-            "deadline": "2026-06-30T23:59:59Z",
-            "status": "active",
-            "link": "https://www.avantisfi.com",
-            "premium": False,
-            "timeline": "Token esperado 2026"
+            "id": "bitcoin",
+            "symbol": "BTC",
+            "name": "Bitcoin",
+            "current_price": 97250.00,
+            "price_change_24h": 1.85,
+            "market_cap": 1920000000000,
+            "volume_24h": 42500000000
         },
         {
-            "id": "6",
-            "project_name": "Ostium",
-            "logo_url": "https://ui-avatars.com/api/?name=OS&background=84cc16&color=fff&size=128&bold=true&format=svg",
-            "chain": "Arbitrum",
-            "description": "Perpetuos de RWA y crypto - Stocks, forex y más",
-            "full_description": "Trading de perpetuos tradicionales y crypto. Oferta única de activos.",
-            "backing": "VCs enfocados en RWA",
-            "reward_note": "Sistema de puntos por volumen en diferentes activos",
-            "tasks": [
-                {"id": "t1", "description": "Conectar wallet a Ostium", "completed": False},
-                {"id": "t2", "description": "Tradear perpetuos de stocks (SPX, etc)", "completed": False},
-                {"id": "t3", "description": "Tradear pares crypto", "completed": False}
-            ],
-            "estimated_reward": "$1000-3000",
-            
-            "deadline": "2026-06-30T23:59:59Z",
-            "status": "active",
-            "link": "https://app.ostium.com",
-            "premium": False,
-            "timeline": "Token esperado 2026"
+            "id": "ethereum",
+            "symbol": "ETH",
+            "name": "Ethereum",
+            "current_price": 3680.50,
+            "price_change_24h": 2.15,
+            "market_cap": 443000000000,
+            "volume_24h": 18200000000
         },
         {
-            "id": "7",
-            "project_name": "Lighter",
-            "logo_url": "https://ui-avatars.com/api/?name=LI&background=22c55e&color=fff&size=128&bold=true&format=svg",
-            "chain": "Arbitrum",
-            "description": "DEX con historial de airdrop exitoso - Segunda ronda",
-            "full_description": "Ya completó un airdrop exitoso. Preparando segunda distribución.",
-            "backing": "Modelo auto-sostenible por fees",
-            "reward_note": "Órdenes límite dan multiplicador bonus",
-            "tasks": [
-                {"id": "t1", "description": "Conectar wallet a Lighter", "completed": False},
-                {"id": "t2", "description": "Hacer trades con órdenes límite", "completed": False},
-                {"id": "t3", "description": "Mantener volumen constante", "completed": False}
-            ],
-            "estimated_reward": "$500-2000",
-            
-            "deadline": "2026-06-30T23:59:59Z",
-            "status": "active",
-            "link": "https://app.lighter.xyz",
-            "premium": False,
-            "timeline": "Segunda ronda activa"
+            "id": "solana",
+            "symbol": "SOL",
+            "name": "Solana",
+            "current_price": 198.45,
+            "price_change_24h": 3.25,
+            "market_cap": 96000000000,
+            "volume_24h": 4800000000
         },
         {
-            "id": "8",
-            "project_name": "Pacifica",
-            "logo_url": "https://ui-avatars.com/api/?name=PA&background=06b6d4&color=fff&size=128&bold=true&format=svg",
-            "chain": "Solana",
-            "description": "Perpetuos en Solana con vaults y social trading",
-            "full_description": "Trading de perps con estrategias de vault y función de copy trading.",
-            "backing": "Solana Foundation y fondos del ecosistema",
-            "reward_note": "Puntos por trading y uso de features sociales",
-            "tasks": [
-                {"id": "t1", "description": "Conectar wallet de Solana", "completed": False},
-                {"id": "t2", "description": "Tradear SOL-PERP", "completed": False},
-                {"id": "t3", "description": "Probar yield vaults", "completed": False}
-            ],
-            "estimated_reward": "$800-2500",
-            
-            "deadline": "2026-06-30T23:59:59Z",
-            "status": "active",
-            "link": "https://app.pacifica.fi",
-            "premium": False,
-            "timeline": "Token esperado 2026"
+            "id": "usd-coin",
+            "symbol": "USDC",
+            "name": "USD Coin",
+            "current_price": 1.00,
+            "price_change_24h": 0.01,
+            "market_cap": 42000000000,
+            "volume_24h": 8100000000
         }
     ]
 
-
 # Routes
 @api_router.get("/")
 async def root():
     return {"message": "Alpha Crypto API"}
 
-@api_router.get("/crypto/prices", response_model=List[CryptoPrice])
-async def get_crypto_prices():
-    """Get current crypto prices from Kraken API (free, no rate limits)"""
-    cache_key = "crypto_prices"
-    
-    # Check cache first
-    cached_prices = await api_cache.get(cache_key, CACHE_TTL_CRYPTO_PRICES)
-    if cached_prices:
-        logger.debug("Returning cached crypto prices")
-        return cached_prices
-    
-    # Fetch from Kraken API
+def parse_kraken_ticker(result: Dict[str, Any], assets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Map a Kraken Ticker `result` to CryptoPrice dicts, in the order of assets"""
+    # Kraken answers with its own pair keys (XBTUSD -> XXBTZUSD), accept either
+    pair_map = {}
+    for asset in assets:
+        pair_map[asset["rest_pair"]] = asset
+        pair_map[asset.get("rest_key") or asset["rest_pair"]] = asset
+
+    prices_by_id = {}
+    for pair, info in result.items():
+        if pair in pair_map:
+            meta = pair_map[pair]
+            current_price = float(info["c"][0])  # Last trade price
+            open_price = float(info["o"])  # Today's opening price
+            change_24h = ((current_price - open_price) / open_price * 100) if open_price > 0 else 0
+            volume = float(info["v"][1])  # 24h volume
+
+            prices_by_id[meta["id"]] = {
+                "id": meta["id"],
+                "symbol": meta["symbol"],
+                "name": meta["name"],
+                "current_price": round(current_price, 2),
+                "price_change_24h": round(change_24h, 2),
+                "market_cap": 0,  # Kraken doesn't provide market cap
+                "volume_24h": round(volume * current_price, 0)
+            }
+    return [prices_by_id[asset["id"]] for asset in assets if asset["id"] in prices_by_id]
+
+async def _fetch_kraken_ticker_chunk(assets: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    url = "https://api.kraken.com/0/public/Ticker"
+    params = {"pair": ",".join(asset["rest_pair"] for asset in assets)}
     try:
-        async with aiohttp.ClientSession() as session:
-            url = "https://api.kraken.com/0/public/Ticker"
-            params = {"pair": "XBTUSD,ETHUSD,SOLUSD,USDCUSD"}
-            headers = {"User-Agent": "AlphaCrypto/1.0"}
-            
-            async with session.get(url, params=params, headers=headers, timeout=15) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    result = data.get("result", {})
-                    
-                    # Map Kraken pairs to our format
-                    pair_map = {
-                        "XXBTZUSD": {"id": "bitcoin", "symbol": "BTC", "name": "Bitcoin"},
-                        "XETHZUSD": {"id": "ethereum", "symbol": "ETH", "name": "Ethereum"},
-                        "SOLUSD": {"id": "solana", "symbol": "SOL", "name": "Solana"},
-                        "USDCUSD": {"id": "usd-coin", "symbol": "USDC", "name": "USD Coin"}
-                    }
-                    
-                    prices = []
-                    for pair, info in result.items():
-                        if pair in pair_map:
-                            meta = pair_map[pair]
-                            current_price = float(info["c"][0])  # Last trade price
-                            open_price = float(info["o"])  # Today's opening price
-                            change_24h = ((current_price - open_price) / open_price * 100) if open_price > 0 else 0
-                            volume = float(info["v"][1])  # 24h volume
-                            
-                            prices.append({
-                                "id": meta["id"],
-                                "symbol": meta["symbol"],
-                                "name": meta["name"],
-                                "current_price": round(current_price, 2),
-                                "price_change_24h": round(change_24h, 2),
-                                "market_cap": 0,  # Kraken doesn't provide market cap
-                                "volume_24h": round(volume * current_price, 0)
-                            })
-                    
-                    if prices:
-                        # Sort: BTC, ETH, SOL, USDC
-                        order = {"bitcoin": 0, "ethereum": 1, "solana": 2, "usd-coin": 3}
-                        prices.sort(key=lambda x: order.get(x["id"], 99))
-                        logger.info(f"Fetched {len(prices)} prices from Kraken - caching for {CACHE_TTL_CRYPTO_PRICES}s")
-                        await api_cache.set(cache_key, prices)
-                        return prices
-                else:
-                    logger.warning(f"Kraken returned status {response.status}")
+        async with upstream_client.get(url, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                if data.get("error"):
+                    # One unknown pair fails the whole call - fix it in the symbol registry
+                    logger.warning(f"Kraken Ticker error for {params['pair']}: {data['error']}")
+                return parse_kraken_ticker(data.get("result", {}), assets)
+            logger.warning(f"Kraken returned status {response.status}")
     except Exception as e:
         logger.error(f"Error fetching Kraken prices: {e}")
+    return None
+
+async def fetch_kraken_tickers(assets: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """Fetch many pairs with one Ticker call per KRAKEN_TICKER_CHUNK_SIZE pairs (chunks run in parallel)"""
+    if not assets:
+        return []
+    chunks = [assets[i:i + KRAKEN_TICKER_CHUNK_SIZE] for i in range(0, len(assets), KRAKEN_TICKER_CHUNK_SIZE)]
+    results = await asyncio.gather(*(_fetch_kraken_ticker_chunk(chunk) for chunk in chunks))
+    if all(r is None for r in results):
+        return None
+    return [price for chunk_prices in results if chunk_prices for price in chunk_prices]
+
+def store_symbol_prices(prices: List[Dict[str, Any]]) -> None:
+    """Cache each price under its own key so ?ids= requests can be served per symbol"""
+    for price in prices:
+        api_cache.set(f"price:{price['id']}", price, CACHE_TTL_CRYPTO_PRICES, CACHE_MAX_STALE_CRYPTO_PRICES)
+
+async def fetch_kraken_prices() -> Optional[List[Dict[str, Any]]]:
+    """Fetch the default ticker set (BTC/ETH/SOL/USDC) from Kraken - returns None if the call fails"""
+    # The WebSocket table is fresher than a REST round trip whenever it is healthy
+    if kraken_ticker_stream.is_healthy():
+        prices = kraken_ticker_stream.snapshot()
+    else:
+        prices = await fetch_kraken_tickers(symbol_registry.ticker_assets())
+        if prices:
+            logger.info(f"Fetched {len(prices)} prices from Kraken - caching for {CACHE_TTL_CRYPTO_PRICES}s")
+    if not prices:
+        return None
+    store_symbol_prices(prices)
+    return prices
+
+async def fetch_symbol_prices(assets: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    prices = await fetch_kraken_tickers(assets)
+    if prices:
+        store_symbol_prices(prices)
+    return prices
+
+async def get_prices_for_ids(response: Response, ids: str) -> List[Dict[str, Any]]:
+    """Per-symbol cache reads - all misses go upstream together in one batched fetch"""
+    requested = [asset_id.strip().lower() for asset_id in ids.split(",") if asset_id.strip()]
+    if len(requested) > MAX_PRICE_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PRICE_IDS} ids per request")
+    assets = symbol_registry.resolve(requested)
+
+    prices: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for asset in assets:
+        cached = api_cache.get(f"price:{asset['id']}")
+        if cached is not None:
+            prices[asset["id"]] = cached
+        else:
+            missing.append(asset)
+
+    freshness = "fresh"
+    if missing:
+        # Identical concurrent batches share one upstream call
+        flight_key = "prices:" + ",".join(sorted(asset["id"] for asset in missing))
+        fetched = await api_cache.coalesce(flight_key, lambda: fetch_symbol_prices(missing))
+        for price in fetched or []:
+            prices[price["id"]] = price
+        # Upstream failed - serve last known values while they are within their staleness bound
+        for asset in missing:
+            if asset["id"] not in prices:
+                stale = api_cache.get_stale(f"price:{asset['id']}")
+                if stale is not None:
+                    prices[asset["id"]] = stale
+                    freshness = "stale"
+        if not prices:
+            mock = {p["id"]: p for p in get_mock_crypto_prices()}
+            prices = {asset["id"]: mock[asset["id"]] for asset in assets if asset["id"] in mock}
+            freshness = "fallback"
+
+    mark_freshness(response, freshness)
+    return [prices[asset["id"]] for asset in assets if asset["id"] in prices]
+
+@api_router.get("/crypto/prices", response_model=List[CryptoPrice])
+async def get_crypto_prices(response: Response, ids: Optional[str] = None):
+    """Get current crypto prices from Kraken API (free, no rate limits)
     
+    Without ids returns the default ticker. With ids=bitcoin,ethereum,... returns only those
+    assets from the symbol registry, in the requested order.
+    """
+    if ids:
+        return await get_prices_for_ids(response, ids)
+
+    lookup = await api_cache.get_or_fetch("crypto_prices", CACHE_TTL_CRYPTO_PRICES, fetch_kraken_prices,
+                                          max_stale_seconds=CACHE_MAX_STALE_CRYPTO_PRICES)
+    if lookup.value:
+        mark_freshness(response, lookup.freshness, lookup.age_seconds)
+        return lookup.value
+
     # Fallback to mock data if API fails
     logger.info("Using mock crypto prices as fallback")
+    mark_freshness(response, "fallback")
     return get_mock_crypto_prices()
 
-@api_router.get("/crypto/fear-greed")
-async def get_fear_greed_index():
-    """Get Fear & Greed Index from Alternative.me API with caching"""
-    cache_key = "fear_greed_index"
-    
-    # Check cache first
-    cached_data = await api_cache.get(cache_key, CACHE_TTL_FEAR_GREED)
-    if cached_data:
-        logger.debug("Returning cached Fear & Greed index")
-        return cached_data
-    
+async def fetch_fear_greed_index() -> Optional[Dict[str, Any]]:
+    """Fetch the latest Fear & Greed reading from Alternative.me - returns None if the call fails"""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://api.alternative.me/fng/", timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    index_data = data['data'][0]
-                    result = {
-                        "value": int(index_data['value']),
-                        "classification": index_data['value_classification'],
-                        "timestamp": index_data['timestamp']
-                    }
-                    await api_cache.set(cache_key, result)
-                    logger.info(f"Fetched Fear & Greed index: {result['value']} - caching for {CACHE_TTL_FEAR_GREED}s")
-                    return result
+        async with upstream_client.get("https://api.alternative.me/fng/") as response:
+            if response.status == 200:
+                data = await response.json()
+                index_data = data['data'][0]
+                result = {
+                    "value": int(index_data['value']),
+                    "classification": index_data['value_classification'],
+                    "timestamp": index_data['timestamp']
+                }
+                logger.info(f"Fetched Fear & Greed index: {result['value']} - caching for {CACHE_TTL_FEAR_GREED}s")
+                return result
     except Exception as e:
         logger.error(f"Error fetching Fear & Greed index: {e}")
-    
+    return None
+
+@api_router.get("/crypto/fear-greed")
+async def get_fear_greed_index(response: Response):
+    """Get Fear & Greed Index from Alternative.me API with caching"""
+    lookup = await api_cache.get_or_fetch("fear_greed_index", CACHE_TTL_FEAR_GREED, fetch_fear_greed_index,
+                                          max_stale_seconds=CACHE_MAX_STALE_FEAR_GREED)
+    if lookup.value:
+        mark_freshness(response, lookup.freshness, lookup.age_seconds)
+        return lookup.value
+
     # Fallback to mock data
+    mark_freshness(response, "fallback")
     return {
         "value": 12,
         "classification": "Extreme Fear",
@@ -1141,14 +3161,26 @@ async def get_fear_greed_index():
     }
 
 @api_router.get("/crypto/market-stats")
-async def get_market_stats():
-    """Get market statistics"""
+async def get_market_stats(response: Response):
+    """Get market statistics - a precomputed snapshot, rebuilt whenever prices or global data refresh"""
+    if not market_poller.is_running() or market_stats.snapshot() is None:
+        # Nothing refreshing in the background (or no refresh yet) - the cache TTLs drive refreshes,
+        # and every new value reaches the aggregator through the poller's listeners
+        await market_poller.lookup("kraken_prices")
+        await market_poller.lookup("coingecko_global")
+    snapshot = market_stats.snapshot()
+    if snapshot:
+        freshness, age = market_stats.freshness()
+        mark_freshness(response, freshness, age)
+        return snapshot
+
+    mark_freshness(response, "fallback")
     prices = get_mock_crypto_prices()
     btc = next((p for p in prices if p['id'] == 'bitcoin'), None)
-    
+
     total_market_cap = sum(p['market_cap'] for p in prices)
     btc_dominance = (btc['market_cap'] / total_market_cap * 100) if btc else 0
-    
+
     return {
         "total_market_cap": total_market_cap,
         "btc_dominance": round(btc_dominance, 2),
@@ -1156,89 +3188,100 @@ async def get_market_stats():
         "active_cryptos": len(prices)
     }
 
+async def fetch_coingecko_chart(coin_id: str, days: int, points: int = CHART_MAX_POINTS,
+                                interval: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Chart straight from CoinGecko - only used when the price history store is unavailable"""
+    prices = await fetch_coingecko_market_chart(coin_id, days)
+    if not prices:
+        return None
+    series = np.array(prices, dtype=np.float64)
+    chart_data = resample_chart_series(series[:, 0], series[:, 1], points, interval)
+    return {"coin_id": coin_id, "days": days, "interval": interval, "data": chart_data}
+
+async def build_crypto_chart(coin_id: str, days: int, points: int, interval: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not price_history.tracks(coin_id):
+        # Only registry coins get persistent history - anything else is fetched (and cached) as is
+        return await fetch_coingecko_chart(coin_id, days, points, interval)
+    try:
+        return await price_history.get_chart(coin_id, days, points, interval)
+    except Exception as e:
+        logger.error(f"Price history store unavailable, fetching chart directly: {e}")
+    return await fetch_coingecko_chart(coin_id, days, points, interval)
+
 @api_router.get("/crypto/chart/{coin_id}")
-async def get_crypto_chart(coin_id: str, days: int = 30):
-    """Get historical price data for charts from CoinGecko (with 10min cache)"""
-    cache_key = f"chart_{coin_id}_{days}"
-    
-    # Check cache first - use longer TTL for CoinGecko
-    cached = await api_cache.get(cache_key, ttl_seconds=CACHE_TTL_COINGECKO)
-    if cached:
-        logger.info(f"Returning cached chart data for {coin_id}")
-        return cached
+async def get_crypto_chart(request: Request, response: Response, coin_id: str, days: int = 30,
+                           points: int = CHART_MAX_POINTS, interval: Optional[str] = None, format: Optional[str] = None):
+    """Get historical price data for charts - served from the local price history, synced from CoinGecko
     
+    points= caps the series (LTTB downsampling), interval= (5m, 15m, 1h, 4h, 1d, 1w) returns OHLC candles.
+    format= (or Accept) selects columnar JSON, msgpack or arrow instead of row dicts.
+    """
+    if days < 1 or days > CHART_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be between 1 and {CHART_MAX_DAYS}")
+    if points < 3 or points > CHART_POINTS_LIMIT:
+        raise HTTPException(status_code=400, detail=f"points must be between 3 and {CHART_POINTS_LIMIT}")
+    if interval is not None and interval not in CHART_INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of {', '.join(CHART_INTERVALS)}")
+    fmt = negotiate_chart_format(format, request.headers.get("accept"))
+    coin_id = coin_id.lower()
+    cache_key = f"chart_{coin_id}_{days}_{points}_{interval or 'lttb'}"
+
+    # Rendered windows are small (<= points rows) - the full series lives in MongoDB
+    lookup = await api_cache.get_or_fetch(cache_key, CACHE_TTL_COINGECKO,
+                                          lambda: build_crypto_chart(coin_id, days, points, interval),
+                                          max_stale_seconds=CACHE_MAX_STALE_COINGECKO)
+    if lookup.value:
+        payload, freshness, age = lookup.value, lookup.freshness, lookup.age_seconds
+    else:
+        # Return mock data as fallback - only when we have never stored a point for this coin
+        payload, freshness, age = generate_mock_chart_data(coin_id, days), "fallback", 0
+
+    if fmt == "json":
+        response.headers["Vary"] = "Accept"
+        mark_freshness(response, freshness, age)
+        return payload
+    # Returned Responses skip the injected one, so headers go on the encoded response
+    encoded = encode_chart(payload, fmt)
+    encoded.headers["Vary"] = "Accept"
+    mark_freshness(encoded, freshness, age)
+    return encoded
+
+async def fetch_coingecko_global() -> Optional[Dict[str, Any]]:
+    """Fetch global market data from CoinGecko - returns None if the call fails"""
     try:
-        async with aiohttp.ClientSession() as session:
-            url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
-            params = {"vs_currency": "usd", "days": days}
-            headers = {"User-Agent": "AlphaCrypto/1.0"}
-            
-            async with session.get(url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    prices = data.get("prices", [])
-                    
-                    # Format data for charts
-                    chart_data = []
-                    for timestamp, price in prices:
-                        chart_data.append({
-                            "timestamp": timestamp,
-                            "price": round(price, 2),
-                            "date": datetime.fromtimestamp(timestamp/1000, tz=timezone.utc).strftime("%Y-%m-%d")
-                        })
-                    
-                    result = {"coin_id": coin_id, "days": days, "data": chart_data}
-                    await api_cache.set(cache_key, result)
-                    logger.info(f"Fetched chart for {coin_id} from CoinGecko - caching for {CACHE_TTL_COINGECKO}s")
-                    return result
-                elif response.status == 429:
-                    logger.warning(f"CoinGecko chart API rate limited - using mock data")
-                    return generate_mock_chart_data(coin_id, days)
-                else:
-                    logger.warning(f"CoinGecko chart API returned {response.status}")
-                    return generate_mock_chart_data(coin_id, days)
+        url = "https://api.coingecko.com/api/v3/global"
+
+        async with upstream_client.get(url) as response:
+            if response.status == 200:
+                data = await response.json()
+                global_data = data.get("data", {})
+
+                return {
+                    "total_market_cap_usd": global_data.get("total_market_cap", {}).get("usd", 0),
+                    "total_volume_24h_usd": global_data.get("total_volume", {}).get("usd", 0),
+                    "btc_dominance": round(global_data.get("market_cap_percentage", {}).get("btc", 0), 2),
+                    "eth_dominance": round(global_data.get("market_cap_percentage", {}).get("eth", 0), 2),
+                    "active_cryptocurrencies": global_data.get("active_cryptocurrencies", 0),
+                    "market_cap_change_24h": round(global_data.get("market_cap_change_percentage_24h_usd", 0), 2)
+                }
+            else:
+                logger.warning(f"CoinGecko global API returned {response.status}")
     except Exception as e:
-        logger.error(f"Error fetching chart data: {e}")
-        # Return mock data as fallback
-        return generate_mock_chart_data(coin_id, days)
+        logger.error(f"Error fetching global data: {e}")
+    return None
 
 @api_router.get("/crypto/global")
-async def get_global_market_data():
+async def get_global_market_data(response: Response):
     """Get global market data from CoinGecko (with 10min cache)"""
-    cache_key = "global_market"
-    
     # Use longer cache for CoinGecko endpoints
-    cached = await api_cache.get(cache_key, ttl_seconds=CACHE_TTL_COINGECKO)
-    if cached:
-        return cached
-    
-    try:
-        async with aiohttp.ClientSession() as session:
-            url = "https://api.coingecko.com/api/v3/global"
-            headers = {"User-Agent": "AlphaCrypto/1.0"}
-            
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    global_data = data.get("data", {})
-                    
-                    result = {
-                        "total_market_cap_usd": global_data.get("total_market_cap", {}).get("usd", 0),
-                        "total_volume_24h_usd": global_data.get("total_volume", {}).get("usd", 0),
-                        "btc_dominance": round(global_data.get("market_cap_percentage", {}).get("btc", 0), 2),
-                        "eth_dominance": round(global_data.get("market_cap_percentage", {}).get("eth", 0), 2),
-                        "active_cryptocurrencies": global_data.get("active_cryptocurrencies", 0),
-                        "market_cap_change_24h": round(global_data.get("market_cap_change_percentage_24h_usd", 0), 2)
-                    }
-                    
-                    await api_cache.set(cache_key, result)
-                    return result
-                else:
-                    logger.warning(f"CoinGecko global API returned {response.status}")
-    except Exception as e:
-        logger.error(f"Error fetching global data: {e}")
-    
+    lookup = await api_cache.get_or_fetch("global_market", CACHE_TTL_COINGECKO, fetch_coingecko_global,
+                                          max_stale_seconds=CACHE_MAX_STALE_COINGECKO)
+    if lookup.value:
+        mark_freshness(response, lookup.freshness, lookup.age_seconds)
+        return lookup.value
+
     # Fallback
+    mark_freshness(response, "fallback")
     return {
         "total_market_cap_usd": 2500000000000,
         "total_volume_24h_usd": 95000000000,
@@ -1248,55 +3291,109 @@ async def get_global_market_data():
         "market_cap_change_24h": 1.5
     }
 
-@api_router.get("/crypto/stablecoins")
-async def get_stablecoin_data():
-    """Get stablecoin market data from DefiLlama - FREE API"""
-    cache_key = "stablecoins_data"
-    
-    cached = await api_cache.get(cache_key, ttl_seconds=300)
-    if cached:
-        return cached
+STABLECOIN_TOP_N = 10
+STABLECOIN_TOP_CHAINS = 10
+STABLECOIN_DEPEG_BPS = 50              # a USD stablecoin more than 0.5% off $1 is listed as depegged
+STABLECOIN_DEPEG_MIN_MCAP = 10_000_000  # ...unless it is too small to matter
+
+async def aggregate_stablecoins(source, top_n: int = STABLECOIN_TOP_N) -> Dict[str, Any]:
+    """Single streaming pass over a DefiLlama /stablecoins payload.
     
+    source is anything with an async read(n) (aiohttp's response.content). Assets are parsed
+    one at a time with ijson: running totals, a heapq top-N by market cap, per-chain supply and
+    a market-cap weighted peg deviation for USD-pegged coins - the asset list is never built.
+    """
+    total_mcap = 0.0
+    top: List[tuple] = []  # min-heap of (market_cap, seq, name, symbol)
+    chains: Dict[str, float] = {}
+    deviation_weighted = 0.0
+    deviation_mcap = 0.0
+    max_deviation_bps = 0.0
+    depegged = []
+
+    seq = 0
+    async for asset in ijson.items(source, "peggedAssets.item", use_float=True):
+        mcap = (asset.get("circulating") or {}).get("peggedUSD") or 0
+        total_mcap += mcap
+        if mcap > 0:
+            seq += 1
+            entry = (mcap, seq, asset.get("name", "Unknown"), asset.get("symbol", ""))
+            if len(top) < top_n:
+                heapq.heappush(top, entry)
+            elif mcap > top[0][0]:
+                heapq.heapreplace(top, entry)
+
+        for chain, circulating in (asset.get("chainCirculating") or {}).items():
+            chain_mcap = ((circulating or {}).get("current") or {}).get("peggedUSD") or 0
+            if chain_mcap:
+                chains[chain] = chains.get(chain, 0) + chain_mcap
+
+        price = asset.get("price")
+        if asset.get("pegType") == "peggedUSD" and price and mcap > 0:
+            deviation_bps = abs(price - 1) * 10_000
+            deviation_weighted += deviation_bps * mcap
+            deviation_mcap += mcap
+            max_deviation_bps = max(max_deviation_bps, deviation_bps)
+            if deviation_bps >= STABLECOIN_DEPEG_BPS and mcap >= STABLECOIN_DEPEG_MIN_MCAP:
+                depegged.append({
+                    "name": asset.get("name", "Unknown"),
+                    "symbol": asset.get("symbol", ""),
+                    "price": round(price, 4),
+                    "deviation_bps": round(deviation_bps, 1),
+                    "market_cap": round(mcap, 0)
+                })
+
+    def share(value: float) -> float:
+        return round((value / total_mcap * 100) if total_mcap > 0 else 0, 2)
+
+    top_chains = heapq.nlargest(STABLECOIN_TOP_CHAINS, chains.items(), key=lambda item: item[1])
+    return {
+        "total_market_cap": round(total_mcap, 0),
+        "top_stablecoins": [
+            {"name": name, "symbol": symbol, "market_cap": round(mcap, 0), "percentage": share(mcap)}
+            for mcap, _, name, symbol in sorted(top, reverse=True)
+        ],
+        "chains": [
+            {"name": chain, "market_cap": round(mcap, 0), "percentage": share(mcap)}
+            for chain, mcap in top_chains
+        ],
+        "peg_deviation": {
+            "index_bps": round(deviation_weighted / deviation_mcap, 2) if deviation_mcap else 0,
+            "max_bps": round(max_deviation_bps, 1),
+            "depegged": sorted(depegged, key=lambda d: d["market_cap"], reverse=True)
+        }
+    }
+
+async def fetch_stablecoin_data() -> Optional[Dict[str, Any]]:
+    """Fetch stablecoin supply from DefiLlama - returns None if the call fails"""
     try:
-        async with aiohttp.ClientSession() as session:
-            url = "https://stablecoins.llama.fi/stablecoins?includePrices=true"
-            headers = {"User-Agent": "AlphaCrypto/1.0"}
-            
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    stablecoins = data.get("peggedAssets", [])
-                    
-                    # Calculate totals and get top stablecoins
-                    total_mcap = sum(s.get("circulating", {}).get("peggedUSD", 0) or 0 for s in stablecoins)
-                    
-                    # Get top stablecoins by market cap
-                    top_stables = []
-                    for s in sorted(stablecoins, key=lambda x: x.get("circulating", {}).get("peggedUSD", 0) or 0, reverse=True)[:10]:
-                        mcap = s.get("circulating", {}).get("peggedUSD", 0) or 0
-                        if mcap > 0:
-                            top_stables.append({
-                                "name": s.get("name", "Unknown"),
-                                "symbol": s.get("symbol", ""),
-                                "market_cap": round(mcap, 0),
-                                "percentage": round((mcap / total_mcap * 100) if total_mcap > 0 else 0, 2)
-                            })
-                    
-                    result = {
-                        "total_market_cap": round(total_mcap, 0),
-                        "top_stablecoins": top_stables,
-                        "updated_at": datetime.now(timezone.utc).isoformat(),
-                        "source": "DefiLlama"
-                    }
-                    
-                    await api_cache.set(cache_key, result)
-                    return result
-                else:
-                    logger.warning(f"DefiLlama stablecoins API returned {response.status}")
+        url = "https://stablecoins.llama.fi/stablecoins?includePrices=true"
+
+        async with upstream_client.get(url) as response:
+            if response.status == 200:
+                result = await aggregate_stablecoins(response.content)
+                return {
+                    **result,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                    "source": "DefiLlama"
+                }
+            else:
+                logger.warning(f"DefiLlama stablecoins API returned {response.status}")
     except Exception as e:
         logger.error(f"Error fetching stablecoin data: {e}")
-    
+    return None
+
+@api_router.get("/crypto/stablecoins")
+async def get_stablecoin_data(response: Response):
+    """Get stablecoin market data from DefiLlama - FREE API"""
+    lookup = await api_cache.get_or_fetch("stablecoins_data", CACHE_TTL_DEFILLAMA, fetch_stablecoin_data,
+                                          max_stale_seconds=CACHE_MAX_STALE_DEFILLAMA)
+    if lookup.value:
+        mark_freshness(response, lookup.freshness, lookup.age_seconds)
+        return lookup.value
+
     # Fallback with timestamp
+    mark_freshness(response, "fallback")
     return {
         "total_market_cap": 205000000000,
         "top_stablecoins": [
@@ -1306,53 +3403,31 @@ async def get_stablecoin_data():
             {"name": "USDe", "symbol": "USDe", "market_cap": 6000000000, "percentage": 2.9},
             {"name": "FDUSD", "symbol": "FDUSD", "market_cap": 2500000000, "percentage": 1.2}
         ],
+        "chains": [],
+        "peg_deviation": {"index_bps": 0, "max_bps": 0, "depegged": []},
         "updated_at": datetime.now(timezone.utc).isoformat(),
         "source": "Cache (API unavailable)"
     }
 
-@api_router.get("/crypto/defi-tvl")
-async def get_defi_tvl():
-    """Get DeFi TVL from DefiLlama - FREE API"""
-    cache_key = "defi_tvl"
-    
-    cached = await api_cache.get(cache_key, ttl_seconds=300)
-    if cached:
-        return cached
-    
+async def fetch_defi_tvl() -> Optional[Dict[str, Any]]:
+    """Refresh the DeFi TVL tracker from DefiLlama - returns None if the refresh fails"""
     try:
-        async with aiohttp.ClientSession() as session:
-            # Get total TVL
-            url = "https://api.llama.fi/v2/historicalChainTvl"
-            headers = {"User-Agent": "AlphaCrypto/1.0"}
-            
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Get latest TVL
-                    latest = data[-1] if data else {}
-                    total_tvl = latest.get("tvl", 0)
-                    
-                    # Get 24h change
-                    prev_day = data[-2] if len(data) > 1 else {}
-                    prev_tvl = prev_day.get("tvl", total_tvl)
-                    change_24h = ((total_tvl - prev_tvl) / prev_tvl * 100) if prev_tvl > 0 else 0
-                    
-                    result = {
-                        "total_tvl": round(total_tvl, 0),
-                        "change_24h": round(change_24h, 2),
-                        "updated_at": datetime.now(timezone.utc).isoformat(),
-                        "source": "DefiLlama"
-                    }
-                    
-                    await api_cache.set(cache_key, result)
-                    return result
-                else:
-                    logger.warning(f"DefiLlama TVL API returned {response.status}")
+        return await defi_tvl_tracker.refresh()
     except Exception as e:
         logger.error(f"Error fetching DeFi TVL: {e}")
-    
+    return None
+
+@api_router.get("/crypto/defi-tvl")
+async def get_defi_tvl(response: Response):
+    """Get DeFi TVL from DefiLlama - FREE API"""
+    lookup = await api_cache.get_or_fetch("defi_tvl", CACHE_TTL_DEFILLAMA, fetch_defi_tvl,
+                                          max_stale_seconds=CACHE_MAX_STALE_DEFILLAMA)
+    if lookup.value:
+        mark_freshness(response, lookup.freshness, lookup.age_seconds)
+        return lookup.value
+
     # Fallback
+    mark_freshness(response, "fallback")
     return {
         "total_tvl": 95000000000,
         "change_24h": -1.5,
@@ -1360,6 +3435,21 @@ async def get_defi_tvl():
         "source": "Cache (API unavailable)"
     }
 
+# Background refresh schedule for the market endpoints above - with the poller running,
+# the handlers are plain cache reads and only fall back to upstream on a cold cache
+market_poller.register("kraken_prices", "crypto_prices", fetch_kraken_prices,
+                       POLL_INTERVAL_CRYPTO_PRICES, CACHE_TTL_CRYPTO_PRICES, CACHE_MAX_STALE_CRYPTO_PRICES)
+market_poller.register("fear_greed", "fear_greed_index", fetch_fear_greed_index,
+                       POLL_INTERVAL_FEAR_GREED, CACHE_TTL_FEAR_GREED, CACHE_MAX_STALE_FEAR_GREED)
+market_poller.register("coingecko_global", "global_market", fetch_coingecko_global,
+                       POLL_INTERVAL_COINGECKO, CACHE_TTL_COINGECKO, CACHE_MAX_STALE_COINGECKO)
+market_poller.register("defillama_stablecoins", "stablecoins_data", fetch_stablecoin_data,
+                       POLL_INTERVAL_DEFILLAMA, CACHE_TTL_DEFILLAMA, CACHE_MAX_STALE_DEFILLAMA)
+market_poller.register("defillama_tvl", "defi_tvl", fetch_defi_tvl,
+                       POLL_INTERVAL_DEFILLAMA, CACHE_TTL_DEFILLAMA, CACHE_MAX_STALE_DEFILLAMA)
+market_poller.register("kraken_movers", "market_movers", fetch_market_movers,
+                       POLL_INTERVAL_MOVERS, CACHE_TTL_MOVERS, CACHE_MAX_STALE_MOVERS)
+
 def generate_mock_chart_data(coin_id: str, days: int):
     """Generate mock chart data as fallback"""
     base_prices = {"bitcoin": 95000, "ethereum": 3200, "solana": 180}
@@ -1381,39 +3471,325 @@ def generate_mock_chart_data(coin_id: str, days: int):
     
     return {"coin_id": coin_id, "days": days, "data": data}
 
-@api_router.get("/articles", response_model=List[Article])
-async def get_articles_route(category: Optional[str] = None, search: Optional[str] = None):
-    """Get articles from MongoDB, falls back to mock data if empty"""
+@api_router.get("/admin/price-history")
+async def get_price_history_stats():
+    """Stored points and covered range per coin"""
+    return await price_history.stats()
+
+@api_router.post("/admin/price-history/{coin_id}/sync")
+async def sync_price_history(coin_id: str):
+    """Pull the latest points for a coin now"""
+    if not price_history.tracks(coin_id.lower()):
+        raise HTTPException(status_code=404, detail="Coin is not in the symbol registry")
+    inserted = await price_history.sync(coin_id.lower(), force=True)
+    return {"success": True, "inserted": inserted}
+
+@api_router.get("/admin/defi-tvl-history")
+async def get_defi_tvl_history_stats():
+    """Days covered by the local DeFi TVL history"""
+    return defi_tvl_tracker.stats()
+
+@api_router.get("/admin/upstream-stats")
+async def get_upstream_stats():
+    """Connection pool metrics for the shared upstream HTTP client"""
+    return upstream_client.stats()
+
+@api_router.get("/admin/upstream-guards")
+async def get_upstream_guards():
+    """Rate limiter and circuit breaker state per upstream provider"""
+    return upstream_guards.status()
+
+@api_router.post("/admin/upstream-guards/{provider}/reset")
+async def reset_upstream_guard(provider: str):
+    """Close a tripped breaker and refill its bucket"""
+    guard = upstream_guards.get(provider)
+    if not guard:
+        raise HTTPException(status_code=404, detail="Unknown provider")
+    guard.reset()
+    return guard.status()
+
+@api_router.get("/stream/market")
+async def stream_market(request: Request):
+    """Server-Sent Events stream of prices, Fear & Greed and market overview updates"""
+    if not market_poller.is_running():
+        # Nothing would publish after the snapshot - a failed EventSource makes the frontend poll instead
+        raise HTTPException(status_code=503, detail="Market stream unavailable, poll the market endpoints")
+    queue = market_broadcaster.subscribe()
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Too many stream subscribers, retry later")
+
+    async def event_source():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    frame = ": keep-alive\n\n"
+                yield frame
+        finally:
+            market_broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.get("/admin/stream-stats")
+async def get_stream_stats():
+    """Subscriber count and fan-out counters for the market stream"""
+    return market_broadcaster.stats()
+
+@api_router.get("/admin/symbols")
+async def get_symbol_registry():
+    """All assets known to the symbol registry"""
+    return symbol_registry.all()
+
+@api_router.post("/admin/symbols/reload")
+async def reload_symbol_registry():
+    """Reload the symbol registry after editing the symbols collection"""
+    await symbol_registry.load()
+    await kraken_ticker_stream.set_assets(symbol_registry.ticker_assets())
+    return {"success": True, "symbols": len(symbol_registry.all())}
+
+@api_router.get("/admin/kraken-stream")
+async def get_kraken_stream_status():
+    """Connection state and tick ages of the Kraken WebSocket ingestion"""
+    return kraken_ticker_stream.stats()
+
+@api_router.get("/admin/poller-status")
+async def get_poller_status():
+    """Health and last-success status of every background market-data source"""
+    return market_poller.status()
+
+@api_router.get("/admin/content-versions")
+async def get_content_versions():
+    """Current version of every collection behind the conditional read endpoints"""
+    return content_versions.stats()
+
+@api_router.post("/admin/content-versions/{name}/bump")
+async def bump_content_version(name: str):
+    """Invalidate clients' copies after writing to a collection outside the admin API"""
+    if name not in VERSIONED_COLLECTIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown collection: {name}")
+    await content_versions.bump(name)
+    return content_versions.stats()[name]
+
+@api_router.get("/admin/read-model")
+async def get_read_model_stats():
+    """Sync mode (change_stream or polling) and snapshot sizes of the in-memory read model"""
+    return read_model.stats()
+
+@api_router.get("/admin/fallback-pack")
+async def get_fallback_pack_stats():
+    """Version and contents of the loaded fallback data pack"""
+    return fallback_pack.stats()
+
+@api_router.get("/admin/cache-stats")
+async def get_cache_stats():
+    """API cache size and request-coalescing counters"""
+    return api_cache.stats()
+
+# Filter keys - lowercase copies of filter fields, set on write so list filters are exact index matches
+FILTER_KEYS = {
+    "articles": [("category", "category_key")],
+    "airdrops": [("chain", "chain_key")],
+    "yield_protocols": [("chain", "chain_key"), ("risk_level", "risk_key")],
+}
+DERIVED_FIELDS_BACKFILL_BATCH = 500
+
+def filter_key(value: Optional[str]) -> Optional[str]:
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+def with_filter_key(collection: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Set the normalized keys whenever the document (or $set payload) carries their source fields"""
+    for source, key in FILTER_KEYS[collection]:
+        if source in doc:
+            doc[key] = filter_key(doc[source])
+    return doc
+
+async def backfill_derived_fields(collection: str, source: str, derive: Callable[[Any], Dict[str, Any]]) -> None:
+    """One-off migration for documents written before a derived field existed - idempotent, runs on startup"""
+    try:
+        ops = []
+        updated = 0
+        projection = {source: 1, **{field: 1 for field in derive(None)}}
+        async for doc in db[collection].find({source: {"$type": "string"}}, projection):
+            derived = derive(doc[source])
+            if any(doc.get(field) != value for field, value in derived.items()):
+                ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": derived}))
+            if len(ops) >= DERIVED_FIELDS_BACKFILL_BATCH:
+                await db[collection].bulk_write(ops, ordered=False)
+                updated += len(ops)
+                ops = []
+        if ops:
+            await db[collection].bulk_write(ops, ordered=False)
+            updated += len(ops)
+        if updated:
+            logger.info(f"Backfilled {', '.join(derive(None))} on {updated} {collection}")
+            if collection in VERSIONED_COLLECTIONS:
+                await content_versions.bump(collection)
+    except Exception as e:
+        logger.error(f"Error backfilling fields derived from {collection}.{source}: {e}")
+
+async def backfill_filter_keys() -> None:
+    for collection, pairs in FILTER_KEYS.items():
+        for source, key in pairs:
+            await backfill_derived_fields(collection, source, lambda value, key=key: {key: filter_key(value)})
+
+# APY - admins type free text ("5%", "4-8%", "~12,5%"); a numeric copy is kept for filtering and sorting
+APY_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)?")
+APY_SORTS = {"apy_desc": [("apy_value", -1)], "apy_asc": [("apy_value", 1)]}
+
+def parse_apy(text: Optional[str]) -> Dict[str, Optional[float]]:
+    """apy_min/apy_max (equal for a single rate) and apy_value, their midpoint - all None if no number"""
+    numbers = []
+    for match in APY_NUMBER_RE.findall(text or "")[:2]:
+        whole, _, fraction = match.replace(",", ".").partition(".")
+        # "1,000%" is a thousands separator, "4,5%" a decimal comma
+        numbers.append(float(whole + fraction) if "," in match and len(fraction) == 3 else float(match.replace(",", ".")))
+    if not numbers:
+        return {"apy_min": None, "apy_max": None, "apy_value": None}
+    low, high = min(numbers), max(numbers)
+    return {"apy_min": low, "apy_max": high, "apy_value": round((low + high) / 2, 4)}
+
+def with_apy_fields(doc: Dict[str, Any]) -> Dict[str, Any]:
+    if "apy" in doc:
+        doc.update(parse_apy(doc["apy"]))
+    return doc
+
+async def backfill_apy_fields() -> None:
+    for collection in ("yield_protocols", "staking_options"):
+        await backfill_derived_fields(collection, "apy", parse_apy)
+
+def apy_query(min_apy: Optional[float], max_apy: Optional[float]) -> Dict[str, Any]:
+    """Ranges overlap the requested bounds - "4-8%" matches min_apy=6"""
+    query: Dict[str, Any] = {}
+    if min_apy is not None:
+        query["apy_max"] = {"$gte": min_apy}
+    if max_apy is not None:
+        query["apy_min"] = {"$lte": max_apy}
+    return query
+
+ARTICLES_DEFAULT_LIMIT = 20
+ARTICLES_MAX_LIMIT = 100
+ARTICLE_LIST_PROJECTION = {"_id": 0, "content": 0, "category_key": 0}
+
+def encode_article_cursor(article: Dict[str, Any]) -> str:
+    """Opaque keyset cursor for the (published_at, id) of the last article on a page"""
+    raw = json.dumps([article["published_at"], article["id"]], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_article_cursor(cursor: str) -> tuple:
+    try:
+        published_at, article_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(published_at), str(article_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _after_cursor(article: Dict[str, Any], position: Optional[tuple]) -> bool:
+    return position is None or (article["published_at"], article["id"]) < position
+
+def fallback_article_page(category: Optional[str], position: Optional[tuple], limit: int) -> List[Dict[str, Any]]:
+    """Up to limit + 1 fallback pack articles after the cursor - the pack is already newest first"""
+    if category and category != "all":
+        articles = fallback_pack.articles_in_category(category)
+    else:
+        articles = fallback_pack.articles
+    return [a for a in articles if _after_cursor(a, position)][:limit + 1]
+
+@api_router.get("/articles", response_model=List[ArticleSummary])
+async def get_articles_route(request: Request, response: Response, category: Optional[str] = None,
+                             search: Optional[str] = None, limit: int = ARTICLES_DEFAULT_LIMIT,
+                             cursor: Optional[str] = None):
+    """Get article summaries (no content), newest first, from MongoDB - falls back to mock data if empty
+    
+    Keyset pagination on (published_at, id): pass the X-Next-Cursor header of a page as cursor=
+    to get the next one. Full articles come from /articles/{article_id}.
+    With search= the top `limit` matches come back ranked by relevance from the search index.
+    """
+    if limit < 1 or limit > ARTICLES_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {ARTICLES_MAX_LIMIT}")
+    not_modified = conditional_response(request, response, "articles")
+    if not_modified:
+        return not_modified
+    if search and search.strip():
+        await article_search.ensure_ready()
+        return article_search.search(search, limit, category)
+    position = decode_article_cursor(cursor) if cursor else None
     try:
         # Build query
-        query = {}
+        query: Dict[str, Any] = {}
         if category and category != "all":
-            query["category"] = {"$regex": f"^{category}$", "$options": "i"}
-        
-        # Try MongoDB first
-        db_articles = await db.articles.find(query, {"_id": 0}).sort("published_at", -1).to_list(100)
-        
-        if db_articles and len(db_articles) >= 1:
+            query["category_key"] = filter_key(category)
+        if position:
+            published_at, article_id = position
+            keyset = {"$or": [{"published_at": {"$lt": published_at}},
+                              {"published_at": published_at, "id": {"$lt": article_id}}]}
+            query = {"$and": [query, keyset]} if query else keyset
+
+        # Try MongoDB first - one extra document tells us whether another page exists
+        db_articles = await db.articles.find(query, ARTICLE_LIST_PROJECTION) \
+            .sort([("published_at", -1), ("id", -1)]).limit(limit + 1).to_list(limit + 1)
+
+        # The source is decided by the collection, not the cursor - fallback pages carry cursors too
+        if db_articles or await db.articles.estimated_document_count() > 0:
             articles = db_articles
         else:
             # Fallback to mock data
-            articles = get_mock_articles()
-            if category and category != "all":
-                articles = [a for a in articles if a.get('category', '').lower() == category.lower()]
-        
-        # Apply search filter
-        if search:
-            search_lower = search.lower()
-            articles = [a for a in articles if search_lower in a.get('title', '').lower() or search_lower in a.get('excerpt', '').lower()]
-        
-        return articles
+            articles = fallback_article_page(category, position, limit)
     except Exception as e:
         logger.error(f"Error fetching articles: {e}")
-        return get_mock_articles()
+        drop_validators(response)
+        articles = fallback_article_page(category, position, limit)
+
+    if len(articles) > limit:
+        articles = articles[:limit]
+        response.headers["X-Next-Cursor"] = encode_article_cursor(articles[-1])
+    return articles
+
+@api_router.get("/articles/categories", response_model=List[str])
+async def get_article_categories(request: Request, response: Response):
+    """Every article category for the filter bar - from MongoDB, or the fallback pack while it is empty"""
+    not_modified = conditional_response(request, response, "articles")
+    if not_modified:
+        return not_modified
+    try:
+        categories = await db.articles.distinct("category")
+        if categories:
+            return sorted(c for c in categories if c)
+    except Exception as e:
+        logger.error(f"Error fetching article categories: {e}")
+        drop_validators(response)
+    return sorted({a["category"] for a in fallback_pack.articles})
+
+@api_router.get("/search/suggest")
+async def get_search_suggestions(q: str = "", limit: int = 8):
+    """Typeahead for the articles search box - word completions plus matching titles"""
+    limit = max(1, min(limit, 20))
+    await article_search.ensure_ready()
+    return article_search.suggest(q, limit)
+
+@api_router.get("/admin/search-index")
+async def get_search_index_stats():
+    """Size and age of the in-memory article search index"""
+    return article_search.stats()
+
+@api_router.post("/admin/search-index/rebuild")
+async def rebuild_search_index():
+    """Rebuild the article search index from MongoDB"""
+    await article_search.rebuild()
+    return article_search.stats()
 
 @api_router.get("/articles/{article_id}", response_model=Article)
-async def get_article(article_id: str):
+async def get_article(article_id: str, request: Request, response: Response):
     """Get single article by ID from MongoDB"""
+    not_modified = conditional_response(request, response, "articles")
+    if not_modified:
+        return not_modified
     try:
         # Try MongoDB first
         article = await db.articles.find_one({"id": article_id}, {"_id": 0})
@@ -1421,8 +3797,7 @@ async def get_article(article_id: str):
             return article
         
         # Fallback to mock data
-        articles = get_mock_articles()
-        article = next((a for a in articles if a['id'] == article_id), None)
+        article = fallback_pack.article(article_id)
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         return article
@@ -1433,34 +3808,43 @@ async def get_article(article_id: str):
         raise HTTPException(status_code=500, detail="Failed to fetch article")
 
 @api_router.get("/airdrops", response_model=List[Airdrop])
-async def get_airdrops_route(status: Optional[str] = None, difficulty: Optional[str] = None, chain: Optional[str] = None):
-    """Get airdrops from MongoDB, falls back to mock data if empty"""
+async def get_airdrops_route(request: Request, response: Response, status: Optional[str] = None,
+                             difficulty: Optional[str] = None, chain: Optional[str] = None):
+    """Get airdrops from MongoDB, falls back to mock data if empty
+    
+    The unfiltered list comes from the read model, status/chain filters are an indexed query
+    so the limit applies after filtering.
+    """
+    not_modified = conditional_response(request, response, "airdrops")
+    if not_modified:
+        return not_modified
     try:
-        # Build query
         query = {}
         if status and status != "all":
             query["status"] = status
         if chain and chain != "all":
-            query["chain"] = {"$regex": f"^{chain}$", "$options": "i"}
-        
-        # Try MongoDB first
-        db_airdrops = await db.airdrops.find(query, {"_id": 0}).sort("deadline", 1).to_list(100)
+            query["chain_key"] = filter_key(chain)
+        if query:
+            db_airdrops = await db.airdrops.find(query, {"_id": 0}).sort("deadline", 1).to_list(100)
+        else:
+            db_airdrops = await read_model.read("airdrops")
+            if db_airdrops is None:
+                drop_validators(response)
         
         if db_airdrops and len(db_airdrops) >= 1:
             return db_airdrops
         
         # Fallback to mock data
-        airdrops = get_mock_airdrops()
+        airdrops = fallback_pack.airdrops_on_chain(chain) if chain and chain != "all" else fallback_pack.airdrops
         
         if status and status != "all":
             airdrops = [a for a in airdrops if a['status'] == status]
-        if chain and chain != "all":
-            airdrops = [a for a in airdrops if a.get('chain', '').lower() == chain.lower()]
         
         return airdrops
     except Exception as e:
         logger.error(f"Error fetching airdrops: {e}")
-        return get_mock_airdrops()
+        drop_validators(response)
+        return fallback_pack.airdrops
 
 @api_router.get("/airdrops/{airdrop_id}", response_model=Airdrop)
 async def get_airdrop(airdrop_id: str):
@@ -1472,8 +3856,7 @@ async def get_airdrop(airdrop_id: str):
             return airdrop
         
         # Fallback to mock data
-        airdrops = get_mock_airdrops()
-        airdrop = next((a for a in airdrops if a['id'] == airdrop_id), None)
+        airdrop = fallback_pack.airdrop(airdrop_id)
         if not airdrop:
             raise HTTPException(status_code=404, detail="Airdrop not found")
         return airdrop
@@ -1519,8 +3902,20 @@ async def get_market_indices():
     }
 
 @api_router.get("/market-indices/gainers-losers")
-async def get_gainers_losers():
-    """Get top gainers and losers"""
+async def get_gainers_losers(response: Response, limit: int = MOVERS_DEFAULT_LIMIT,
+                             min_volume: float = MOVERS_DEFAULT_MIN_VOLUME):
+    """Get top gainers and losers across all Kraken USD pairs (min_volume in USD over 24h)"""
+    if limit < 1 or limit > MOVERS_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MOVERS_MAX_LIMIT}")
+    if not market_poller.is_running() or not market_movers.is_ready():
+        # Nothing refreshing in the background (or first refresh pending) - CACHE_TTL_MOVERS drives refreshes
+        await market_poller.lookup("kraken_movers")
+    if market_movers.is_ready():
+        freshness, age = market_movers.freshness()
+        mark_freshness(response, freshness, age)
+        return market_movers.movers(limit, min_volume)
+
+    mark_freshness(response, "fallback")
     return {
         "gainers": [
             {"symbol": "ONDO", "name": "Ondo Finance", "price": 0.89, "change_24h": 28.5},
@@ -1534,6 +3929,77 @@ async def get_gainers_losers():
         ]
     }
 
+@api_router.get("/admin/market-movers")
+async def get_market_movers_stats():
+    """Universe size and refresh counters for the gainers/losers ranking"""
+    return market_movers.stats()
+
+
+# Bootstrap endpoint - everything a page needs on first paint in one round trip
+BOOTSTRAP_SECTION_TIMEOUT = 2.5    # seconds - a slow section is dropped, the rest still ships
+BOOTSTRAP_LIST_LIMIT = 3
+
+# Light list projections - full bodies stay on the detail endpoints
+ARTICLE_SUMMARY_FIELDS = ["id", "title", "excerpt", "category", "premium", "published_at", "image_url", "read_time"]
+AIRDROP_SUMMARY_FIELDS = ["id", "project_name", "logo_url", "description", "chain", "estimated_reward",
+                          "deadline", "status", "premium"]
+
+def project_fields(items: List[Dict[str, Any]], fields: List[str]) -> List[Dict[str, Any]]:
+    return [{field: item.get(field) for field in fields} for item in items]
+
+async def get_latest_article_summaries(limit: int = BOOTSTRAP_LIST_LIMIT) -> List[Dict[str, Any]]:
+    projection = {"_id": 0, **{field: 1 for field in ARTICLE_SUMMARY_FIELDS}}
+    articles = await db.articles.find({}, projection).sort("published_at", -1).to_list(limit)
+    return articles or project_fields(fallback_pack.articles[:limit], ARTICLE_SUMMARY_FIELDS)
+
+async def get_airdrop_summaries(limit: int = BOOTSTRAP_LIST_LIMIT) -> List[Dict[str, Any]]:
+    airdrops = (await read_model.read("airdrops") or ())[:limit]
+    return project_fields(airdrops or fallback_pack.airdrops[:limit], AIRDROP_SUMMARY_FIELDS)
+
+# Page -> section name -> loader; market sections reuse their endpoint handlers (cache reads)
+BOOTSTRAP_PAGES: Dict[str, Dict[str, Callable[[], Awaitable[Any]]]] = {
+    "home": {
+        "market_stats": lambda: get_market_stats(Response()),
+        "fear_greed": lambda: get_fear_greed_index(Response()),
+        "articles": get_latest_article_summaries,
+        "airdrops": get_airdrop_summaries,
+    },
+    "market-indices": {
+        "fear_greed": lambda: get_fear_greed_index(Response()),
+        "global": lambda: get_global_market_data(Response()),
+        "stablecoins": lambda: get_stablecoin_data(Response()),
+        "defi_tvl": lambda: get_defi_tvl(Response()),
+    },
+}
+
+async def _load_bootstrap_section(name: str, loader: Callable[[], Awaitable[Any]]) -> tuple:
+    try:
+        return name, await asyncio.wait_for(loader(), BOOTSTRAP_SECTION_TIMEOUT), None
+    except asyncio.TimeoutError:
+        logger.warning(f"Bootstrap section {name} timed out after {BOOTSTRAP_SECTION_TIMEOUT}s")
+        return name, None, "timeout"
+    except Exception as e:
+        logger.error(f"Error loading bootstrap section {name}: {e}")
+        return name, None, "error"
+
+@api_router.get("/bootstrap/{page}")
+async def get_bootstrap(page: str):
+    """All first-paint data for a page, loaded concurrently.
+    
+    Sections that fail or time out come back as null with the reason in `errors`;
+    the client falls back to the individual endpoint for those.
+    """
+    sections = BOOTSTRAP_PAGES.get(page)
+    if sections is None:
+        raise HTTPException(status_code=404, detail="Unknown page")
+    results = await asyncio.gather(*(_load_bootstrap_section(name, loader) for name, loader in sections.items()))
+    return {
+        "page": page,
+        "sections": {name: value for name, value, _ in results},
+        "errors": {name: error for name, _, error in results if error},
+        "generated_at": datetime.now(timezone.utc).isoformat()
+    }
+
 
 # Payment endpoints
 @api_router.post("/payments/submit")
@@ -1604,13 +4070,17 @@ async def verify_payment(payment_id: str):
         from datetime import timedelta
         premium_until = datetime.now(timezone.utc) + timedelta(days=30)
         
-        await db.users.update_one(
+        previous = await db.users.find_one_and_update(
             {"email": payment["user_email"]},
             {"$set": {
                 "is_premium": True,
                 "premium_until": premium_until.isoformat()
-            }}
+            }},
+            projection={"is_premium": 1},
+            return_document=ReturnDocument.BEFORE
         )
+        if previous is not None and not previous.get("is_premium"):
+            await admin_stats.increment("premium_users")
         
         return {"success": True, "message": "Payment verified and premium activated"}
     except HTTPException:
@@ -1620,106 +4090,26 @@ async def verify_payment(payment_id: str):
         raise HTTPException(status_code=500, detail="Failed to verify payment")
 
 # Early Signals endpoint
-def get_mock_signals():
-    """Mock signals data"""
-    return [
-        {
-            "id": "1",
-            "type": "opportunity",
-            "priority": "high",
-            "title": "Arbitrum Airdrop Season 2 Hints",
-            "description": "El equipo de Arbitrum ha insinuado una segunda ronda de airdrops. Usuarios activos en el ecosistema podrían calificar.",
-            "action": "Bridge y usar protocolos en Arbitrum",
-            "link": "https://arbitrum.io",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "premium": False
-        },
-        {
-            "id": "2",
-            "type": "alert",
-            "priority": "urgent",
-            "title": "Bitcoin: Soporte Clave en $68K",
-            "description": "BTC testeando soporte crítico. Ruptura podría llevar a $62K. Mantener stables listos para compra.",
-            "action": "Set buy orders at $65K",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "premium": True
-        },
-        {
-            "id": "3",
-            "type": "news",
-            "priority": "medium",
-            "title": "BlackRock ETF: Record Inflows",
-            "description": "IBIT de BlackRock registró $500M en entradas en un solo día. Señal alcista institucional.",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "premium": False
-        },
-        {
-            "id": "4",
-            "type": "opportunity",
-            "priority": "high",
-            "title": "Solana DEX Rewards Program",
-            "description": "Jupiter Exchange lanzó programa de puntos. Traders activos acumulan para posible airdrop.",
-            "action": "Trade en Jupiter, acumular puntos",
-            "link": "https://jup.ag",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "premium": False
-        },
-        {
-            "id": "5",
-            "type": "community",
-            "priority": "low",
-            "title": "Alpha Crypto Discord: Q&A Esta Semana",
-            "description": "Sesión de preguntas y respuestas con el equipo de análisis. Jueves 8PM UTC.",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "premium": False
-        },
-        {
-            "id": "6",
-            "type": "alert",
-            "priority": "high",
-            "title": "ETH: Patrón Técnico Formándose",
-            "description": "Ethereum formando cuña descendente. Breakout alcista esperado si supera $2,200.",
-            "action": "Watch for breakout confirmation",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "premium": True
-        },
-        {
-            "id": "7",
-            "type": "news",
-            "priority": "medium",
-            "title": "Stripe Expande Pagos Crypto",
-            "description": "Stripe habilita pagos con USDC para más merchants. Adopción institucional acelerando.",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "premium": False
-        },
-        {
-            "id": "8",
-            "type": "opportunity",
-            "priority": "urgent",
-            "title": "Base: Nueva Temporada de Incentivos",
-            "description": "Coinbase Base L2 lanzando programa de incentivos. $10M en rewards para usuarios activos.",
-            "action": "Bridge a Base y usar DeFi",
-            "link": "https://base.org",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "premium": True
-        }
-    ]
-
 @api_router.get("/early-signals")
-async def get_early_signals():
-    """Get early signals from MongoDB, falls back to mock data if empty"""
+async def get_early_signals(request: Request, response: Response):
+    """Get early signals from the read model (MongoDB snapshot), falls back to mock data if empty"""
+    not_modified = conditional_response(request, response, "signals")
+    if not_modified:
+        return not_modified
     try:
-        # Try MongoDB first
-        db_signals = await db.signals.find({}, {"_id": 0}).sort("timestamp", -1).to_list(100)
+        db_signals = await read_model.read("signals")
+        if db_signals is None:
+            drop_validators(response)
         
         if db_signals and len(db_signals) >= 1:
             return db_signals
         
         # Fallback to mock data
-        return get_mock_signals()
+        return fallback_pack.signals
     except Exception as e:
         logger.error(f"Error fetching signals: {e}")
-        return get_mock_signals()
+        drop_validators(response)
+        return fallback_pack.signals
 
 
 @api_router.get("/admin/users")
@@ -1749,6 +4139,7 @@ async def submit_consulting_request(request: ConsultingSubmission):
             "status": "new"
         }
         await db.consulting.insert_one(consulting_doc)
+        await admin_stats.increment("pending_consulting")
         
         # Send email notification
         service_label = "Personal" if request.service_type == "personal" else "Empresarial"
@@ -1844,12 +4235,15 @@ async def get_consulting_requests(status: Optional[str] = None):
 async def update_consulting_status(request_id: str, status: str):
     """Update consulting request status"""
     try:
-        result = await db.consulting.update_one(
+        previous = await db.consulting.find_one_and_update(
             {"id": request_id},
-            {"$set": {"status": status}}
+            {"$set": {"status": status}},
+            projection={"status": 1},
+            return_document=ReturnDocument.BEFORE
         )
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(status_code=404, detail="Request not found")
+        await admin_stats.increment("pending_consulting", (status == "new") - (previous.get("status") == "new"))
         return {"success": True, "message": f"Status updated to {status}"}
     except HTTPException:
         raise
@@ -1874,6 +4268,7 @@ async def subscribe_to_alerts(subscription: EmailAlertSubscription):
             "active": True
         }
         await db.alert_subscriptions.insert_one(sub_doc)
+        await admin_stats.increment("subscribers")
         
         # Send welcome email
         welcome_html = """
@@ -1951,6 +4346,8 @@ async def unsubscribe_from_alerts(subscription: EmailAlertSubscription):
             {"email": subscription.email},
             {"$set": {"active": False}}
         )
+        if result.modified_count:
+            await admin_stats.increment("subscribers", -1)
         return {"success": True, "message": "Unsubscribed from alerts"}
     except Exception as e:
         logger.error(f"Error unsubscribing: {e}")
@@ -1961,8 +4358,7 @@ async def send_article_newsletter(article_id: str):
     """Send an article to all newsletter subscribers"""
     try:
         # Get the article
-        articles = get_mock_articles()
-        article = next((a for a in articles if a["id"] == article_id), None)
+        article = fallback_pack.article(article_id)
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         
@@ -2053,6 +4449,7 @@ async def submit_feedback(feedback: FeedbackSubmission):
             "read": False
         }
         await db.feedback.insert_one(feedback_doc)
+        await admin_stats.increment("unread_feedback")
         
         # Send email notification
         email_html = f"""
@@ -2102,6 +4499,8 @@ async def mark_feedback_read(feedback_id: str):
         )
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Feedback not found")
+        if result.modified_count:
+            await admin_stats.increment("unread_feedback", -1)
         return {"success": True, "message": "Feedback marked as read"}
     except HTTPException:
         raise
@@ -2348,7 +4747,9 @@ async def admin_create_article(article: ArticleCreate):
             "tags": article.tags or [],
             "read_time": article.read_time or "5 min"
         }
-        await db.articles.insert_one(article_doc)
+        await db.articles.insert_one(with_filter_key("articles", article_doc))
+        version = await content_versions.bump("articles")
+        article_search.article_saved(article_doc, version)
         return {"success": True, "article": {k: v for k, v in article_doc.items() if k != "_id"}}
     except Exception as e:
         logger.error(f"Error creating article: {e}")
@@ -2362,11 +4763,14 @@ async def admin_update_article(article_id: str, article: ArticleUpdate):
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
         
-        result = await db.articles.update_one({"id": article_id}, {"$set": update_data})
+        result = await db.articles.update_one({"id": article_id}, {"$set": with_filter_key("articles", update_data)})
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Article not found")
+        version = await content_versions.bump("articles")
         
         updated = await db.articles.find_one({"id": article_id}, {"_id": 0})
+        if updated:
+            article_search.article_saved(updated, version)
         return {"success": True, "article": updated}
     except HTTPException:
         raise
@@ -2381,6 +4785,8 @@ async def admin_delete_article(article_id: str):
         result = await db.articles.delete_one({"id": article_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Article not found")
+        version = await content_versions.bump("articles")
+        article_search.article_deleted(article_id, version)
         return {"success": True, "message": "Article deleted"}
     except HTTPException:
         raise
@@ -2430,7 +4836,8 @@ async def admin_create_airdrop(airdrop: AirdropCreate):
             "link": airdrop.link,
             "premium": airdrop.premium
         }
-        await db.airdrops.insert_one(airdrop_doc)
+        await db.airdrops.insert_one(with_filter_key("airdrops", airdrop_doc))
+        await content_versions.bump("airdrops")
         return {"success": True, "airdrop": {k: v for k, v in airdrop_doc.items() if k != "_id"}}
     except Exception as e:
         logger.error(f"Error creating airdrop: {e}")
@@ -2444,9 +4851,10 @@ async def admin_update_airdrop(airdrop_id: str, airdrop: AirdropUpdate):
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
         
-        result = await db.airdrops.update_one({"id": airdrop_id}, {"$set": update_data})
+        result = await db.airdrops.update_one({"id": airdrop_id}, {"$set": with_filter_key("airdrops", update_data)})
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Airdrop not found")
+        await content_versions.bump("airdrops")
         
         updated = await db.airdrops.find_one({"id": airdrop_id}, {"_id": 0})
         return {"success": True, "airdrop": updated}
@@ -2463,6 +4871,7 @@ async def admin_delete_airdrop(airdrop_id: str):
         result = await db.airdrops.delete_one({"id": airdrop_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Airdrop not found")
+        await content_versions.bump("airdrops")
         return {"success": True, "message": "Airdrop deleted"}
     except HTTPException:
         raise
@@ -2497,6 +4906,7 @@ async def admin_create_signal(signal: SignalCreate):
             "premium": signal.premium
         }
         await db.signals.insert_one(signal_doc)
+        await content_versions.bump("signals")
         return {"success": True, "signal": {k: v for k, v in signal_doc.items() if k != "_id"}}
     except Exception as e:
         logger.error(f"Error creating signal: {e}")
@@ -2513,6 +4923,7 @@ async def admin_update_signal(signal_id: str, signal: SignalUpdate):
         result = await db.signals.update_one({"id": signal_id}, {"$set": update_data})
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Signal not found")
+        await content_versions.bump("signals")
         
         updated = await db.signals.find_one({"id": signal_id}, {"_id": 0})
         return {"success": True, "signal": updated}
@@ -2529,6 +4940,7 @@ async def admin_delete_signal(signal_id: str):
         result = await db.signals.delete_one({"id": signal_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Signal not found")
+        await content_versions.bump("signals")
         return {"success": True, "message": "Signal deleted"}
     except HTTPException:
         raise
@@ -2541,24 +4953,16 @@ async def admin_delete_signal(signal_id: str):
 async def admin_get_stats():
     """Get admin dashboard statistics"""
     try:
-        articles_count = await db.articles.count_documents({})
-        airdrops_count = await db.airdrops.count_documents({})
-        signals_count = await db.signals.count_documents({})
-        subscribers_count = await db.alert_subscriptions.count_documents({"active": True})
-        consulting_count = await db.consulting.count_documents({"status": "new"})
-        feedback_count = await db.feedback.count_documents({"read": False})
-        users_count = await db.users.count_documents({})
-        premium_users = await db.users.count_documents({"is_premium": True})
-        
+        stats = await admin_stats.snapshot()
         return {
-            "articles": articles_count,
-            "airdrops": airdrops_count,
-            "signals": signals_count,
-            "subscribers": subscribers_count,
-            "pending_consulting": consulting_count,
-            "unread_feedback": feedback_count,
-            "total_users": users_count,
-            "premium_users": premium_users
+            "articles": stats["articles"],
+            "airdrops": stats["airdrops"],
+            "signals": stats["signals"],
+            "subscribers": stats["subscribers"],
+            "pending_consulting": stats["pending_consulting"],
+            "unread_feedback": stats["unread_feedback"],
+            "total_users": stats["total_users"],
+            "premium_users": stats["premium_users"]
         }
     except Exception as e:
         logger.error(f"Error fetching admin stats: {e}")
@@ -2591,7 +4995,7 @@ class YieldProtocolUpdate(BaseModel):
 async def admin_get_yields():
     """Get all yield protocols for admin"""
     try:
-        yields = await db.yield_protocols.find({}, {"_id": 0}).sort("apy", -1).to_list(100)
+        yields = await db.yield_protocols.find({}, {"_id": 0}).sort(APY_SORTS["apy_desc"]).to_list(100)
         return yields
     except Exception as e:
         logger.error(f"Error fetching yields: {e}")
@@ -2612,7 +5016,8 @@ async def admin_create_yield(protocol: YieldProtocolCreate):
             "logo_url": protocol.logo_url or f"https://ui-avatars.com/api/?name={protocol.name[:2]}&background=10b981&color=fff&size=128",
             "created_at": datetime.now(timezone.utc).isoformat()
         }
-        await db.yield_protocols.insert_one(yield_doc)
+        await db.yield_protocols.insert_one(with_apy_fields(with_filter_key("yield_protocols", yield_doc)))
+        await content_versions.bump("yield_protocols")
         return {"success": True, "yield": {k: v for k, v in yield_doc.items() if k != "_id"}}
     except Exception as e:
         logger.error(f"Error creating yield: {e}")
@@ -2626,9 +5031,11 @@ async def admin_update_yield(yield_id: str, protocol: YieldProtocolUpdate):
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
         
+        update_data = with_apy_fields(with_filter_key("yield_protocols", update_data))
         result = await db.yield_protocols.update_one({"id": yield_id}, {"$set": update_data})
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Yield protocol not found")
+        await content_versions.bump("yield_protocols")
         
         updated = await db.yield_protocols.find_one({"id": yield_id}, {"_id": 0})
         return {"success": True, "yield": updated}
@@ -2645,6 +5052,7 @@ async def admin_delete_yield(yield_id: str):
         result = await db.yield_protocols.delete_one({"id": yield_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Yield protocol not found")
+        await content_versions.bump("yield_protocols")
         return {"success": True, "message": "Yield protocol deleted"}
     except HTTPException:
         raise
@@ -2654,16 +5062,38 @@ async def admin_delete_yield(yield_id: str):
 
 # Public endpoint for yields
 @api_router.get("/yields")
-async def get_yields():
-    """Get yield protocols - from DB or fallback to mock"""
+async def get_yields(request: Request, response: Response, chain: Optional[str] = None,
+                     risk_level: Optional[str] = None, min_apy: Optional[float] = None,
+                     max_apy: Optional[float] = None, sort: str = "apy_desc"):
+    """Get yield protocols - from DB or fallback to mock
+    
+    Filter by chain, risk_level and an APY range; sort=apy_desc (default) or apy_asc.
+    The unfiltered default list comes from the read model, anything else is an indexed query.
+    """
+    if sort not in APY_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(APY_SORTS)}")
+    not_modified = conditional_response(request, response, "yield_protocols")
+    if not_modified:
+        return not_modified
     try:
-        db_yields = await db.yield_protocols.find({}, {"_id": 0}).sort("apy", -1).to_list(100)
+        query = apy_query(min_apy, max_apy)
+        if chain and chain != "all":
+            query["chain_key"] = filter_key(chain)
+        if risk_level and risk_level != "all":
+            query["risk_key"] = filter_key(risk_level)
+        if query or sort != "apy_desc":
+            db_yields = await db.yield_protocols.find(query, {"_id": 0}).sort(APY_SORTS[sort]).to_list(100)
+            return db_yields
+        db_yields = await read_model.read("yield_protocols")
+        if db_yields is None:
+            drop_validators(response)
         if db_yields and len(db_yields) >= 1:
             return db_yields
         # Return empty array if no data - frontend has fallback
         return []
     except Exception as e:
         logger.error(f"Error fetching yields: {e}")
+        drop_validators(response)
         return []
 
 
@@ -2691,7 +5121,7 @@ class StakingUpdate(BaseModel):
 async def admin_get_staking():
     """Get all staking options for admin"""
     try:
-        staking = await db.staking_options.find({}, {"_id": 0}).to_list(100)
+        staking = await db.staking_options.find({}, {"_id": 0}).sort(APY_SORTS["apy_desc"]).to_list(100)
         return staking
     except Exception as e:
         logger.error(f"Error fetching staking: {e}")
@@ -2711,7 +5141,8 @@ async def admin_create_staking(staking: StakingCreate):
             "logo_url": staking.logo_url or f"https://ui-avatars.com/api/?name={staking.symbol}&background=8b5cf6&color=fff&size=128",
             "created_at": datetime.now(timezone.utc).isoformat()
         }
-        await db.staking_options.insert_one(staking_doc)
+        await db.staking_options.insert_one(with_apy_fields(staking_doc))
+        await content_versions.bump("staking_options")
         return {"success": True, "staking": {k: v for k, v in staking_doc.items() if k != "_id"}}
     except Exception as e:
         logger.error(f"Error creating staking: {e}")
@@ -2725,9 +5156,10 @@ async def admin_update_staking(staking_id: str, staking: StakingUpdate):
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
         
-        result = await db.staking_options.update_one({"id": staking_id}, {"$set": update_data})
+        result = await db.staking_options.update_one({"id": staking_id}, {"$set": with_apy_fields(update_data)})
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Staking option not found")
+        await content_versions.bump("staking_options")
         
         updated = await db.staking_options.find_one({"id": staking_id}, {"_id": 0})
         return {"success": True, "staking": updated}
@@ -2744,6 +5176,7 @@ async def admin_delete_staking(staking_id: str):
         result = await db.staking_options.delete_one({"id": staking_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Staking option not found")
+        await content_versions.bump("staking_options")
         return {"success": True, "message": "Staking option deleted"}
     except HTTPException:
         raise
@@ -2753,15 +5186,32 @@ async def admin_delete_staking(staking_id: str):
 
 # Public endpoint for staking
 @api_router.get("/staking")
-async def get_staking():
-    """Get staking options - from DB or fallback"""
+async def get_staking(request: Request, response: Response, min_apy: Optional[float] = None,
+                      max_apy: Optional[float] = None, sort: str = "apy_desc"):
+    """Get staking options - from DB or fallback
+    
+    Optional APY range filter; sort=apy_desc (default) or apy_asc. The unfiltered default
+    list comes from the read model, anything else is an indexed query.
+    """
+    if sort not in APY_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(APY_SORTS)}")
+    not_modified = conditional_response(request, response, "staking_options")
+    if not_modified:
+        return not_modified
     try:
-        db_staking = await db.staking_options.find({}, {"_id": 0}).to_list(100)
+        query = apy_query(min_apy, max_apy)
+        if query or sort != "apy_desc":
+            db_staking = await db.staking_options.find(query, {"_id": 0}).sort(APY_SORTS[sort]).to_list(100)
+            return db_staking
+        db_staking = await read_model.read("staking_options")
+        if db_staking is None:
+            drop_validators(response)
         if db_staking and len(db_staking) >= 1:
             return db_staking
         return []
     except Exception as e:
         logger.error(f"Error fetching staking: {e}")
+        drop_validators(response)
         return []
 
 
@@ -2829,6 +5279,7 @@ async def admin_create_holding(holding: PortfolioHoldingCreate):
             "created_at": datetime.now(timezone.utc).isoformat()
         }
         await db.portfolio_holdings.insert_one(holding_doc)
+        await content_versions.bump("portfolio_holdings")
         return {"success": True, "holding": {k: v for k, v in holding_doc.items() if k != "_id"}}
     except Exception as e:
         logger.error(f"Error creating holding: {e}")
@@ -2845,6 +5296,7 @@ async def admin_update_holding(holding_id: str, holding: PortfolioHoldingUpdate)
         result = await db.portfolio_holdings.update_one({"id": holding_id}, {"$set": update_data})
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Holding not found")
+        await content_versions.bump("portfolio_holdings")
         
         updated = await db.portfolio_holdings.find_one({"id": holding_id}, {"_id": 0})
         return {"success": True, "holding": updated}
@@ -2861,6 +5313,7 @@ async def admin_delete_holding(holding_id: str):
         result = await db.portfolio_holdings.delete_one({"id": holding_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Holding not found")
+        await content_versions.bump("portfolio_holdings")
         return {"success": True, "message": "Holding deleted"}
     except HTTPException:
         raise
@@ -2882,6 +5335,7 @@ async def admin_create_trade(trade: PortfolioTradeCreate):
             "created_at": datetime.now(timezone.utc).isoformat()
         }
         await db.portfolio_trades.insert_one(trade_doc)
+        await content_versions.bump("portfolio_trades")
         return {"success": True, "trade": {k: v for k, v in trade_doc.items() if k != "_id"}}
     except Exception as e:
         logger.error(f"Error creating trade: {e}")
@@ -2894,6 +5348,7 @@ async def admin_delete_trade(trade_id: str):
         result = await db.portfolio_trades.delete_one({"id": trade_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Trade not found")
+        await content_versions.bump("portfolio_trades")
         return {"success": True, "message": "Trade deleted"}
     except HTTPException:
         raise
@@ -2914,6 +5369,7 @@ async def admin_update_portfolio_settings(settings: PortfolioSettingsUpdate):
             {"$set": update_data}, 
             upsert=True
         )
+        await content_versions.bump("portfolio_settings")
         updated = await db.portfolio_settings.find_one({"id": "main"}, {"_id": 0})
         return {"success": True, "settings": updated}
     except Exception as e:
@@ -2922,32 +5378,50 @@ async def admin_update_portfolio_settings(settings: PortfolioSettingsUpdate):
 
 # Public endpoint for portfolio
 @api_router.get("/portfolio")
-async def get_portfolio():
+async def get_portfolio(request: Request, response: Response):
     """Get portfolio data - from DB or fallback to empty"""
+    not_modified = conditional_response(request, response, "portfolio_holdings", "portfolio_trades", "portfolio_settings")
+    if not_modified:
+        return not_modified
     try:
-        holdings = await db.portfolio_holdings.find({}, {"_id": 0}).sort("allocation", -1).to_list(20)
-        trades = await db.portfolio_trades.find({}, {"_id": 0}).sort("created_at", -1).to_list(10)
-        settings = await db.portfolio_settings.find_one({"id": "main"}, {"_id": 0})
+        holdings = await read_model.read("portfolio_holdings")
+        trades = await read_model.read("portfolio_trades")
+        settings = await read_model.read("portfolio_settings")
+        if holdings is None or trades is None or settings is None:
+            drop_validators(response)
+            return {"holdings": holdings or [], "trades": trades or [], "settings": settings[0] if settings else None}
         
         return {
             "holdings": holdings,
             "trades": trades,
-            "settings": settings
+            "settings": settings[0] if settings else None
         }
     except Exception as e:
         logger.error(f"Error fetching portfolio: {e}")
+        drop_validators(response)
         return {"holdings": [], "trades": [], "settings": None}
 
 
 # Include the router in the main app
 app.include_router(api_router)
 
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip responses except Server-Sent Events - compressing those would hold events in the buffer"""
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith("/api/stream/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Data-Freshness", "X-Data-Age", "X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
 # Configure logging
@@ -2957,6 +5431,138 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Startup work that needs MongoDB (indexes, backfills) runs as background tasks so an
+# unreachable server cannot hold up startup; references are kept until each task finishes
+_background_tasks: set = set()
+
+def _background_task_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background task {task.get_name()} failed: {task.exception()}")
+
+def run_in_background(coro: Awaitable[Any], name: str) -> asyncio.Task:
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_task_done)
+    return task
+
+@app.on_event("startup")
+async def startup_fallback_pack():
+    fallback_pack.load()
+
+@app.on_event("startup")
+async def startup_content_versions():
+    await content_versions.start()
+
+@app.on_event("startup")
+async def startup_upstream_client():
+    await upstream_client.start()
+
+@app.on_event("startup")
+async def startup_price_history():
+    run_in_background(price_history.ensure_collection(), "price-history-collection")
+
+@app.on_event("startup")
+async def startup_defi_tvl_tracker():
+    run_in_background(defi_tvl_tracker.ensure_indexes(), "defi-tvl-indexes")
+
+async def ensure_article_indexes() -> None:
+    # Serves the newest-first list and its keyset pagination without an in-memory sort
+    await db.articles.create_index([("published_at", -1), ("id", -1)])
+
+@app.on_event("startup")
+async def startup_article_indexes():
+    run_in_background(ensure_article_indexes(), "article-indexes")
+
+async def ensure_filter_keys() -> None:
+    # Equality on the key, then the list's sort order - category/chain pages are range scans, not sorts.
+    # Indexes first: if MongoDB is unreachable the first one fails the task and the backfill is skipped
+    await db.articles.create_index([("category_key", 1), ("published_at", -1), ("id", -1)])
+    await db.airdrops.create_index([("deadline", 1)])
+    await db.airdrops.create_index([("chain_key", 1), ("deadline", 1)])
+    await db.airdrops.create_index([("status", 1), ("deadline", 1)])
+    await db.airdrops.create_index([("status", 1), ("chain_key", 1), ("deadline", 1)])
+    await backfill_filter_keys()
+
+@app.on_event("startup")
+async def startup_filter_keys():
+    run_in_background(ensure_filter_keys(), "filter-keys")
+
+async def ensure_apy_fields() -> None:
+    # Filters come first, apy_value last so every list is served in index order
+    await db.yield_protocols.create_index([("apy_value", -1)])
+    await db.yield_protocols.create_index([("chain_key", 1), ("apy_value", -1)])
+    await db.yield_protocols.create_index([("risk_key", 1), ("apy_value", -1)])
+    await db.yield_protocols.create_index([("chain_key", 1), ("risk_key", 1), ("apy_value", -1)])
+    await db.staking_options.create_index([("apy_value", -1)])
+    await backfill_apy_fields()
+
+@app.on_event("startup")
+async def startup_apy_fields():
+    run_in_background(ensure_apy_fields(), "apy-fields")
+
+@app.on_event("startup")
+async def startup_read_model():
+    # Loads in the background; views read as empty (fallback data) until their first load
+    await read_model.start()
+
+@app.on_event("startup")
+async def startup_article_search():
+    run_in_background(article_search.ensure_ready(), "article-search")
+
+@app.on_event("startup")
+async def startup_admin_stats():
+    await admin_stats.start()
+
+async def load_symbol_registry() -> None:
+    await symbol_registry.load()
+    await kraken_ticker_stream.set_assets(symbol_registry.ticker_assets())
+    if KRAKEN_WS_ENABLED:
+        # Started once the registry is loaded so the first subscription covers every tracked pair
+        await kraken_ticker_stream.start()
+
+@app.on_event("startup")
+async def startup_symbol_registry():
+    # Built-in symbols serve until the MongoDB entries are loaded in the background
+    run_in_background(load_symbol_registry(), "symbol-registry")
+
+@app.on_event("startup")
+async def startup_market_poller():
+    if MARKET_POLLER_ENABLED:
+        await market_poller.start()
+
+@app.on_event("shutdown")
+async def shutdown_background_tasks():
+    # First - a startup task still running could otherwise start work the handlers below just stopped
+    for task in list(_background_tasks):
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+@app.on_event("shutdown")
+async def shutdown_read_model():
+    await read_model.stop()
+
+@app.on_event("shutdown")
+async def shutdown_content_versions():
+    await content_versions.stop()
+
+@app.on_event("shutdown")
+async def shutdown_admin_stats():
+    await admin_stats.stop()
+
+@app.on_event("shutdown")
+async def shutdown_market_poller():
+    await market_poller.stop()
+
+@app.on_event("shutdown")
+async def shutdown_kraken_ticker_stream():
+    await kraken_ticker_stream.stop()
+
+@app.on_event("shutdown")
+async def shutdown_upstream_client():
+    await upstream_client.close()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    # Last - every task above may still be talking to MongoDB until it is stopped
     client.close()
\ No newline at end of file
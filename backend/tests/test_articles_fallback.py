@@ -0,0 +1,81 @@
+"""Walks /api/articles pagination over the fallback pack while MongoDB has no articles.
+
+    cd backend && python -m pytest -q tests
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from starlette.requests import Request
+from starlette.responses import Response
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'alpha_crypto_test')
+
+import server  # noqa: E402
+
+
+class EmptyCursor:
+    def sort(self, *args, **kwargs):
+        return self
+
+    def limit(self, *args):
+        return self
+
+    async def to_list(self, length=None):
+        return []
+
+
+class EmptyCollection:
+    def find(self, *args, **kwargs):
+        return EmptyCursor()
+
+    async def estimated_document_count(self):
+        return 0
+
+
+class EmptyDatabase:
+    articles = EmptyCollection()
+
+
+@pytest.fixture
+def empty_db(monkeypatch):
+    monkeypatch.setattr(server, "db", EmptyDatabase())
+    server.fallback_pack.load()
+
+
+def make_request(query: str = "") -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/api/articles",
+                    "headers": [], "query_string": query.encode()})
+
+
+def walk_pages(category=None, limit=2):
+    pages = []
+    cursor = None
+    while True:
+        response = Response()
+        page = asyncio.run(server.get_articles_route(make_request(), response, category=category,
+                                                     limit=limit, cursor=cursor))
+        pages.append([article["id"] for article in page])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+        assert len(pages) <= len(server.fallback_pack.articles), "pagination does not terminate"
+
+
+def test_fallback_pages_cover_every_article(empty_db):
+    pages = walk_pages(limit=2)
+    expected = [article["id"] for article in server.fallback_pack.articles]
+    assert [article_id for page in pages for article_id in page] == expected
+    assert all(pages), "a cursor led to an empty page"
+    assert all(len(page) == 2 for page in pages[:-1])
+
+
+def test_fallback_pages_within_a_category(empty_db):
+    category = server.fallback_pack.articles[0]["category"]
+    pages = walk_pages(category=category, limit=1)
+    expected = [article["id"] for article in server.fallback_pack.articles_in_category(category)]
+    assert [article_id for page in pages for article_id in page] == expected
@@ -0,0 +1,120 @@
+"""Runs KrakenTickerStream against scripts/mock_kraken_ws.py on a local port.
+
+    cd backend && python -m pytest -q tests
+"""
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BACKEND_DIR / "scripts"))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'alpha_crypto_test')
+
+import mock_kraken_ws  # noqa: E402
+import server  # noqa: E402
+
+GLOBAL_DATA = {
+    "total_market_cap_usd": 3.2e12,
+    "btc_dominance": 58.0,
+    "eth_dominance": 12.0,
+    "total_volume_24h_usd": 1.1e11,
+    "active_cryptocurrencies": 10000,
+    "market_cap_change_24h": 1.5,
+}
+
+
+async def start_mock() -> tuple:
+    app = web.Application()
+    app["args"] = argparse.Namespace(interval=0.02, drop_every=0)
+    app.router.add_get("/v2", mock_kraken_ws.ticker_ws)
+    # Short shutdown so cleanup() drops connected clients instead of waiting on them
+    runner = web.AppRunner(app, shutdown_timeout=0.5)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"ws://127.0.0.1:{port}/v2"
+
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+@pytest.fixture
+def isolated(monkeypatch):
+    """Fresh cache and aggregator, a fast flush, and a REST fetch that records its calls"""
+    rest_calls = []
+
+    async def fake_rest(assets):
+        rest_calls.append([asset["id"] for asset in assets])
+        return [{"id": asset["id"], "symbol": asset["symbol"], "name": asset["name"], "current_price": 1.0,
+                 "price_change_24h": 0, "market_cap": 0, "volume_24h": 0} for asset in assets]
+
+    monkeypatch.setattr(server, "api_cache", server.APICache())
+    monkeypatch.setattr(server, "market_stats", server.MarketStatsAggregator())
+    monkeypatch.setattr(server, "market_broadcaster", server.MarketBroadcaster())
+    monkeypatch.setattr(server, "KRAKEN_WS_FLUSH_INTERVAL", 0.05)
+    monkeypatch.setattr(server, "fetch_kraken_tickers", fake_rest)
+    return rest_calls
+
+
+def test_ticks_reach_the_cache_and_market_stats(isolated, monkeypatch):
+    async def scenario():
+        runner, url = await start_mock()
+        stream = server.KrakenTickerStream(url, server.symbol_registry.ticker_assets())
+        monkeypatch.setattr(server, "kraken_ticker_stream", stream)
+        server.market_stats.update_global(GLOBAL_DATA)
+        await stream.start()
+        try:
+            await wait_for(lambda: stream.is_healthy() and stream.stats()["flushes"] > 0)
+            cached = server.api_cache.get("crypto_prices")
+            assert {price["id"] for price in cached} >= {"bitcoin", "ethereum", "solana"}
+            assert server.api_cache.get("price:bitcoin") is not None
+
+            await wait_for(lambda: (server.market_stats.snapshot() or {}).get("btc_price") is not None)
+            btc = next(price for price in server.api_cache.get("crypto_prices") if price["id"] == "bitcoin")
+            assert server.market_stats.snapshot()["btc_price"] == btc["current_price"]
+
+            # Healthy stream - prices come from the WebSocket table, not REST
+            prices = await server.fetch_kraken_prices()
+            assert {price["id"] for price in prices} == {price["id"] for price in stream.snapshot()}
+            assert isolated == []
+        finally:
+            await stream.stop()
+            await runner.cleanup()
+            await server.upstream_client.close()
+
+    asyncio.run(scenario())
+
+
+def test_rest_fallback_after_disconnect(isolated, monkeypatch):
+    async def scenario():
+        runner, url = await start_mock()
+        stream = server.KrakenTickerStream(url, server.symbol_registry.ticker_assets())
+        monkeypatch.setattr(server, "kraken_ticker_stream", stream)
+        await stream.start()
+        try:
+            await wait_for(stream.is_healthy)
+            # Mock goes away - the stream drops its connection and keeps retrying
+            await runner.cleanup()
+            await wait_for(lambda: not stream.stats()["connected"])
+            assert not stream.is_healthy()
+
+            prices = await server.fetch_kraken_prices()
+            assert isolated == [[asset["id"] for asset in server.symbol_registry.ticker_assets()]]
+            assert all(price["current_price"] == 1.0 for price in prices)
+        finally:
+            await stream.stop()
+            await server.upstream_client.close()
+
+    asyncio.run(scenario())
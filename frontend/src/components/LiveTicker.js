@@ -1,6 +1,7 @@
 import { useEffect, useState, useCallback } from 'react';
 import axios from 'axios';
 import { TrendingUp, TrendingDown, RefreshCw } from 'lucide-react';
+import { useMarketStream } from '@/hooks/use-market-stream';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -9,12 +10,16 @@ export default function LiveTicker() {
   const [prices, setPrices] = useState([]);
   const [lastUpdate, setLastUpdate] = useState(null);
   const [isRefreshing, setIsRefreshing] = useState(false);
+  // fresh | stale | fallback - sent by the backend in X-Data-Freshness
+  const [freshness, setFreshness] = useState('fresh');
+  const [streamDown, setStreamDown] = useState(false);
 
   const fetchPrices = useCallback(async () => {
     try {
       setIsRefreshing(true);
-      const { data } = await axios.get(`${API}/crypto/prices`);
+      const { data, headers } = await axios.get(`${API}/crypto/prices`);
       setPrices(data);
+      setFreshness(headers['x-data-freshness'] || 'fresh');
       setLastUpdate(new Date());
     } catch (error) {
       console.error('Error fetching prices:', error);
@@ -26,12 +31,23 @@ export default function LiveTicker() {
   useEffect(() => {
     // Fetch immediately on mount
     fetchPrices();
-    
-    // Update every 30 seconds
-    const interval = setInterval(fetchPrices, 30000);
+  }, [fetchPrices]);
+
+  // Live updates pushed by the backend whenever prices change - shares the page's stream connection
+  useMarketStream({
+    prices: (data) => {
+      setPrices(data);
+      setFreshness('fresh');
+      setLastUpdate(new Date());
+    },
+  }, () => setStreamDown(true));
 
+  useEffect(() => {
+    if (!streamDown) return undefined;
+    // Fallback: update every 30 seconds when streaming is unavailable
+    const interval = setInterval(fetchPrices, 30000);
     return () => clearInterval(interval);
-  }, [fetchPrices]);
+  }, [streamDown, fetchPrices]);
 
   if (prices.length === 0) {
     return (
@@ -51,8 +67,8 @@ export default function LiveTicker() {
     <div className="bg-gray-900/50 border-b border-gray-800 overflow-hidden relative" data-testid="live-ticker">
       {/* Live indicator */}
       <div className="absolute left-4 top-1/2 -translate-y-1/2 z-10 flex items-center gap-2 bg-gray-900/90 px-3 py-1 rounded-full border border-gray-700/50">
-        <div className={`w-2 h-2 rounded-full ${isRefreshing ? 'bg-amber-500 animate-pulse' : 'bg-emerald-500 animate-pulse'}`} />
-        <span className="text-xs text-gray-400 font-medium">LIVE</span>
+        <div className={`w-2 h-2 rounded-full ${isRefreshing || freshness !== 'fresh' ? 'bg-amber-500 animate-pulse' : 'bg-emerald-500 animate-pulse'}`} />
+        <span className="text-xs text-gray-400 font-medium">{freshness === 'fresh' ? 'LIVE' : 'DELAYED'}</span>
       </div>
       
       <div className="flex ticker-animation ml-24">
@@ -24,6 +24,7 @@ export const translations = {
       loading: 'Cargando...',
       found: 'encontrado',
       clearFilters: 'Limpiar filtros',
+      loadMore: 'Cargar más',
       all: 'Todas',
       tasks: 'tareas',
       goToVault: 'Ir al Vault',
@@ -187,6 +188,7 @@ export const translations = {
       loading: 'Loading...',
       found: 'found',
       clearFilters: 'Clear filters',
+      loadMore: 'Load more',
       all: 'All',
       tasks: 'tasks',
       goToVault: 'Go to Vault',
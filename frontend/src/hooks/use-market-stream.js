@@ -0,0 +1,72 @@
+import { useEffect, useRef } from 'react';
+
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+const STREAM_URL = `${BACKEND_URL}/api/stream/market`;
+
+// One EventSource per tab, shared by every mounted component that listens to the market stream
+let source = null;
+const listeners = new Set();
+const attached = new Set();   // event names with a listener on the current source
+const latest = {};            // event name -> last payload, replayed to components that join later
+
+function connect() {
+  source = new EventSource(STREAM_URL);
+  attached.clear();
+  source.onerror = () => {
+    // EventSource retries on its own - only report once the stream is closed for good
+    if (source.readyState === EventSource.CLOSED) {
+      listeners.forEach((listener) => listener.closed());
+    }
+  };
+}
+
+function attach(eventName) {
+  if (attached.has(eventName)) return;
+  attached.add(eventName);
+  source.addEventListener(eventName, (event) => {
+    const data = JSON.parse(event.data);
+    latest[eventName] = data;
+    listeners.forEach((listener) => listener.deliver(eventName, data));
+  });
+}
+
+function disconnect() {
+  source.close();
+  source = null;
+  attached.clear();
+  Object.keys(latest).forEach((eventName) => delete latest[eventName]);
+}
+
+/**
+ * Subscribe to /api/stream/market events, e.g. useMarketStream({ prices: setPrices }, startPolling).
+ * The event names are read on mount; onUnavailable runs when EventSource is missing or the
+ * stream closes for good, so the caller can fall back to polling.
+ */
+export function useMarketStream(handlers, onUnavailable) {
+  const handlersRef = useRef(handlers);
+  const unavailableRef = useRef(onUnavailable);
+  handlersRef.current = handlers;
+  unavailableRef.current = onUnavailable;
+
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') {
+      unavailableRef.current?.();
+      return undefined;
+    }
+    const listener = {
+      deliver: (eventName, data) => handlersRef.current[eventName]?.(data),
+      closed: () => unavailableRef.current?.(),
+    };
+    if (!source || source.readyState === EventSource.CLOSED) connect();
+    listeners.add(listener);
+    Object.keys(handlersRef.current).forEach((eventName) => {
+      attach(eventName);
+      if (eventName in latest) listener.deliver(eventName, latest[eventName]);
+    });
+
+    return () => {
+      listeners.delete(listener);
+      if (listeners.size === 0) disconnect();
+    };
+  }, []);
+}
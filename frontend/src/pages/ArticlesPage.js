@@ -14,32 +14,98 @@ const API = `${BACKEND_URL}/api`;
 export default function ArticlesPage() {
   const [articles, setArticles] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
   const [selectedCategory, setSelectedCategory] = useState('all');
+  const [categories, setCategories] = useState(['all']);
   const [showAlphai, setShowAlphai] = useState(false);
   const [showPremium, setShowPremium] = useState(false);
   const { language, t } = useLanguage();
 
+  const categoryParams = selectedCategory === 'all' ? {} : { category: selectedCategory };
+
+  // Summaries only, one page at a time, filtered server-side - the next page's cursor comes back in X-Next-Cursor
+  const fetchPage = async (cursor) => {
+    const params = cursor ? { ...categoryParams, cursor } : categoryParams;
+    const { data, headers } = await axios.get(`${API}/articles`, { params });
+    return { page: data, cursor: headers['x-next-cursor'] || null };
+  };
+
+  useEffect(() => {
+    const fetchCategories = async () => {
+      try {
+        const { data } = await axios.get(`${API}/articles/categories`);
+        setCategories(['all', ...data]);
+      } catch (error) {
+        console.error('Error fetching categories:', error);
+      }
+    };
+    fetchCategories();
+  }, []);
+
+  // First page again whenever the category changes - cursors belong to one category
   useEffect(() => {
+    let cancelled = false;
     const fetchArticles = async () => {
       try {
-        const { data } = await axios.get(`${API}/articles`);
-        setArticles(data);
+        const { page, cursor } = await fetchPage();
+        if (!cancelled) {
+          setArticles(page);
+          setNextCursor(cursor);
+        }
       } catch (error) {
         console.error('Error fetching articles:', error);
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
     };
     fetchArticles();
-  }, []);
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedCategory]);
 
-  const categories = useMemo(() => {
-    const cats = [...new Set(articles.map(a => a.category))];
-    return ['all', ...cats];
-  }, [articles]);
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const { page, cursor } = await fetchPage(nextCursor);
+      setArticles(prev => [...prev, ...page]);
+      setNextCursor(cursor);
+    } catch (error) {
+      console.error('Error fetching articles:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Ranked server-side search (accent-insensitive, ES/EN word forms, prefix on the last word)
+  useEffect(() => {
+    const query = searchQuery.trim();
+    if (!query) {
+      setSearchResults(null);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const { data } = await axios.get(`${API}/articles`, { params: { ...categoryParams, search: query, limit: 50 } });
+        if (!cancelled) setSearchResults(data);
+      } catch (error) {
+        console.error('Error searching articles:', error);
+      }
+    }, 250);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchQuery, selectedCategory]);
 
   const filteredArticles = useMemo(() => {
+    if (searchResults) {
+      return searchResults;
+    }
     return articles.filter(article => {
       const title = articleTranslations[language]?.[article.id]?.title || article.title;
       const excerpt = articleTranslations[language]?.[article.id]?.excerpt || article.excerpt;
@@ -48,11 +114,9 @@ export default function ArticlesPage() {
         title.toLowerCase().includes(searchQuery.toLowerCase()) ||
         excerpt.toLowerCase().includes(searchQuery.toLowerCase()) ||
         (article.tags && article.tags.some(tag => tag.toLowerCase().includes(searchQuery.toLowerCase())));
-      
-      const matchesCategory = selectedCategory === 'all' || article.category === selectedCategory;
-      return matchesSearch && matchesCategory;
+      return matchesSearch;
     });
-  }, [articles, searchQuery, selectedCategory, language]);
+  }, [articles, searchResults, searchQuery, language]);
 
   const clearFilters = () => {
     setSearchQuery('');
@@ -222,6 +286,18 @@ export default function ArticlesPage() {
           </div>
         )}
 
+        {nextCursor && !searchResults && (
+          <div className="mt-10 text-center">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="bg-emerald-500/10 hover:bg-emerald-500/20 text-emerald-400 border border-emerald-500/30 font-medium py-2.5 px-6 rounded-lg transition-colors disabled:opacity-50"
+            >
+              {loadingMore ? t('common.loading') : t('common.loadMore')}
+            </button>
+          </div>
+        )}
+
         <div className="mt-12 text-center">
           <Link to="/" className="inline-block bg-gray-800 hover:bg-gray-700 text-white font-bold py-3 px-6 rounded-lg transition-colors">
             {t('common.backToHome')}
@@ -29,17 +29,26 @@ export default function HomePage() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [statsRes, fgRes, articlesRes, airdropsRes] = await Promise.all([
-          axios.get(`${API}/crypto/market-stats`),
-          axios.get(`${API}/crypto/fear-greed`),
-          axios.get(`${API}/articles`),
-          axios.get(`${API}/airdrops`),
-        ]);
+        // One round trip for the whole page - any section the backend couldn't load is fetched on its own
+        const { data } = await axios.get(`${API}/bootstrap/home`);
+        const sections = data.sections;
+        const fallbacks = {
+          market_stats: `${API}/crypto/market-stats`,
+          fear_greed: `${API}/crypto/fear-greed`,
+          articles: `${API}/articles`,
+          airdrops: `${API}/airdrops`,
+        };
+        await Promise.all(
+          Object.keys(data.errors || {}).map(async (name) => {
+            const res = await axios.get(fallbacks[name]);
+            sections[name] = res.data;
+          })
+        );
 
-        setMarketStats(statsRes.data);
-        setFearGreed(fgRes.data);
-        setArticles(articlesRes.data.slice(0, 3));
-        setAirdrops(airdropsRes.data.slice(0, 3));
+        setMarketStats(sections.market_stats);
+        setFearGreed(sections.fear_greed);
+        setArticles((sections.articles || []).slice(0, 3));
+        setAirdrops((sections.airdrops || []).slice(0, 3));
       } catch (error) {
         console.error('Error fetching data:', error);
       } finally {
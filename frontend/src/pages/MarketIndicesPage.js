@@ -1,10 +1,11 @@
-import { useEffect, useState } from 'react';
+import { useCallback, useEffect, useState } from 'react';
 import axios from 'axios';
 import { TrendingUp, TrendingDown, Activity, DollarSign, BarChart3, ChevronRight, Target, ShieldCheck, AlertTriangle, Zap, Clock } from 'lucide-react';
 import { Link } from 'react-router-dom';
 import { PieChart, Pie, Cell, ResponsiveContainer, LineChart, Line, AreaChart, Area, BarChart, Bar, XAxis, YAxis, Tooltip } from 'recharts';
 import OwlSeal from '@/components/OwlSeal';
 import { useLanguage } from '@/context/LanguageContext';
+import { useMarketStream } from '@/hooks/use-market-stream';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -203,35 +204,62 @@ export default function MarketIndicesPage() {
   const [stablecoinData, setStablecoinData] = useState(null);
   const [defiTvl, setDefiTvl] = useState(null);
   const [lastUpdate, setLastUpdate] = useState(null);
+  const [streamDown, setStreamDown] = useState(false);
   const { language } = useLanguage();
   
   const tx = TRANSLATIONS[language] || TRANSLATIONS.es;
 
+  const fetchData = useCallback(async () => {
+    try {
+      // One round trip for the whole page - any section the backend couldn't load is fetched on its own
+      const { data } = await axios.get(`${API}/bootstrap/market-indices`);
+      const sections = data.sections;
+      const fallbacks = {
+        fear_greed: `${API}/crypto/fear-greed`,
+        global: `${API}/crypto/global`,
+        stablecoins: `${API}/crypto/stablecoins`,
+        defi_tvl: `${API}/crypto/defi-tvl`,
+      };
+      await Promise.all(
+        Object.keys(data.errors || {}).map(async (name) => {
+          const res = await axios.get(fallbacks[name]);
+          sections[name] = res.data;
+        })
+      );
+      setFearGreed(sections.fear_greed);
+      setGlobalData(sections.global);
+      setStablecoinData(sections.stablecoins);
+      setDefiTvl(sections.defi_tvl);
+      setLastUpdate(new Date());
+    } catch (error) {
+      console.error('Error fetching data:', error);
+    } finally {
+      setLoading(false);
+    }
+  }, []);
+
   useEffect(() => {
-    const fetchData = async () => {
-      try {
-        const [fgRes, globalRes, stableRes, tvlRes] = await Promise.all([
-          axios.get(`${API}/crypto/fear-greed`),
-          axios.get(`${API}/crypto/global`),
-          axios.get(`${API}/crypto/stablecoins`),
-          axios.get(`${API}/crypto/defi-tvl`)
-        ]);
-        setFearGreed(fgRes.data);
-        setGlobalData(globalRes.data);
-        setStablecoinData(stableRes.data);
-        setDefiTvl(tvlRes.data);
-        setLastUpdate(new Date());
-      } catch (error) {
-        console.error('Error fetching data:', error);
-      } finally {
-        setLoading(false);
-      }
-    };
     fetchData();
-    // Refresh every 2 minutes
+  }, [fetchData]);
+
+  // Live updates pushed by the backend whenever a source changes - one connection shared with the ticker
+  const streamed = (setter) => (data) => {
+    setter(data);
+    setLastUpdate(new Date());
+  };
+  useMarketStream({
+    fear_greed: streamed(setFearGreed),
+    global: streamed(setGlobalData),
+    stablecoins: streamed(setStablecoinData),
+    defi_tvl: streamed(setDefiTvl),
+  }, () => setStreamDown(true));
+
+  useEffect(() => {
+    if (!streamDown) return undefined;
+    // Fallback: refresh every 2 minutes when streaming is unavailable
     const interval = setInterval(fetchData, 120000);
     return () => clearInterval(interval);
-  }, []);
+  }, [streamDown, fetchData]);
 
   // Format large numbers
   const formatNumber = (num, decimals = 2) => {
@@ -735,7 +763,7 @@ export default function MarketIndicesPage() {
               </div>
               <div className="h-40">
                 <ResponsiveContainer width="100%" height="100%">
-                  <AreaChart data={generateLargeChartData('up', 90)}>
+                  <AreaChart data={defiTvl?.sparklines?.['90d']?.length ? defiTvl.sparklines['90d'].map(value => ({ value })) : generateLargeChartData('up', 90)}>
                     <defs>
                       <linearGradient id="defiTvlGradient" x1="0" y1="0" x2="0" y2="1">
                         <stop offset="5%" stopColor="#a855f7" stopOpacity={0.4}/>